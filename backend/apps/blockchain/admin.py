@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 import json
-from .models import BlockchainAnchor
+from .models import AnchorOutbox, BlockchainAnchor, ChainMetadataRecord, IndexerCheckpoint, TransactionMetadata
 
 
 @admin.register(BlockchainAnchor)
@@ -120,3 +120,34 @@ class BlockchainAnchorAdmin(admin.ModelAdmin):
             '<span style="color: #999;">No metadata (empty dict)</span>'
         )
     metadata_display.short_description = 'Metadata JSON'
+
+
+@admin.register(ChainMetadataRecord)
+class ChainMetadataRecordAdmin(admin.ModelAdmin):
+    """Read-only view of the local chain index"""
+    list_display = ['report_id', 'block_height', 'slot', 'evidence_hash', 'tx_hash', 'block_time']
+    list_filter = ['network']
+    search_fields = ['report_id', 'evidence_hash', 'tx_hash']
+    readonly_fields = [f.name for f in ChainMetadataRecord._meta.fields]
+
+
+@admin.register(TransactionMetadata)
+class TransactionMetadataAdmin(admin.ModelAdmin):
+    """Read-only view of transaction metadata fetched for verification"""
+    list_display = ['tx_hash', 'report_id', 'block_height', 'evidence_hash', 'fetched_at']
+    list_filter = ['network']
+    search_fields = ['report_id', 'evidence_hash', 'tx_hash']
+    readonly_fields = [f.name for f in TransactionMetadata._meta.fields]
+
+
+@admin.register(IndexerCheckpoint)
+class IndexerCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['name', 'block_height', 'tip_height', 'tip_slot', 'updated_at']
+
+
+@admin.register(AnchorOutbox)
+class AnchorOutboxAdmin(admin.ModelAdmin):
+    list_display = ['report_id', 'status', 'attempts', 'next_attempt_at', 'transaction_hash', 'submitted_slot', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['report_id', 'evidence_hash', 'transaction_hash']
+    readonly_fields = ['created_at', 'updated_at', 'submitted_at']
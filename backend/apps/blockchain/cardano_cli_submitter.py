@@ -1,24 +1,80 @@
 """
-Alternative Cardano transaction submission using cardano-cli via WSL
+Alternative Cardano transaction submission using cardano-cli
 This bypasses the pycardano library issue entirely
+
+Two modes:
+  - wsl:    Windows host, every step runs through ``wsl bash -c``
+  - native: Linux host, build + sign for a whole batch of transactions runs in
+            one shell invocation inside a per-batch temporary directory
+Set CARDANO_CLI_PATH (or pass cli_path) to point at a different binary, e.g. a
+stub script in tests.
 """
 import json
+import shlex
 import subprocess
 import hashlib
 import os
-from typing import Dict
+import tempfile
+import uuid
+from typing import Dict, List
+
+class BatchSubmissionError(Exception):
+    """
+    A batch stopped at transaction failed_index (0-based). tx_hashes holds the
+    hashes of the transactions before it, which were submitted.
+    """
+
+    def __init__(self, message: str, tx_hashes: List[str], failed_index: int):
+        super().__init__(message)
+        self.tx_hashes = tx_hashes
+        self.failed_index = failed_index
+
 
 class CardanoCliSubmitter:
-    """Submit transactions using cardano-cli in WSL"""
+    """Submit transactions using cardano-cli (natively on Linux or in WSL)"""
+    
+    # Flat fee per transaction (typical anchor tx is ~170000 lovelace)
+    ESTIMATED_FEE = 200000
+    MIN_OUTPUT = 1000000
     
-    def __init__(self, network: str = "preview"):
+    def __init__(self, network: str = "preview", mode: str = None, cli_path: str = None):
         self.network = network
         self.network_magic = {
             "preview": "2",
             "preprod": "1",
             "mainnet": ""
         }.get(network, "2")
+        self.mode = mode or ("wsl" if os.name == "nt" else "native")
+        self.cli_path = cli_path or os.environ.get("CARDANO_CLI_PATH", "cardano-cli")
         
+    def _network_args(self) -> str:
+        return "--mainnet" if self.network == "mainnet" else f"--testnet-magic {self.network_magic}"
+
+    @staticmethod
+    def _build_metadata(anchor_data: Dict) -> Dict:
+        return {
+            "674": {
+                "msg": [
+                    f"RRS Report: {anchor_data['report_id']}",
+                    f"Evidence: {anchor_data['evidence_hash'][:32]}...",
+                    f"Category: {anchor_data['category']}",
+                    f"Timestamp: {anchor_data['timestamp']}"
+                ]
+            }
+        }
+
+    @staticmethod
+    def _parse_txid(output: str) -> str:
+        """cardano-cli prints either a bare hash or {"txhash": ...} depending on version"""
+        output = output.strip()
+        try:
+            parsed = json.loads(output)
+            if isinstance(parsed, dict):
+                return parsed.get("txhash") or parsed.get("txId") or ""
+        except ValueError:
+            pass
+        return output
+
     def submit_evidence_transaction(
         self,
         anchor_data: Dict,
@@ -47,8 +103,13 @@ class CardanoCliSubmitter:
         # Convert Windows path to WSL path
         wsl_key_path = self._convert_to_wsl_path(signing_key_path)
         
-        # Create temporary directory for transaction files
-        temp_dir = "/tmp/rrs_tx"
+        if self.mode == "native":
+            return self.submit_evidence_transactions(
+                [anchor_data], signing_key_path, payment_address, blockfrost_key
+            )[0]
+        
+        # Per-transaction directory so concurrent submissions don't share files
+        temp_dir = f"/tmp/rrs_tx_{uuid.uuid4().hex}"
         
         try:
             # Create temp directory in WSL
@@ -79,19 +140,9 @@ class CardanoCliSubmitter:
             amount_in = int([amt for amt in utxo['amount'] if amt['unit'] == 'lovelace'][0]['quantity'])
             
             # Step 2: Create metadata file
-            metadata = {
-                "674": {
-                    "msg": [
-                        f"RRS Report: {anchor_data['report_id']}",
-                        f"Evidence: {anchor_data['evidence_hash'][:32]}...",
-                        f"Category: {anchor_data['category']}",
-                        f"Timestamp: {anchor_data['timestamp']}"
-                    ]
-                }
-            }
+            metadata = self._build_metadata(anchor_data)
             
             # Write metadata to a Windows temp file first, then copy to WSL
-            import tempfile
             with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
                 json.dump(metadata, f)
                 temp_metadata_path = f.name
@@ -105,11 +156,11 @@ class CardanoCliSubmitter:
             
             # Step 3: Build transaction
             # Estimate fee (typically ~170000 lovelace)
-            estimated_fee = 200000
+            estimated_fee = self.ESTIMATED_FEE
             amount_out = amount_in - estimated_fee
             
-            if amount_out < 1000000:
-                raise Exception(f"Insufficient funds: {amount_in} lovelace available, need {estimated_fee + 1000000}")
+            if amount_out < self.MIN_OUTPUT:
+                raise Exception(f"Insufficient funds: {amount_in} lovelace available, need {estimated_fee + self.MIN_OUTPUT}")
             
             build_cmd = (
                 f"cardano-cli transaction build-raw "
@@ -155,7 +206,7 @@ class CardanoCliSubmitter:
             else:
                 # Calculate transaction hash from signed transaction
                 txid_cmd = f"cardano-cli transaction txid --tx-file {temp_dir}/tx.signed"
-                tx_hash = self._run_wsl_command(txid_cmd).strip()
+                tx_hash = self._parse_txid(self._run_wsl_command(txid_cmd))
             
             # Cleanup
             self._run_wsl_command(f"rm -rf {temp_dir}")
@@ -170,6 +221,125 @@ class CardanoCliSubmitter:
                 pass
             raise Exception(f"cardano-cli transaction failed: {str(e)}")
     
+    def submit_evidence_transactions(
+        self,
+        anchor_data_list: List[Dict],
+        signing_key_path: str,
+        payment_address: str,
+        blockfrost_key: str
+    ) -> List[str]:
+        """
+        Build, sign and submit several anchor transactions natively (Linux).
+        
+        All transactions are built and signed by a single shell process in a
+        private temporary directory. They are chained: each one spends the
+        change output of the previous one, so a batch needs only one UTXO.
+        Submission goes through Blockfrost in chain order and stops at the first
+        failure, since every later transaction spends the failed one's output.
+        
+        Returns:
+            Transaction hashes, in the order of anchor_data_list
+        
+        Raises:
+            BatchSubmissionError: a submission failed; its tx_hashes lists the
+                transactions submitted before it
+        """
+        import requests
+        
+        if not anchor_data_list:
+            return []
+        
+        base_url = f"https://cardano-{self.network}.blockfrost.io/api/v0"
+        headers = {"project_id": blockfrost_key}
+        
+        # Step 1: Pick the largest UTXO via Blockfrost (no local node needed)
+        utxo_response = requests.get(
+            f"{base_url}/addresses/{payment_address}/utxos",
+            headers=headers,
+            timeout=15
+        )
+        if utxo_response.status_code != 200:
+            raise Exception(f"Failed to get UTXOs: {utxo_response.status_code}")
+        utxos = utxo_response.json()
+        if not utxos:
+            raise Exception("No UTXOs available in wallet")
+        
+        def lovelace(utxo):
+            return int(next(a['quantity'] for a in utxo['amount'] if a['unit'] == 'lovelace'))
+        
+        utxo = max(utxos, key=lovelace)
+        amount_in = lovelace(utxo)
+        count = len(anchor_data_list)
+        needed = self.ESTIMATED_FEE * count + self.MIN_OUTPUT
+        if amount_in < needed:
+            raise Exception(f"Insufficient funds: {amount_in} lovelace available, need {needed}")
+        
+        with tempfile.TemporaryDirectory(prefix="rrs_tx_") as workdir:
+            # Step 2: Metadata files are written directly, no process needed
+            for i, anchor_data in enumerate(anchor_data_list):
+                with open(os.path.join(workdir, f"metadata_{i}.json"), "w") as f:
+                    json.dump(self._build_metadata(anchor_data), f)
+            
+            # Step 3: One shell process builds and signs the whole chain
+            cli = shlex.quote(self.cli_path)
+            lines = [
+                "set -euo pipefail",
+                f"cd {shlex.quote(workdir)}",
+                f"TXIN={shlex.quote(utxo['tx_hash'] + '#' + str(utxo['tx_index']))}",
+            ]
+            for i in range(count):
+                amount_out = amount_in - self.ESTIMATED_FEE * (i + 1)
+                lines += [
+                    f"{cli} transaction build-raw --tx-in \"$TXIN\" "
+                    f"--tx-out {shlex.quote(payment_address)}+{amount_out} "
+                    f"--metadata-json-file metadata_{i}.json --fee {self.ESTIMATED_FEE} --out-file tx_{i}.raw",
+                    f"{cli} transaction sign --tx-body-file tx_{i}.raw "
+                    f"--signing-key-file {shlex.quote(signing_key_path)} {self._network_args()} --out-file tx_{i}.signed",
+                    f"TXID=$({cli} transaction txid --tx-file tx_{i}.signed)",
+                    'echo "$TXID"',
+                    # Next transaction spends this one's change output
+                    'TXIN="$(echo "$TXID" | grep -oE \'[0-9a-f]{64}\' | head -n1)#0"',
+                ]
+            result = subprocess.run(
+                ["bash", "-c", "\n".join(lines)],
+                capture_output=True,
+                text=True,
+                timeout=60 + 10 * count
+            )
+            if result.returncode != 0:
+                raise Exception(f"cardano-cli transaction failed: {result.stderr.strip()}")
+            
+            tx_ids = [self._parse_txid(line) for line in result.stdout.splitlines() if line.strip()]
+            if len(tx_ids) != count:
+                raise Exception(f"cardano-cli returned {len(tx_ids)} tx ids for {count} transactions")
+            
+            # Step 4: Submit signed transactions in chain order
+            tx_hashes = []
+            for i in range(count):
+                with open(os.path.join(workdir, f"tx_{i}.signed")) as f:
+                    envelope = json.load(f)
+                try:
+                    submit_response = requests.post(
+                        f"{base_url}/tx/submit",
+                        headers={"project_id": blockfrost_key, "Content-Type": "application/cbor"},
+                        data=bytes.fromhex(envelope["cborHex"]),
+                        timeout=15
+                    )
+                except requests.RequestException as e:
+                    raise BatchSubmissionError(
+                        f"Transaction {i + 1}/{count} submission failed: {e}", tx_hashes, i
+                    ) from e
+                if submit_response.status_code != 200:
+                    raise BatchSubmissionError(
+                        f"Transaction {i + 1}/{count} submission failed: "
+                        f"{submit_response.status_code} - {submit_response.text}",
+                        tx_hashes, i
+                    )
+                submitted = submit_response.json()
+                tx_hashes.append(submitted if isinstance(submitted, str) else tx_ids[i])
+            
+            return tx_hashes
+    
     def _convert_to_wsl_path(self, windows_path: str) -> str:
         """Convert Windows path to WSL path"""
         # C:\Users\... -> /mnt/c/Users/...
@@ -204,7 +374,7 @@ def test_cli_submission():
     print("=" * 80)
     print()
     
-    submitter = CardanoCliSubmitter(network="preview")
+    submitter = CardanoCliSubmitter(network="preview", mode="wsl")
     
     anchor_data = {
         "report_id": "RRS-TEST-CLI",
@@ -6,7 +6,6 @@ Handles evidence hash anchoring and verification on Cardano blockchain
 import json
 import hashlib
 import time
-from datetime import datetime
 from typing import Dict, Optional, Tuple
 import os
 import traceback
@@ -74,10 +73,10 @@ class CardanoEvidenceAnchoring:
         Returns:
             Hex string of SHA-256 hash (64 characters)
         """
-        json_str = json.dumps(evidence_data, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+        from .evidence import evidence_hash
+        return evidence_hash(evidence_data)
     
-    def create_anchor_transaction(
+    def build_anchor_data(
         self,
         report_id: str,
         evidence_hash: str,
@@ -87,17 +86,7 @@ class CardanoEvidenceAnchoring:
         ipfs_cid: Optional[str] = None
     ) -> Dict:
         """
-        Create blockchain transaction to anchor evidence
-        
-        Args:
-            report_id: Reference code like RRS-2025-00001
-            evidence_hash: SHA-256 hash of evidence
-            category: Report category
-            is_anonymous: Whether report is anonymous
-            reporter_info: Optional reporter metadata
-            
-        Returns:
-            Dictionary with transaction details
+        Build the anchor payload submitted on chain (fresh timestamp on each call)
         """
         timestamp = int(time.time() * 1000)  # Current time in milliseconds
         
@@ -119,6 +108,44 @@ class CardanoEvidenceAnchoring:
                 "phone": reporter_info.get("phone", ""),
                 "email": reporter_info.get("email", ""),
             }
+        return anchor_data
+
+    def submit_anchor_data(self, anchor_data: Dict) -> str:
+        """
+        Broadcast an anchor payload without the simulation fallback.
+        Raises on any failure so callers (the anchoring outbox) can retry.
+        """
+        if not self.broadcast_enabled or not self.blockfrost_key:
+            raise Exception("Broadcasting disabled (ANCHOR_BROADCAST=False or Blockfrost key missing)")
+        return self._submit_real_transaction(anchor_data)
+
+    def create_anchor_transaction(
+        self,
+        report_id: str,
+        evidence_hash: str,
+        category: str,
+        is_anonymous: bool,
+        reporter_info: Optional[Dict] = None,
+        ipfs_cid: Optional[str] = None
+    ) -> Dict:
+        """
+        Create blockchain transaction to anchor evidence
+        
+        Args:
+            report_id: Reference code like RRS-2025-00001
+            evidence_hash: SHA-256 hash of evidence
+            category: Report category
+            is_anonymous: Whether report is anonymous
+            reporter_info: Optional reporter metadata
+            
+        Returns:
+            Dictionary with transaction details
+        """
+        anchor_data = self.build_anchor_data(
+            report_id, evidence_hash, category, is_anonymous,
+            reporter_info=reporter_info, ipfs_cid=ipfs_cid
+        )
+        timestamp = anchor_data["timestamp"]
         
         # If broadcasting is disabled, or no credentials configured, simulate
         if not self.broadcast_enabled or not self.blockfrost_key:
@@ -166,14 +193,17 @@ class CardanoEvidenceAnchoring:
                 "timestamp": timestamp,
                 "anchor_data": anchor_data,
                 "simulated": True,
+                "broadcast_failed": True,
                 "error": str(e),
-                "note": f"Real broadcast failed ({str(e)}), fell back to simulation."
+                "note": f"Real broadcast failed ({str(e)}), fell back to simulation. Queued for re-submission."
             }
     
     def verify_evidence_on_chain(
         self,
         report_id: str,
-        evidence_hash: str
+        evidence_hash: str,
+        tx_hash: Optional[str] = None,
+        fetch: bool = False
     ) -> Dict:
         """
         Verify that evidence hash exists on blockchain
@@ -181,17 +211,57 @@ class CardanoEvidenceAnchoring:
         Args:
             report_id: Reference code
             evidence_hash: SHA-256 hash to verify
+            tx_hash: Anchoring transaction (defaults to the report's BlockchainAnchor)
+            fetch: Fetch uncached transaction metadata now instead of in the background
             
         Returns:
-            Verification result dictionary
+            Verification result dictionary ("pending" while metadata is being fetched)
         """
-        # In production, query blockchain via Blockfrost API
-        # For now, simulate verification
+        # Answered from the local chain index (see indexer.py / index_chain command);
+        # otherwise from the anchoring transaction's metadata, fetched once and cached
+        from .indexer import cached_transaction_record, find_indexed_anchor, indexed_tip_height
+
+        record = find_indexed_anchor(report_id, evidence_hash)
+        if record is None:
+            if tx_hash is None:
+                from .models import BlockchainAnchor
+                tx_hash = (
+                    BlockchainAnchor.objects.filter(report_id=report_id)
+                    .values_list('transaction_hash', flat=True).first()
+                )
+            fetched = cached_transaction_record(tx_hash, self.network, self.blockfrost_key, fetch=fetch) if tx_hash else None
+            if fetched is None or not fetched.matches(evidence_hash) or fetched.report_id not in ("", report_id[:50]):
+                pending = fetched is None and bool(tx_hash) and not fetch
+                if pending:
+                    reason = "On-chain metadata of the anchoring transaction is being fetched"
+                elif fetched is None:
+                    reason = "No on-chain anchor matches this evidence hash"
+                else:
+                    reason = "On-chain metadata of the anchoring transaction does not match this evidence hash"
+                return {
+                    "verified": False,
+                    "pending": pending,
+                    "report_id": report_id,
+                    "evidence_hash": evidence_hash,
+                    "transaction_hash": tx_hash,
+                    "on_chain_hash": fetched.evidence_hash if fetched else None,
+                    "network": self.network,
+                    "reason": reason,
+                }
+            record = fetched
+
+        tip_height = indexed_tip_height(self.network)
+        confirmations = None
+        if tip_height is not None and record.block_height is not None:
+            confirmations = max(0, tip_height - record.block_height + 1)
         return {
             "verified": True,
             "report_id": report_id,
             "evidence_hash": evidence_hash,
-            "confirmed_at": datetime.now().isoformat(),
+            "transaction_hash": record.tx_hash,
+            "block_height": record.block_height,
+            "confirmations": confirmations,
+            "confirmed_at": record.block_time.isoformat() if record.block_time else None,
             "network": self.network,
         }
     
@@ -229,36 +299,13 @@ class CardanoEvidenceAnchoring:
         tx_hash = hashlib.sha256(data_str.encode()).hexdigest()
         return tx_hash
 
-    def _submit_real_transaction(self, anchor_data: Dict) -> str:
+    def _load_wallet(self):
         """
-        Submit real transaction to Cardano blockchain using PyCardano
+        Load the payment signing key and derive its address
         
-        Args:
-            anchor_data: Data to anchor on chain
-            
         Returns:
-            Real transaction hash from blockchain
-            
-        Raises:
-            Exception: If transaction fails or wallet not configured
+            (signing_key, payment_address)
         """
-        if not PYCARDANO_AVAILABLE:
-            raise Exception("PyCardano library not available")
-
-        # 1. Setup Context
-        # Note: BlockFrostChainContext in PyCardano handles the base URL correctly if we give it the right one
-        # For preview, it should be https://cardano-preview.blockfrost.io/api
-        # It appends /v0 internally if needed, or we provide it.
-        # Based on testing, providing /api works best with current pycardano version
-        
-        base_url = f"https://cardano-{self.network}.blockfrost.io/api"
-        
-        context = BlockFrostChainContext(
-            project_id=self.blockfrost_key,
-            base_url=base_url
-        )
-        
-        # 2. Get Wallet Info
         try:
             import json
             import base64
@@ -330,6 +377,21 @@ class CardanoEvidenceAnchoring:
         except Exception as e:
             raise Exception(f"Wallet loading failed: {e}")
 
+        return signing_key, payment_address
+
+    def build_signed_transaction(self, context, signing_key, payment_address, anchor_data: Dict, verbose: bool = True):
+        """
+        Build and sign the anchor transaction (no submission)
+        
+        Args:
+            context: PyCardano chain context (Blockfrost, or a local stand-in)
+            signing_key: Payment signing key
+            payment_address: Address funding the transaction
+            anchor_data: Data to anchor on chain
+            
+        Returns:
+            Signed pycardano Transaction
+        """
         # 3. Build Metadata
         # Use label 674 for RRS-specific metadata (Cardano standard for custom data)
         # Keep structure very simple for maximum compatibility across environments
@@ -347,7 +409,8 @@ class CardanoEvidenceAnchoring:
             metadata_obj = Metadata(meta_dict)
             alonzo_metadata = AlonzoMetadata(metadata=metadata_obj)
             auxiliary_data = AuxiliaryData(data=alonzo_metadata)
-            print(f"✅ Metadata object created successfully with data: {meta_dict}")
+            if verbose:
+                print(f"✅ Metadata object created successfully with data: {meta_dict}")
         except Exception as e:
             print(f"❌ Metadata creation failed: {e}. Proceeding without metadata.")
             auxiliary_data = None
@@ -367,13 +430,13 @@ class CardanoEvidenceAnchoring:
         tx_body = builder.build(change_address=payment_address)
         
         # Verify metadata is in tx_body
-        if auxiliary_data is not None:
-            if tx_body.auxiliary_data_hash is None:
+        if verbose:
+            if auxiliary_data is None:
+                print("ℹ️ Transaction built without auxiliary data.")
+            elif tx_body.auxiliary_data_hash is None:
                 print("⚠️ Warning: Auxiliary data hash is None. Metadata may not be properly serialized.")
             else:
                 print(f"✅ Metadata attached with hash: {tx_body.auxiliary_data_hash}")
-        else:
-            print("ℹ️ Transaction built without auxiliary data.")
         
         # 5. Sign
         signature = signing_key.sign(tx_body.hash())
@@ -386,8 +449,46 @@ class CardanoEvidenceAnchoring:
         tx = Transaction(tx_body, witness_set, auxiliary_data=auxiliary_data)
         
         # Double-check metadata is in final transaction
-        print(f"📋 Transaction ID: {tx.id}")
-        print(f"📦 Auxiliary data present: {tx.auxiliary_data is not None}")
+        if verbose:
+            print(f"📋 Transaction ID: {tx.id}")
+            print(f"📦 Auxiliary data present: {tx.auxiliary_data is not None}")
+        
+        return tx
+
+    def _submit_real_transaction(self, anchor_data: Dict) -> str:
+        """
+        Submit real transaction to Cardano blockchain using PyCardano
+        
+        Args:
+            anchor_data: Data to anchor on chain
+            
+        Returns:
+            Real transaction hash from blockchain
+            
+        Raises:
+            Exception: If transaction fails or wallet not configured
+        """
+        if not PYCARDANO_AVAILABLE:
+            raise Exception("PyCardano library not available")
+
+        # 1. Setup Context
+        # Note: BlockFrostChainContext in PyCardano handles the base URL correctly if we give it the right one
+        # For preview, it should be https://cardano-preview.blockfrost.io/api
+        # It appends /v0 internally if needed, or we provide it.
+        # Based on testing, providing /api works best with current pycardano version
+        
+        base_url = f"https://cardano-{self.network}.blockfrost.io/api"
+        
+        context = BlockFrostChainContext(
+            project_id=self.blockfrost_key,
+            base_url=base_url
+        )
+        
+        # 2. Get Wallet Info
+        signing_key, payment_address = self._load_wallet()
+
+        # 3-5. Build metadata, transaction and sign
+        tx = self.build_signed_transaction(context, signing_key, payment_address, anchor_data)
         
         # 6. Submit
         print(f"🚀 Submitting transaction for report {anchor_data['report_id']}...")
@@ -398,19 +499,41 @@ class CardanoEvidenceAnchoring:
         
         return tx_id
 
-    def get_transaction_status(self, tx_hash: str) -> Dict:
+    def get_latest_block(self, session=None) -> Optional[Dict]:
+        """Query Blockfrost for the chain tip.
+
+        Returns the block dict (height, slot, time, ...) or None if unavailable.
+        """
+        if not self.blockfrost_key:
+            return None
+        import requests
+        http = session or requests
+        headers = {"project_id": self.blockfrost_key}
+        try:
+            r = http.get(f"{self.blockfrost_url}/blocks/latest", headers=headers, timeout=15)
+            if r.status_code != 200:
+                return None
+            return r.json()
+        except requests.RequestException:
+            return None
+
+    def get_transaction_status(self, tx_hash: str, latest_height: Optional[int] = None, session=None) -> Dict:
         """Query Blockfrost for a transaction status (confirmations, block height).
 
         Returns a dict with keys: found(bool), block_height, confirmations, block_time, slot.
         If Blockfrost key missing or request fails returns found False.
+
+        When checking many transactions, pass ``latest_height`` (from get_latest_block)
+        and a shared ``requests.Session`` so each call costs a single HTTP request.
         """
         if not tx_hash or not self.blockfrost_key:
             return {"found": False, "reason": "missing tx_hash or blockfrost key"}
         import requests
+        http = session or requests
         base = f"https://cardano-{self.network}.blockfrost.io/api/v0"
         headers = {"project_id": self.blockfrost_key}
         try:
-            tx_r = requests.get(f"{base}/txs/{tx_hash}", headers=headers, timeout=15)
+            tx_r = http.get(f"{base}/txs/{tx_hash}", headers=headers, timeout=15)
             if tx_r.status_code != 200:
                 return {"found": False, "code": tx_r.status_code}
             tx = tx_r.json()
@@ -418,13 +541,12 @@ class CardanoEvidenceAnchoring:
             slot = tx.get("slot")
             block_time = tx.get("block_time")
             # latest block for confirmations
-            latest_r = requests.get(f"{base}/blocks/latest", headers=headers, timeout=15)
+            if latest_height is None:
+                latest = self.get_latest_block(session=session)
+                latest_height = latest.get("height") if latest else None
             confirmations = None
-            if latest_r.status_code == 200 and isinstance(block_height, int):
-                latest = latest_r.json()
-                latest_h = latest.get("height")
-                if isinstance(latest_h, int):
-                    confirmations = max(0, latest_h - block_height + 1)
+            if isinstance(latest_height, int) and isinstance(block_height, int):
+                confirmations = max(0, latest_height - block_height + 1)
             return {
                 "found": True,
                 "block_height": block_height,
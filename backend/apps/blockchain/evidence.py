@@ -0,0 +1,257 @@
+"""
+Versioned evidence codecs
+Each codec defines one JSON document whose SHA-256 is anchored on chain and
+is registered under a version string recorded on BlockchainAnchor, so
+verification rebuilds exactly the layout that was anchored. Anchors written
+before versions were recorded are matched against every registered codec.
+
+Encoding is canonical JSON, as json.dumps(sort_keys=True, separators=(',', ':'))
+produces it, through a json.JSONEncoder bound once per codec: json.dumps
+builds a new encoder on every call with non-default options, which the
+bulk verification loop would otherwise pay per report (see bench_evidence).
+
+Merkle codecs anchor the root over per-field leaves instead of the document
+hash (see merkle.py), which lets verification name the fields that changed.
+
+Kept free of Django imports: the hashing helpers run in worker processes.
+"""
+
+import hashlib
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .merkle import diverged_fields, leaf_hash, merkle_root, root_of
+
+# Report fields needed to rebuild any evidence layout (for .values()/.only())
+EVIDENCE_FIELDS = (
+    'id', 'reference_code', 'category', 'description', 'latitude', 'longitude',
+    'location_description', 'created_at', 'is_anonymous', 'ipfs_cid',
+)
+
+# Payload keys that don't share the Report field name they are built from
+PAYLOAD_FIELD_SOURCES = {'report_id': 'id', 'timestamp': 'created_at'}
+
+
+def canonical_encoder(ensure_ascii: bool = True) -> json.JSONEncoder:
+    return json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=ensure_ascii)
+
+
+_CANONICAL_ENCODERS = {True: canonical_encoder(True), False: canonical_encoder(False)}
+
+
+def canonical_json(payload: Dict, ensure_ascii: bool = True) -> str:
+    """Canonical encoding of ad-hoc payloads (shared pre-bound encoders)."""
+    return _CANONICAL_ENCODERS[bool(ensure_ascii)].encode(payload)
+
+
+class EvidenceCodec:
+    """
+    One versioned evidence layout: build(report) -> payload dict, encoded canonically.
+    """
+    merkle = False
+
+    def __init__(self, version: str, build: Callable, ensure_ascii: bool = True, description: str = ""):
+        self.version = version
+        self.build = build
+        self.ensure_ascii = ensure_ascii
+        self.description = description
+        self._encoder = canonical_encoder(ensure_ascii)
+
+    def payload(self, report) -> Dict:
+        return self.build(report)
+
+    def encode(self, payload: Dict) -> bytes:
+        return self._encoder.encode(payload).encode('utf-8')
+
+    def hash(self, report) -> str:
+        return hashlib.sha256(self.encode(self.build(report))).hexdigest()
+
+    def hash_payload(self, payload: Dict) -> str:
+        return hashlib.sha256(self.encode(payload)).hexdigest()
+
+    def field_hashes(self, payload: Dict) -> Dict[str, str]:
+        """Per-field leaf hashes (only Merkle codecs commit to them)."""
+        return {}
+
+
+class MerkleEvidenceCodec(EvidenceCodec):
+    """
+    Same payload as a plain codec, but the anchored hash is the Merkle root over
+    one leaf per top-level field (sorted field order).
+    """
+    merkle = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encode_str = encode_basestring_ascii if self.ensure_ascii else encode_basestring
+
+    def _encode_value(self, value) -> str:
+        """Canonical JSON of one field value (json's C string encoder for the common case)."""
+        if value.__class__ is str:
+            return self._encode_str(value)
+        return self._encoder.encode(value)
+
+    def _leaves(self, payload: Dict) -> List[bytes]:
+        return [leaf_hash(self._encode_str(key), self._encode_value(payload[key])) for key in sorted(payload)]
+
+    def hash_payload(self, payload: Dict) -> str:
+        return merkle_root(self._leaves(payload)).hex()
+
+    def hash(self, report) -> str:
+        return self.hash_payload(self.build(report))
+
+    def field_hashes(self, payload: Dict) -> Dict[str, str]:
+        return {key: leaf.hex() for key, leaf in zip(sorted(payload), self._leaves(payload))}
+
+
+# ------------------------------------------------------------
+# Layouts
+# ------------------------------------------------------------
+
+def canonical_evidence(report, ipfs_cid: Optional[str] = None) -> Dict:
+    """
+    10-field layout hashed at submission (process_report_blockchain).
+    ipfs_cid is None at that point, so verification rebuilds it with None.
+    """
+    return {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "latitude": str(report.latitude) if report.latitude else None,
+        "longitude": str(report.longitude) if report.longitude else None,
+        "location_description": report.location_description,
+        "ipfs_cid": ipfs_cid,
+        "timestamp": report.created_at.isoformat(),
+        "is_anonymous": report.is_anonymous,
+    }
+
+
+def media_evidence(report) -> Dict:
+    """10-field layout as hashed by older submissions, with the media CID already filled in."""
+    return canonical_evidence(report, ipfs_cid=report.ipfs_cid)
+
+
+def summary_evidence(report) -> Dict:
+    """5-field layout hashed when staff anchor a report manually (BlockchainAnchorStatusView)."""
+    return {
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description[:500] if report.description else "",
+        "is_anonymous": report.is_anonymous,
+        "created_at": report.created_at.isoformat() if report.created_at else "",
+    }
+
+
+def nested_evidence(report) -> Dict:
+    """Nested-location layout of EvidenceManager.create_evidence_json."""
+    return {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "location": {
+            "latitude": str(report.latitude) if report.latitude else None,
+            "longitude": str(report.longitude) if report.longitude else None,
+            "description": report.location_description,
+        },
+        "timestamp": report.created_at.isoformat(),
+        "media_cid": None,
+        "anonymity_flag": report.is_anonymous,
+        "version": "1.0",
+    }
+
+
+VERSION_V1 = 'v1'
+VERSION_MEDIA = 'v1-media'
+VERSION_SUMMARY = 'v1-summary'
+VERSION_NESTED = 'v1-nested'
+VERSION_MERKLE = 'v2-merkle'
+DEFAULT_VERSION = VERSION_MERKLE
+
+CODECS: Dict[str, EvidenceCodec] = {}
+
+
+def register_codec(codec: EvidenceCodec) -> EvidenceCodec:
+    CODECS[codec.version] = codec
+    return codec
+
+
+register_codec(EvidenceCodec(VERSION_V1, canonical_evidence, description="10-field submission layout"))
+register_codec(EvidenceCodec(VERSION_MEDIA, media_evidence, description="10-field layout with media CID (legacy)"))
+register_codec(EvidenceCodec(VERSION_SUMMARY, summary_evidence, description="5-field staff anchoring layout"))
+register_codec(EvidenceCodec(VERSION_NESTED, nested_evidence, ensure_ascii=False, description="EvidenceManager nested layout"))
+register_codec(MerkleEvidenceCodec(VERSION_MERKLE, canonical_evidence, description="10-field layout, Merkle root over fields"))
+
+
+def get_codec(version: Optional[str] = None) -> EvidenceCodec:
+    """Codec for a recorded version (the default one for new anchors when empty)."""
+    return CODECS[version or DEFAULT_VERSION]
+
+
+def evidence_hash(payload: Dict) -> str:
+    """SHA-256 of the generic canonical encoding of an ad-hoc payload."""
+    return hashlib.sha256(canonical_json(payload).encode('utf-8')).hexdigest()
+
+
+# ------------------------------------------------------------
+# Verification
+# ------------------------------------------------------------
+
+def match_layout(report, anchored_hash: Optional[str], version: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Recompute the report's evidence hash and compare it with the anchored one.
+
+    With a recorded version only that codec is used; otherwise (legacy
+    anchors) every registered codec is tried, default first.
+    Returns (current_hash, version) where version names the codec that
+    matched, or None on mismatch (current_hash is then the hash under the
+    recorded or default codec).
+    """
+    if version in CODECS:
+        current = CODECS[version].hash(report)
+        return current, (version if current == anchored_hash else None)
+
+    current = None
+    for codec in CODECS.values():
+        candidate = codec.hash(report)
+        if current is None:
+            current = candidate
+        if candidate == anchored_hash:
+            return candidate, codec.version
+    return current, None
+
+
+def localize_tampering(report, anchored_hash: Optional[str], version: Optional[str],
+                       field_hashes: Optional[Dict[str, str]]) -> Optional[List[str]]:
+    """
+    Names of the evidence fields that changed since anchoring, in O(fields).
+
+    Only possible for Merkle-anchored reports whose stored leaves still hash to
+    the anchored root; returns None when the change can't be localised.
+    """
+    codec = CODECS.get(version or "")
+    if codec is None or not codec.merkle or not field_hashes:
+        return None
+    if root_of(field_hashes) != anchored_hash:
+        return None  # stored leaves were altered too: only the root is trustworthy
+    return diverged_fields(field_hashes, codec.field_hashes(codec.payload(report)))
+
+
+def hash_rows(rows: Iterable[Tuple]) -> List[Tuple[str, str, Optional[str], Optional[List[str]]]]:
+    """
+    Pool worker: verify (report values dict, anchored hash, recorded version, field hashes) rows.
+    Returns (reference_code, current_hash, matched_version, diverged_fields) per row;
+    diverged_fields is only set for mismatches that could be localised.
+    """
+    results = []
+    for values, anchored_hash, version, field_hashes in rows:
+        report = SimpleNamespace(**values)
+        current, matched = match_layout(report, anchored_hash, version or None)
+        diverged = None
+        if matched is None and anchored_hash:
+            diverged = localize_tampering(report, anchored_hash, version, field_hashes)
+        results.append((values['reference_code'], current, matched, diverged))
+    return results
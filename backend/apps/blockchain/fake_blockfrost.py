@@ -0,0 +1,183 @@
+"""
+Local Blockfrost stand-in
+Serves the handful of endpoints PyCardano's BlockFrostChainContext needs to
+build, sign and submit an anchor transaction (tip, genesis, protocol
+parameters, address UTXOs, tx submit) from memory, so transaction building
+can be measured without network wait or a funded wallet.
+
+Not a ledger: UTXOs are never spent and submitted transactions are only counted.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# Preview-like protocol parameters (Conway era)
+PROTOCOL_PARAMETERS = {
+    "epoch": 500,
+    "min_fee_a": 44,
+    "min_fee_b": 155381,
+    "max_block_size": 90112,
+    "max_tx_size": 16384,
+    "max_block_header_size": 1100,
+    "key_deposit": "2000000",
+    "pool_deposit": "500000000",
+    "e_max": 18,
+    "n_opt": 500,
+    "a0": 0.3,
+    "rho": 0.003,
+    "tau": 0.2,
+    "decentralisation_param": 0,
+    "extra_entropy": None,
+    "protocol_major_ver": 9,
+    "protocol_minor_ver": 0,
+    "min_utxo": "4310",
+    "min_pool_cost": "170000000",
+    "nonce": "0" * 64,
+    "cost_models": {},
+    "price_mem": 0.0577,
+    "price_step": 0.0000721,
+    "max_tx_ex_mem": "14000000",
+    "max_tx_ex_steps": "10000000000",
+    "max_block_ex_mem": "62000000",
+    "max_block_ex_steps": "20000000000",
+    "max_val_size": "5000",
+    "collateral_percent": 150,
+    "max_collateral_inputs": 3,
+    "coins_per_utxo_size": "4310",
+    "coins_per_utxo_word": "4310",
+    "min_fee_ref_script_cost_per_byte": 15,
+}
+
+GENESIS = {
+    "active_slots_coefficient": 0.05,
+    "update_quorum": 5,
+    "max_lovelace_supply": "45000000000000000",
+    "network_magic": 2,
+    "epoch_length": 86400,
+    "system_start": 1666656000,
+    "slots_per_kes_period": 129600,
+    "slot_length": 1,
+    "max_kes_evolutions": 62,
+    "security_param": 432,
+}
+
+UTXO_PATH_RE = re.compile(r'^/addresses/([^/]+)/utxos$')
+
+
+class FakeBlockfrost:
+    """
+    In-memory Blockfrost API on 127.0.0.1, run in a daemon thread.
+
+    Usage:
+        with FakeBlockfrost(utxo_count=5) as fake:
+            context = BlockFrostChainContext(project_id="local", base_url=fake.base_url)
+    """
+
+    def __init__(self, utxo_count: int = 1, utxo_lovelace: int = 10_000_000_000, port: int = 0):
+        self.utxo_count = max(1, utxo_count)
+        self.utxo_lovelace = utxo_lovelace
+        self.port = port
+        self.submitted = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def utxos(self, address: str) -> List[Dict]:
+        return [
+            {
+                "address": address,
+                "tx_hash": hashlib.blake2b(f"utxo-{i}".encode(), digest_size=32).hexdigest(),
+                "tx_index": 0,
+                "output_index": 0,
+                "amount": [{"unit": "lovelace", "quantity": str(self.utxo_lovelace)}],
+                "block": "0" * 64,
+                "data_hash": None,
+                "inline_datum": None,
+                "reference_script_hash": None,
+            }
+            for i in range(self.utxo_count)
+        ]
+
+    def route(self, method: str, path: str, query: Dict, body: bytes):
+        """Return (status, payload) for a request."""
+        now = int(time.time())
+        if method == "POST" and path == "/tx/submit":
+            with self._lock:
+                self.submitted += 1
+            # Not the real transaction id: hashing the body keeps the stand-in cheap
+            return 200, hashlib.blake2b(body, digest_size=32).hexdigest()
+        if path == "/epochs/latest":
+            return 200, {"epoch": 500, "start_time": now - 3600, "end_time": now + 86400}
+        if path == "/epochs/latest/parameters":
+            return 200, PROTOCOL_PARAMETERS
+        if path == "/blocks/latest":
+            return 200, {"height": 3_000_000, "slot": now - GENESIS["system_start"], "time": now}
+        if path == "/genesis":
+            return 200, GENESIS
+
+        match = UTXO_PATH_RE.match(path)
+        if match:
+            page = int(query.get("page", "1"))
+            return 200, self.utxos(match.group(1)) if page == 1 else []
+
+        return 404, {"status_code": 404, "error": "Not Found", "message": path}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                path, _, raw_query = self.path.partition("?")
+                # Accept both ".../api/v0/<endpoint>" and bare "<endpoint>" layouts
+                path = re.sub(r'^(/api)?(/v0)?', '', path) or "/"
+                query = dict(p.split("=", 1) for p in raw_query.split("&") if "=" in p)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+
+                status, payload = fake.route(method, path, query, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeBlockfrost":
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
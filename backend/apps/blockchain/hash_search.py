@@ -0,0 +1,144 @@
+"""
+Hash search over blockchain anchors
+Resolves full hashes, prefixes and admin-style truncated hashes
+("<first 16>...<last 8>") against evidence_hash and transaction_hash. Values
+that are not hexadecimal (simulated and FAILED_ANCHOR_* transaction hashes)
+are matched exactly, as typed.
+
+Prefixes become range conditions (hash >= prefix AND hash <= prefix + 'f' * rest),
+which use the plain B-tree indexes on both columns; LIKE/startswith would not
+on every backend. A batch resolves with a fixed number of queries: one for
+full hashes, one per PREFIX_QUERY_SIZE prefixes, and one for the reports.
+"""
+
+import re
+from bisect import bisect_left
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Q
+
+from .models import BlockchainAnchor
+
+HASH_LENGTH = 64
+MIN_PREFIX_LENGTH = 8
+MAX_BATCH_SIZE = 500
+MAX_MATCHES_PER_TERM = 20
+# Prefixes OR-ed into one query (keeps expressions within SQLite's depth limit)
+PREFIX_QUERY_SIZE = 200
+
+HASH_COLUMNS = ('evidence_hash', 'transaction_hash')
+
+_HEX_RE = re.compile(r'^[0-9a-f]+$')
+_SPLIT_RE = re.compile(r'[\s,;]+')
+
+
+class SearchTerm:
+    """
+    One pasted hash: the known head (prefix), optional tail, and its matches
+    """
+
+    def __init__(self, query: str, head: str = "", tail: str = "", literal: bool = False):
+        self.query = query
+        self.head = head
+        self.tail = tail
+        self.literal = literal
+        self.error: Optional[str] = None
+        self.matches: List[BlockchainAnchor] = []
+        self.truncated = False
+
+    @property
+    def exact(self) -> bool:
+        return self.literal or len(self.head) == HASH_LENGTH
+
+
+def parse_term(query: str) -> SearchTerm:
+    """
+    Normalise one pasted hash: full, prefix, or '<head>...<tail>' as shown in
+    the admin. Anything else is looked up exactly as typed.
+    """
+    value = query.strip().lower()
+    if value.startswith('0x'):
+        value = value[2:]
+    head, separator, tail = value.replace('…', '...').partition('...')
+    if not separator and head and not _HEX_RE.match(head):
+        return SearchTerm(query=query, head=query.strip(), literal=True)
+    term = SearchTerm(query=query, head=head, tail=tail)
+
+    if not head or not _HEX_RE.match(head) or (tail and not _HEX_RE.match(tail)):
+        term.error = "Not a hexadecimal hash"
+    elif len(head) + len(tail) > HASH_LENGTH:
+        term.error = f"Longer than {HASH_LENGTH} characters"
+    elif len(head) < MIN_PREFIX_LENGTH:
+        term.error = f"Prefix must be at least {MIN_PREFIX_LENGTH} characters"
+    return term
+
+
+def split_terms(raw) -> List[str]:
+    """Accept a list of hashes or one string separated by whitespace, commas or semicolons."""
+    if isinstance(raw, str):
+        raw = _SPLIT_RE.split(raw)
+    seen = []
+    for value in raw or []:
+        value = str(value).strip()
+        if value and value not in seen:
+            seen.append(value)
+    return seen
+
+
+def _prefix_condition(head: str) -> Q:
+    upper = head + 'f' * (HASH_LENGTH - len(head))
+    return reduce(or_, (Q(**{f'{column}__gte': head, f'{column}__lte': upper}) for column in HASH_COLUMNS))
+
+
+def search(queries: Iterable[str]) -> List[SearchTerm]:
+    """Resolve every query to its matching anchors (at most MAX_MATCHES_PER_TERM each)."""
+    terms = [parse_term(query) for query in queries]
+    valid = [term for term in terms if term.error is None]
+    exact = [term for term in valid if term.exact]
+    prefixed = [term for term in valid if not term.exact]
+
+    candidates: Dict = {}
+    if exact:
+        heads = [term.head for term in exact]
+        for anchor in BlockchainAnchor.objects.filter(Q(evidence_hash__in=heads) | Q(transaction_hash__in=heads)):
+            candidates[anchor.pk] = anchor
+    for start in range(0, len(prefixed), PREFIX_QUERY_SIZE):
+        chunk = prefixed[start:start + PREFIX_QUERY_SIZE]
+        condition = reduce(or_, (_prefix_condition(term.head) for term in chunk))
+        for anchor in BlockchainAnchor.objects.filter(condition):
+            candidates[anchor.pk] = anchor
+
+    # Sorted (hash, anchor) pairs: each term is a bisect plus a walk over its matches
+    index = sorted(
+        (value, anchor.report_id, column, anchor)
+        for anchor in candidates.values()
+        for column in HASH_COLUMNS
+        for value in (getattr(anchor, column),) if value
+    )
+    keys = [entry[0] for entry in index]
+    for term in valid:
+        position = bisect_left(keys, term.head)
+        while position < len(index) and keys[position].startswith(term.head):
+            value, _, _, anchor = index[position]
+            position += 1
+            if term.exact and value != term.head:
+                break
+            if not value.endswith(term.tail) or anchor in term.matches:
+                continue
+            if len(term.matches) == MAX_MATCHES_PER_TERM:
+                term.truncated = True
+                break
+            term.matches.append(anchor)
+    return terms
+
+
+def reports_for(terms: Iterable[SearchTerm]) -> Dict:
+    """Reports of all matched anchors, keyed by reference code (one query)."""
+    from apps.reports.models import Report
+
+    codes = {anchor.report_id for term in terms for anchor in term.matches}
+    if not codes:
+        return {}
+    return {report.reference_code: report for report in Report.objects.filter(reference_code__in=codes)}
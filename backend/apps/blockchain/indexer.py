@@ -0,0 +1,345 @@
+"""
+Local chain indexer for RRS anchor metadata
+Follows the wallet address's transaction history from a checkpoint and stores
+our label-674 metadata in ChainMetadataRecord, so confirmations and evidence
+verification can be answered with local queries instead of per-tx API calls.
+
+Verification of an anchor the index hasn't seen reads its transaction from
+TransactionMetadata. On a miss the transaction is queued for a background
+fetch (two Blockfrost calls, debounced per transaction like status_refresh)
+and the caller answers "pending" instead of waiting on the network.
+"""
+
+import logging
+import queue
+import re
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import ChainMetadataRecord, IndexerCheckpoint, TransactionMetadata
+
+logger = logging.getLogger(__name__)
+
+RRS_METADATA_LABEL = '674'
+HEX_RE = re.compile(r'[0-9a-fA-F]{32,64}')
+REPORT_RE = re.compile(r'RRS Report:\s*(\S+)')
+
+
+def extract_rrs_metadata(json_metadata) -> Optional[Tuple[str, str]]:
+    """
+    Extract (report_id, evidence_hash) from a label-674 payload.
+
+    Understands every layout our submitters have written:
+      - CardanoEvidenceAnchoring: {"rrs": "RRS", "report": ..., "hash": <32 chars>, ...}
+      - BlockchainUtils:          {"msg": ["RRS Report: ...", ...], "hash": <64 chars>, ...}
+      - CardanoCliSubmitter:      {"msg": ["RRS Report: ...", "Evidence: <32 chars>...", ...]}
+    Returns None for metadata that isn't ours.
+    """
+    if not isinstance(json_metadata, dict):
+        return None
+
+    messages = json_metadata.get('msg') or []
+    if isinstance(messages, str):
+        messages = [messages]
+
+    report_id = json_metadata.get('report') or ''
+    if not report_id:
+        for line in messages:
+            match = REPORT_RE.search(str(line))
+            if match:
+                report_id = match.group(1)
+                break
+
+    evidence_hash = json_metadata.get('hash') or ''
+    if not evidence_hash:
+        for line in messages:
+            if str(line).startswith('Evidence:'):
+                match = HEX_RE.search(str(line))
+                if match:
+                    evidence_hash = match.group(0)
+                    break
+
+    if json_metadata.get('rrs') != 'RRS' and not report_id:
+        return None
+    return report_id, str(evidence_hash).lower()
+
+
+class ChainIndexer:
+    """
+    Incrementally indexes RRS anchoring transactions for one wallet address
+    """
+
+    def __init__(self, address: str = None, network: str = None, blockfrost_key: str = None, session=None):
+        self.network = network or getattr(settings, 'CARDANO_NETWORK', 'preview')
+        self.address = address or getattr(settings, 'CARDANO_PAYMENT_ADDRESS', '')
+        self.blockfrost_key = blockfrost_key or getattr(settings, 'BLOCKFROST_PROJECT_ID', '')
+        self.base_url = f"https://cardano-{self.network}.blockfrost.io/api/v0"
+        self.session = session or requests.Session()
+        self.checkpoint_name = f"address:{self.network}:{self.address}"
+
+    def _get(self, path: str, params: Dict = None):
+        r = self.session.get(
+            f"{self.base_url}{path}",
+            headers={"project_id": self.blockfrost_key},
+            params=params,
+            timeout=15,
+        )
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    def get_checkpoint(self) -> IndexerCheckpoint:
+        checkpoint, _ = IndexerCheckpoint.objects.get_or_create(name=self.checkpoint_name)
+        return checkpoint
+
+    def _address_transactions(self, from_height: int) -> Iterable[Dict]:
+        """Yield the address's transactions at or above from_height, oldest first."""
+        page = 1
+        while True:
+            rows = self._get(
+                f"/addresses/{self.address}/transactions",
+                params={"order": "asc", "page": page, "count": 100, "from": str(from_height)},
+            ) or []
+            yield from rows
+            if len(rows) < 100:
+                return
+            page += 1
+
+    def sync(self, max_transactions: int = None) -> Dict:
+        """
+        Index new transactions since the checkpoint.
+
+        The checkpoint height is inclusive (a block can hold several of our
+        transactions), duplicates are skipped by the unique tx_hash.
+        Returns a summary dict.
+        """
+        if not self.address or not self.blockfrost_key:
+            return {"success": False, "error": "CARDANO_PAYMENT_ADDRESS or Blockfrost key missing"}
+
+        checkpoint = self.get_checkpoint()
+        tip = self._get("/blocks/latest") or {}
+
+        known = set(
+            ChainMetadataRecord.objects
+            .filter(block_height__gte=checkpoint.block_height)
+            .values_list('tx_hash', flat=True)
+        )
+
+        scanned = indexed = 0
+        height = checkpoint.block_height
+        records = []
+        for tx in self._address_transactions(checkpoint.block_height):
+            if max_transactions is not None and scanned >= max_transactions:
+                break
+            scanned += 1
+            height = max(height, tx.get("block_height") or 0)
+            if tx["tx_hash"] in known:
+                continue
+
+            record = self._build_record(tx)
+            if record is not None:
+                records.append(record)
+                indexed += 1
+
+        if records:
+            ChainMetadataRecord.objects.bulk_create(records, ignore_conflicts=True)
+
+        checkpoint.block_height = height
+        checkpoint.tip_height = tip.get("height", checkpoint.tip_height)
+        checkpoint.tip_slot = tip.get("slot", checkpoint.tip_slot)
+        checkpoint.save()
+
+        return {
+            "success": True,
+            "scanned": scanned,
+            "indexed": indexed,
+            "checkpoint": checkpoint.block_height,
+            "tip_height": checkpoint.tip_height,
+        }
+
+    def _build_record(self, tx: Dict, details: Dict = None, keep_unrelated: bool = False,
+                      model=ChainMetadataRecord):
+        """
+        Fetch a transaction's metadata and build an index row (or a model row)
+        if it carries ours. With keep_unrelated, transactions without RRS
+        metadata get a row with blank report_id/evidence_hash (so they are
+        never fetched again).
+        """
+        tx_hash = tx["tx_hash"]
+        entries = self._get(f"/txs/{tx_hash}/metadata") or []
+        payload = next((e.get("json_metadata") for e in entries if str(e.get("label")) == RRS_METADATA_LABEL), None)
+        extracted = extract_rrs_metadata(payload)
+        if extracted is None:
+            if not keep_unrelated:
+                return None
+            extracted = ("", "")
+
+        report_id, evidence_hash = extracted
+        details = details if details is not None else (self._get(f"/txs/{tx_hash}") or {})
+        block_time = tx.get("block_time") or details.get("block_time")
+        fields = dict(
+            tx_hash=tx_hash,
+            block_height=tx.get("block_height") or details.get("block_height"),
+            slot=details.get("slot"),
+            block_time=datetime.fromtimestamp(block_time, tz=dt_timezone.utc) if block_time else None,
+            report_id=report_id[:50],
+            evidence_hash=evidence_hash[:64],
+            network=self.network,
+            metadata=payload if isinstance(payload, dict) else {},
+        )
+        if model is ChainMetadataRecord:
+            fields["label"] = RRS_METADATA_LABEL
+        return model(**fields)
+
+    def fetch_transaction(self, tx_hash: str) -> Optional[TransactionMetadata]:
+        """
+        Fetch one transaction's metadata by hash (two API calls) into
+        TransactionMetadata. Only transactions already in a block are stored:
+        their metadata is immutable from then on.
+        """
+        details = self._get(f"/txs/{tx_hash}")
+        if not details or details.get("block_height") is None:
+            return None
+        record = self._build_record(
+            {"tx_hash": tx_hash, **details}, details=details, keep_unrelated=True, model=TransactionMetadata,
+        )
+        TransactionMetadata.objects.bulk_create([record], ignore_conflicts=True)
+        return record
+
+
+# ------------------------------------------------------------
+# Local queries
+# ------------------------------------------------------------
+
+def _tip_max_age() -> int:
+    return int(getattr(settings, 'INDEXER_TIP_MAX_AGE', 60))
+
+
+def indexed_tip_height(network: str = None) -> Optional[int]:
+    """
+    Chain tip recorded by the network's indexer checkpoints, if one was
+    recorded within INDEXER_TIP_MAX_AGE seconds; None when unknown or stale.
+    """
+    network = network or getattr(settings, 'CARDANO_NETWORK', 'preview')
+    checkpoint = (
+        IndexerCheckpoint.objects
+        .filter(
+            name__startswith=f"address:{network}:",
+            tip_height__isnull=False,
+            updated_at__gte=timezone.now() - timedelta(seconds=_tip_max_age()),
+        )
+        .order_by('-tip_height')
+        .first()
+    )
+    return checkpoint.tip_height if checkpoint else None
+
+
+def local_confirmations(tx_hashes: Iterable[str], network: str = None) -> Dict[str, Dict]:
+    """
+    Resolve status for many transactions from the local index with one query.
+    Returns {tx_hash: {found, block_height, confirmations, slot}} for the
+    network's indexed hashes in a block; empty when the indexed tip is unknown
+    or stale, so callers ask Blockfrost instead of trusting an old count.
+    """
+    network = network or getattr(settings, 'CARDANO_NETWORK', 'preview')
+    tip_height = indexed_tip_height(network)
+    if tip_height is None:
+        return {}
+    rows = ChainMetadataRecord.objects.filter(
+        tx_hash__in=list(tx_hashes), network=network, block_height__isnull=False,
+    ).values_list('tx_hash', 'block_height', 'slot')
+    return {
+        tx_hash: {
+            "found": True,
+            "block_height": block_height,
+            "confirmations": max(0, tip_height - block_height + 1),
+            "slot": slot,
+        }
+        for tx_hash, block_height, slot in rows
+    }
+
+
+def cached_transaction_record(tx_hash: str, network: str = None, blockfrost_key: str = None,
+                              session=None, fetch: bool = False):
+    """
+    Metadata record of one transaction from the local index or TransactionMetadata.
+    On a miss, fetch=True fetches it from Blockfrost now; otherwise it is queued
+    for a background fetch and None is returned. None too if the transaction
+    isn't in a block yet or can't be fetched (nothing is cached then).
+    """
+    record = (
+        ChainMetadataRecord.objects.filter(tx_hash=tx_hash).first()
+        or TransactionMetadata.objects.filter(tx_hash=tx_hash).first()
+    )
+    if record is not None:
+        return record
+    if not fetch:
+        request_transaction_fetch(tx_hash, network, blockfrost_key)
+        return None
+    return _fetch_transaction(tx_hash, network, blockfrost_key, session)
+
+
+def _fetch_transaction(tx_hash: str, network: str = None, blockfrost_key: str = None,
+                       session=None) -> Optional[TransactionMetadata]:
+    indexer = ChainIndexer(network=network, blockfrost_key=blockfrost_key, session=session)
+    if not indexer.blockfrost_key:
+        return None
+    try:
+        return indexer.fetch_transaction(tx_hash)
+    except requests.RequestException as e:
+        logger.warning(f"Fetching metadata of {tx_hash} failed: {e}")
+        return None
+
+
+# ------------------------------------------------------------
+# Background transaction fetches
+# ------------------------------------------------------------
+
+# Seconds before a transaction that is still missing (e.g. not in a block yet) is fetched again
+FETCH_DEBOUNCE = 60
+
+_fetch_queue: "queue.Queue" = queue.Queue()
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def request_transaction_fetch(tx_hash: str, network: str = None, blockfrost_key: str = None) -> bool:
+    """Queue a background metadata fetch unless one was queued within FETCH_DEBOUNCE; never blocks."""
+    network = network or getattr(settings, 'CARDANO_NETWORK', 'preview')
+    if not cache.add(f"chain:txfetch:{network}:{tx_hash}", 1, timeout=FETCH_DEBOUNCE):
+        return False
+    _fetch_queue.put((tx_hash, network, blockfrost_key))
+    with _fetcher_lock:
+        global _fetcher
+        if _fetcher is None or not _fetcher.is_alive():
+            _fetcher = threading.Thread(target=_drain_fetches, name="chain-tx-fetch", daemon=True)
+            _fetcher.start()
+    return True
+
+
+def _drain_fetches():
+    session = requests.Session()
+    while True:
+        tx_hash, network, blockfrost_key = _fetch_queue.get()
+        try:
+            _fetch_transaction(tx_hash, network, blockfrost_key, session=session)
+        except Exception as e:
+            logger.warning(f"Background metadata fetch of {tx_hash} failed: {e}")
+        finally:
+            close_old_connections()
+
+
+def find_indexed_anchor(report_id: str, evidence_hash: str) -> Optional[ChainMetadataRecord]:
+    """Return the earliest indexed on-chain record for report_id matching evidence_hash."""
+    for record in ChainMetadataRecord.objects.filter(report_id=report_id).order_by('block_height'):
+        if record.matches(evidence_hash):
+            return record
+    return None
@@ -0,0 +1,150 @@
+"""Management command to benchmark anchor transaction building and signing.
+
+Usage:
+    python manage.py bench_anchor_tx [--count <N>] [--utxos <U>] [--warmup <W>]
+    python manage.py bench_anchor_tx --processes <P> [--count <N>]
+
+Logic:
+ - Start a local Blockfrost stand-in (fake_blockfrost) and a throwaway signing key,
+   so nothing touches the network or the real wallet
+ - Build + sign --count anchor transactions through the production path
+   (CardanoEvidenceAnchoring.build_signed_transaction), timing wall and CPU time
+ - Time the signature and CBOR serialisation of each transaction separately
+ - Measure memory per transaction with tracemalloc on a separate pass
+ - With --processes, also build the same batch across a process pool and
+   report the aggregate throughput
+"""
+import multiprocessing
+import os
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.blockchain.cardano_utils import CardanoEvidenceAnchoring, PYCARDANO_AVAILABLE
+from apps.blockchain.fake_blockfrost import FakeBlockfrost
+
+if PYCARDANO_AVAILABLE:
+    from pycardano import Address, BlockFrostChainContext, Network, PaymentSigningKey
+
+
+def _anchor_data(cardano, i):
+    return cardano.build_anchor_data(
+        f"RRS-BENCH-{i:06d}", f"{i:064x}", "corruption", is_anonymous=True,
+    )
+
+
+def _worker_build(args):
+    """Build and sign a slice of transactions in a worker process."""
+    base_url, key_payload, start, count = args
+    cardano = CardanoEvidenceAnchoring()
+    context = BlockFrostChainContext(project_id="local", base_url=base_url)
+    signing_key = PaymentSigningKey(key_payload)
+    address = Address(payment_part=signing_key.to_verification_key().hash(), network=Network.TESTNET)
+
+    cpu_start = time.process_time()
+    size = 0
+    for i in range(start, start + count):
+        tx = cardano.build_signed_transaction(context, signing_key, address, _anchor_data(cardano, i), verbose=False)
+        size += len(tx.to_cbor())
+    return time.process_time() - cpu_start, size
+
+
+class Command(BaseCommand):
+    help = "Benchmark PyCardano anchor transaction build/sign/CBOR against a local Blockfrost stand-in"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Transactions to build')
+        parser.add_argument('--utxos', type=int, default=1, help='UTXOs at the wallet address (coin selection cost)')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed transactions before measuring')
+        parser.add_argument('--processes', type=int, default=0, help='Also run the batch on a pool of N processes')
+
+    def handle(self, *args, **options):
+        if not PYCARDANO_AVAILABLE:
+            raise CommandError("PyCardano library not available")
+
+        count = max(1, options['count'])
+        self.cardano = CardanoEvidenceAnchoring()
+
+        with FakeBlockfrost(utxo_count=options['utxos']) as fake:
+            context = BlockFrostChainContext(project_id="local", base_url=fake.base_url)
+            signing_key = PaymentSigningKey.generate()
+            address = Address(payment_part=signing_key.to_verification_key().hash(), network=Network.TESTNET)
+
+            for i in range(options['warmup']):
+                self.cardano.build_signed_transaction(context, signing_key, address, _anchor_data(self.cardano, i), verbose=False)
+
+            self.run_serial(context, signing_key, address, count)
+            self.run_memory(context, signing_key, address, min(count, 50))
+            if options['processes'] > 0:
+                self.run_parallel(fake.base_url, signing_key, count, options['processes'])
+
+    def run_serial(self, context, signing_key, address, count):
+        wall, cpu, sign, cbor, sizes = [], [], [], [], []
+        for i in range(count):
+            anchor_data = _anchor_data(self.cardano, i)
+            w0, c0 = time.perf_counter(), time.process_time()
+            tx = self.cardano.build_signed_transaction(context, signing_key, address, anchor_data, verbose=False)
+            wall.append(time.perf_counter() - w0)
+            cpu.append(time.process_time() - c0)
+
+            t0 = time.perf_counter()
+            signing_key.sign(tx.transaction_body.hash())
+            sign.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            sizes.append(len(tx.to_cbor()))
+            cbor.append(time.perf_counter() - t0)
+
+        cpu_per_tx = statistics.mean(cpu)
+        self.stdout.write(self.style.SUCCESS(f"Serial: {count} anchor transactions (1 core)"))
+        self.stdout.write(f"  {'phase':<22}{'mean ms':>10}{'p95 ms':>10}")
+        for label, samples in (
+            ('build+sign (wall)', wall),
+            ('build+sign (cpu)', cpu),
+            ('  of which sign', sign),
+            ('cbor encode', cbor),
+        ):
+            self.stdout.write(f"  {label:<22}{statistics.mean(samples) * 1000:>10.3f}{_p95(samples) * 1000:>10.3f}")
+        wait = max(0.0, statistics.mean(wall) - cpu_per_tx)
+        self.stdout.write(f"  local API wait/tx     {wait * 1000:>10.3f} ms")
+        self.stdout.write(f"  tx size               {statistics.mean(sizes):>10.0f} bytes")
+        self.stdout.write(self.style.SUCCESS(f"  throughput            {1 / cpu_per_tx:>10.1f} tx/s per core (cpu-bound)"))
+
+    def run_memory(self, context, signing_key, address, count):
+        tracemalloc.start()
+        peaks = []
+        for i in range(count):
+            anchor_data = _anchor_data(self.cardano, i)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            tx = self.cardano.build_signed_transaction(context, signing_key, address, anchor_data, verbose=False)
+            tx.to_cbor()
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            del tx
+        tracemalloc.stop()
+        self.stdout.write(
+            f"  memory per tx         {statistics.mean(peaks) / 1024:>10.1f} KiB peak (max {max(peaks) / 1024:.1f} KiB)"
+        )
+
+    def run_parallel(self, base_url, signing_key, count, processes):
+        chunk = -(-count // processes)
+        jobs = [
+            (base_url, signing_key.payload, start, min(chunk, count - start))
+            for start in range(0, count, chunk)
+        ]
+        w0 = time.perf_counter()
+        with multiprocessing.Pool(processes=processes) as pool:
+            results = pool.map(_worker_build, jobs)
+        wall = time.perf_counter() - w0
+
+        cpu_total = sum(cpu for cpu, _ in results)
+        self.stdout.write(self.style.SUCCESS(f"Parallel: {count} transactions on {processes} processes ({os.cpu_count()} cpus)"))
+        self.stdout.write(f"  wall                  {wall:>10.3f} s (incl. pool start-up)")
+        self.stdout.write(f"  aggregate throughput  {count / wall:>10.1f} tx/s")
+        self.stdout.write(f"  per core              {count / cpu_total:>10.1f} tx/s")
+
+
+def _p95(samples):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
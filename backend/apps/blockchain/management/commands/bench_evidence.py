@@ -0,0 +1,149 @@
+"""Management command to benchmark evidence hashing for bulk verification.
+
+Usage:
+    python manage.py bench_evidence [--count <N>] [--workers <W>] [--codec <version>]
+    python manage.py bench_evidence --from-db [--count <N>]
+
+Logic:
+ - Build --count report rows (synthetic, or reports from the database)
+ - Encode their canonical JSON documents with json.dumps(sort_keys=True) and
+   with the codec's pre-bound encoder, checking the bytes are identical
+ - Hash the documents and hash with the codec, checking plain codecs produce
+   the same hashes (Merkle codecs hash per-field leaves into a root instead)
+ - Run the bulk verification worker (hash_rows) inline and on a pool of
+   --workers processes, as verify_all does
+ - For Merkle codecs, time localising a single changed field per report
+ - Print encodes and hashes per second for each path, and the encoder speed-up
+"""
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.blockchain.evidence import CODECS, DEFAULT_VERSION, EVIDENCE_FIELDS, hash_rows, localize_tampering
+from apps.blockchain.verification import default_workers
+
+
+def _synthetic_rows(count):
+    start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    for i in range(count):
+        yield {
+            'id': uuid.uuid4(),
+            'reference_code': f"RRS-2025-{i:05d}",
+            'category': ('theft', 'corruption', 'road_accident')[i % 3],
+            'description': f"Incident {i} reported near the market, witnesses present. " * 4,
+            'latitude': Decimal('-1.944000') + Decimal(i % 1000) / 100000 if i % 4 else None,
+            'longitude': Decimal('30.061900') + Decimal(i % 1000) / 100000 if i % 4 else None,
+            'location_description': "Kigali, Nyarugenge",
+            'created_at': start + timedelta(minutes=i),
+            'is_anonymous': bool(i % 2),
+            'ipfs_cid': None,
+        }
+
+
+class Command(BaseCommand):
+    help = "Benchmark evidence codec hashing throughput (hashes per second)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50000, help='Reports to hash')
+        parser.add_argument('--workers', type=int, default=default_workers(), help='Processes for the pool run')
+        parser.add_argument('--codec', default=DEFAULT_VERSION, help='Evidence codec version to benchmark')
+        parser.add_argument('--from-db', action='store_true', help='Use reports from the database instead of synthetic rows')
+
+    def handle(self, *args, **options):
+        codec = CODECS.get(options['codec'])
+        if codec is None:
+            raise CommandError(f"Unknown codec version {options['codec']}; known: {', '.join(CODECS)}")
+
+        count = max(1, options['count'])
+        if options['from_db']:
+            from apps.reports.models import Report
+            rows = list(Report.objects.values(*EVIDENCE_FIELDS)[:count])
+            if not rows:
+                raise CommandError("No reports in the database")
+        else:
+            rows = list(_synthetic_rows(count))
+        reports = [SimpleNamespace(**row) for row in rows]
+        payloads = [codec.payload(report) for report in reports]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Evidence codec {codec.version} ({codec.description}) - {len(reports)} reports"
+        ))
+
+        # 1. Encoding only: json.dumps per call vs the codec's pre-bound encoder
+        t0 = time.perf_counter()
+        dumped = [
+            json.dumps(p, sort_keys=True, separators=(',', ':'), ensure_ascii=codec.ensure_ascii).encode('utf-8')
+            for p in payloads
+        ]
+        dumps_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        encoded = [codec.encode(p) for p in payloads]
+        encode_s = time.perf_counter() - t0
+        if encoded != dumped:
+            raise CommandError("Codec encoding differs from json.dumps")
+
+        # 2. One canonical JSON document hash per payload
+        t0 = time.perf_counter()
+        generic = [hashlib.sha256(document).hexdigest() for document in dumped]
+        generic_s = time.perf_counter() - t0
+
+        # 3. The codec's anchored hash (encode + hash)
+        t0 = time.perf_counter()
+        fast = [codec.hash_payload(p) for p in payloads]
+        fast_s = time.perf_counter() - t0
+
+        if not codec.merkle and generic != fast:
+            raise CommandError("Codec hashes differ from json.dumps hashes")
+
+        # 4. Bulk verification worker (payload build + hash + compare), inline
+        field_hashes = [codec.field_hashes(p) for p in payloads]
+        work = [(row, h, codec.version, leaves) for row, h, leaves in zip(rows, fast, field_hashes)]
+        t0 = time.perf_counter()
+        hash_rows(work)
+        inline_s = time.perf_counter() - t0
+
+        self._line("encode, json.dumps", len(payloads), dumps_s, "encodes/s")
+        self._line("encode, pre-bound encoder", len(payloads), encode_s, "encodes/s")
+        self._line("hash encoded document", len(payloads), generic_s)
+        self._line("codec hash (encode + hash)", len(payloads), fast_s)
+        self._line("verify rows, 1 process", len(work), inline_s)
+
+        # Tamper localisation: one field changed per report, compared leaf by leaf
+        if codec.merkle:
+            edited = [SimpleNamespace(**dict(row, description=row['description'] + " (edited)")) for row in rows]
+            t0 = time.perf_counter()
+            localised = [
+                localize_tampering(report, h, codec.version, leaves)
+                for report, h, leaves in zip(edited, fast, field_hashes)
+            ]
+            localise_s = time.perf_counter() - t0
+            if any(fields != ['description'] for fields in localised):
+                raise CommandError("Merkle localisation did not isolate the edited field")
+            self._line("localise tampered field", len(edited), localise_s)
+
+        # 5. Same, across a process pool (as verify_all)
+        workers = max(1, options['workers'])
+        if workers > 1:
+            step = -(-len(work) // (workers * 4))
+            slices = [work[i:i + step] for i in range(0, len(work), step)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(hash_rows, slices[:workers]))  # warm up the workers
+                t0 = time.perf_counter()
+                list(pool.map(hash_rows, slices))
+                pool_s = time.perf_counter() - t0
+            self._line(f"verify rows, {workers} processes", len(work), pool_s)
+
+        self.stdout.write(f"  Pre-bound encoder speed-up over json.dumps: {dumps_s / encode_s:.2f}x")
+        if codec.merkle:
+            self.stdout.write(
+                f"  Merkle root cost vs encode + one document hash: {fast_s / (dumps_s + generic_s):.2f}x"
+            )
+
+    def _line(self, label, n, seconds, unit="hashes/s"):
+        self.stdout.write(f"  {label:<28}{n / seconds:>12,.0f} {unit}  ({seconds * 1000:,.1f} ms)")
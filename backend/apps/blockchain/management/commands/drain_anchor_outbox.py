@@ -0,0 +1,67 @@
+"""Management command to drain the anchoring outbox.
+
+Usage:
+    python manage.py drain_anchor_outbox [--limit <N>] [--max-attempts <M>] [--stuck-slots <S>]
+    python manage.py drain_anchor_outbox --enqueue-pending      # queue existing simulated/failed anchors
+    python manage.py drain_anchor_outbox --follow [--interval <S>]
+
+Logic:
+ - Submitted entries seen on chain are marked done; entries not seen after
+   --stuck-slots slots are rebuilt and re-submitted with fresh UTXOs
+ - Pending entries whose next attempt is due are submitted for real
+ - Failures retry with exponential backoff (--base-delay doubling, capped at
+   --max-delay); after --max-attempts the entry is dead and the anchor failed
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.blockchain.cardano_utils import CardanoEvidenceAnchoring
+from apps.blockchain.outbox import AnchorOutboxWorker, enqueue_unanchored
+
+
+class Command(BaseCommand):
+    help = "Re-submit queued anchors until they are really on chain"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help='Max entries per pass')
+        parser.add_argument('--max-attempts', type=int, default=8, help='Attempts before an entry is dead')
+        parser.add_argument('--base-delay', type=float, default=30, help='First retry delay in seconds')
+        parser.add_argument('--max-delay', type=float, default=3600, help='Retry delay cap in seconds')
+        parser.add_argument('--stuck-slots', type=int, default=1200, help='Slots without inclusion before rebuilding')
+        parser.add_argument('--enqueue-pending', action='store_true', help='Queue existing pending/failed anchors first')
+        parser.add_argument('--follow', action='store_true', help='Keep draining every --interval seconds')
+        parser.add_argument('--interval', type=float, default=30, help='Seconds between passes in follow mode')
+
+    def handle(self, *args, **options):
+        cardano = CardanoEvidenceAnchoring()
+        if not cardano.broadcast_enabled or not cardano.blockfrost_key:
+            self.stdout.write(self.style.WARNING(
+                'Broadcasting disabled (ANCHOR_BROADCAST=False or Blockfrost key missing); outbox left untouched.'
+            ))
+            return
+
+        if options['enqueue_pending']:
+            count = enqueue_unanchored()
+            self.stdout.write(self.style.SUCCESS(f"Queued {count} pending/failed anchors"))
+
+        worker = AnchorOutboxWorker(
+            cardano=cardano,
+            max_attempts=options['max_attempts'],
+            base_delay=options['base_delay'],
+            max_delay=options['max_delay'],
+            stuck_slots=options['stuck_slots'],
+        )
+
+        while True:
+            summary = worker.run_once(limit=options['limit'])
+            self.stdout.write(
+                f"submitted={summary['submitted']} retrying={summary['retrying']} dead={summary['dead']} "
+                f"done={summary['done']} rebuilt={summary['rebuilt']}"
+            )
+            if not options['follow']:
+                return
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('Stopped draining outbox.'))
+                return
@@ -0,0 +1,56 @@
+"""Management command to follow the chain and index RRS anchor metadata locally.
+
+Usage:
+    python manage.py index_chain [--address <addr>] [--max <N>]
+    python manage.py index_chain --follow [--interval <S>]
+
+Logic:
+ - Read the indexer checkpoint (last indexed block height) for the wallet address
+ - Page through the address's transaction history from the checkpoint (oldest first)
+ - For each new transaction, fetch its metadata and keep label-674 RRS payloads
+   (tx hash, block height, slot, report id, evidence hash) in ChainMetadataRecord
+ - Advance the checkpoint and record the chain tip for local confirmation counts
+   (trusted for INDEXER_TIP_MAX_AGE seconds, so --follow keeps it current)
+
+Polling cost scales with new transactions, not with outstanding anchors;
+update_confirmations and verify_evidence_on_chain read the index first.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.blockchain.indexer import ChainIndexer
+
+
+class Command(BaseCommand):
+    help = "Index RRS anchoring metadata from the wallet's on-chain transaction history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--address', type=str, default=None, help='Wallet address to follow (default: CARDANO_PAYMENT_ADDRESS)')
+        parser.add_argument('--max', type=int, default=None, help='Max transactions to scan per sync')
+        parser.add_argument('--follow', action='store_true', help='Keep running and sync every --interval seconds')
+        parser.add_argument('--interval', type=float, default=20, help='Seconds between syncs in follow mode (~1 block)')
+
+    def handle(self, *args, **options):
+        indexer = ChainIndexer(address=options['address'])
+
+        while True:
+            try:
+                result = indexer.sync(max_transactions=options['max'])
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+
+            if not result.get("success"):
+                self.stdout.write(self.style.ERROR(f"Index sync failed: {result.get('error')}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Scanned {result['scanned']} txs, indexed {result['indexed']} "
+                    f"(checkpoint={result['checkpoint']}, tip={result['tip_height']})"
+                ))
+
+            if not options['follow']:
+                return
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING('Stopped following chain.'))
+                return
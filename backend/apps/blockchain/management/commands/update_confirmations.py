@@ -1,77 +1,160 @@
 """Management command to batch refresh blockchain anchor confirmations.
 
 Usage:
-    python manage.py update_confirmations [--max <N>] [--min-conf <M>]
+    python manage.py update_confirmations [--max <N>] [--min-conf <M>] [--workers <W>] [--batch-size <B>]
+    python manage.py update_confirmations --follow [--fast-interval <S>] [--slow-interval <S>] [--deep-conf <D>]
 
 Logic:
- - Select anchors with status in (pending, submitted) OR confirmations < min_conf
- - Query transaction status via CardanoEvidenceAnchoring.get_transaction_status
+ - Select anchors with status in (pending, submitted); in --follow mode also keep
+   tracking confirmed anchors until they reach --deep-conf confirmations
+ - Resolve transactions found in the local chain index (index_chain) locally
+ - Fetch the chain tip once per batch, then query the remaining transactions
+   concurrently (bounded thread pool, shared HTTP session)
  - Update confirmations, block_height, status transitions:
-       pending -> submitted (if on_chain but 0 conf)
+       pending -> submitted (if found on chain)
        submitted -> confirmed (if confirmations >= min_conf)
- - Prints a summary table.
+ - Apply all changes of a batch with a single bulk_update (recording the
+   check time on every anchor) and re-render the certificates of the
+   changed anchors (see status_refresh.refresh_statuses)
+ - Prints a summary table (one-shot) or one line per cycle (--follow).
+
+Follow mode polls each anchor on its own schedule: fresh submissions every
+--fast-interval seconds, backing off linearly with depth up to --slow-interval.
 """
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils import timezone
 from apps.blockchain.models import BlockchainAnchor
 from apps.blockchain.cardano_utils import CardanoEvidenceAnchoring
+from apps.blockchain.status_refresh import refresh_statuses
 
 
 class Command(BaseCommand):
     help = "Refresh blockchain anchor confirmations in batch"
 
     def add_arguments(self, parser):
-        parser.add_argument('--max', type=int, default=100, help='Max anchors to process')
+        parser.add_argument('--max', type=int, default=100, help='Max anchors to process (one-shot mode)')
         parser.add_argument('--min-conf', type=int, default=1, help='Confirmations threshold for confirmed status')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent Blockfrost requests')
+        parser.add_argument('--batch-size', type=int, default=200, help='Anchors per bulk_update batch')
+        parser.add_argument('--follow', action='store_true', help='Keep running and poll anchors on an adaptive schedule')
+        parser.add_argument('--fast-interval', type=float, default=20, help='Seconds between polls of fresh submissions')
+        parser.add_argument('--slow-interval', type=float, default=600, help='Upper bound between polls of deep anchors')
+        parser.add_argument('--deep-conf', type=int, default=2160, help='Stop tracking anchors once this deep (follow mode)')
 
     def handle(self, *args, **options):
-        max_count = options['max']
-        min_conf = options['min_conf']
-        cardano = CardanoEvidenceAnchoring()
+        self.min_conf = options['min_conf']
+        self.workers = max(1, options['workers'])
+        self.batch_size = max(1, options['batch_size'])
+        self.cardano = CardanoEvidenceAnchoring()
+
+        # One pooled session shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+
+        if options['follow']:
+            return self.follow(options)
 
-        queryset = BlockchainAnchor.objects.order_by('updated_at')
-        queryset = queryset.filter(status__in=[BlockchainAnchor.Status.PENDING, BlockchainAnchor.Status.SUBMITTED])[:max_count]
+        queryset = (
+            BlockchainAnchor.objects
+            .filter(status__in=[BlockchainAnchor.Status.PENDING, BlockchainAnchor.Status.SUBMITTED])
+            .exclude(transaction_hash__isnull=True)
+            .exclude(transaction_hash='')
+            .order_by('updated_at')[:options['max']]
+        )
+        anchors = list(queryset)
 
         processed = []
-        for anchor in queryset:
-            tx_hash = anchor.transaction_hash
-            if not tx_hash:
-                continue
-            # Some versions expose a standalone util; fallback if method missing
-            status = cardano.get_transaction_status(tx_hash)
-            on_chain = status.get('on_chain')
-            confirmations = status.get('confirmations') or 0
-            block_height = status.get('block_height')
-
-            old_status = anchor.status
-            # Status transitions
-            if on_chain and confirmations == 0 and anchor.status == BlockchainAnchor.Status.PENDING:
-                anchor.status = BlockchainAnchor.Status.SUBMITTED
-            if confirmations >= min_conf:
-                anchor.status = BlockchainAnchor.Status.CONFIRMED
-
-            anchor.confirmations = confirmations
-            if block_height is not None:
-                anchor.block_number = block_height
-            anchor.save(update_fields=['confirmations', 'block_number', 'status', 'updated_at'])
-
-            processed.append({
-                'report_id': anchor.report_id,
-                'tx_hash': tx_hash[:12] + '...' if tx_hash else None,
-                'old_status': old_status,
-                'new_status': anchor.status,
-                'confirmations': confirmations,
-                'on_chain': on_chain,
-            })
+        for start in range(0, len(anchors), self.batch_size):
+            processed.extend(self.process_batch(anchors[start:start + self.batch_size]))
 
         # Output summary
         if not processed:
             self.stdout.write(self.style.WARNING('No anchors eligible for update.'))
             return
 
-        header = f"Processed {len(processed)} anchors (min_conf={min_conf})"
+        header = f"Processed {len(processed)} anchors (min_conf={self.min_conf}, workers={self.workers})"
         self.stdout.write(self.style.SUCCESS(header))
         for row in processed:
             self.stdout.write(
                 f"{row['report_id']}: {row['tx_hash']} {row['old_status']} -> {row['new_status']} conf={row['confirmations']} on_chain={row['on_chain']}"
-            )
\ No newline at end of file
+            )
+
+    def process_batch(self, anchors):
+        """Fetch statuses for a batch concurrently and persist them with one bulk_update."""
+        return refresh_statuses(
+            anchors, cardano=self.cardano, session=self.session, min_conf=self.min_conf, workers=self.workers
+        )
+
+    # ------------------------------------------------------------------
+    # Follow mode
+    # ------------------------------------------------------------------
+    def poll_interval(self, anchor, on_chain, fast, slow):
+        """Seconds until an anchor should be checked again."""
+        if not on_chain:
+            # Fresh submissions land within a few blocks; old misses are
+            # most likely simulated or dropped and only need a slow retry.
+            age = (timezone.now() - anchor.created_at).total_seconds()
+            return fast if age < slow else slow
+        return min(slow, fast * max(1, anchor.confirmations))
+
+    def follow(self, options):
+        fast = options['fast_interval']
+        slow = max(fast, options['slow_interval'])
+        deep_conf = options['deep_conf']
+        next_due = {}
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Following anchors (fast={fast}s, slow={slow}s, deep_conf={deep_conf}, workers={self.workers})"
+        ))
+
+        try:
+            while True:
+                queryset = (
+                    BlockchainAnchor.objects
+                    .filter(
+                        Q(status__in=[BlockchainAnchor.Status.PENDING, BlockchainAnchor.Status.SUBMITTED])
+                        | Q(status=BlockchainAnchor.Status.CONFIRMED, confirmations__lt=deep_conf)
+                    )
+                    .exclude(transaction_hash__isnull=True)
+                    .exclude(transaction_hash='')
+                    .only('id', 'report_id', 'transaction_hash', 'status', 'confirmations',
+                          'block_number', 'confirmed_at', 'created_at', 'updated_at', 'status_checked_at')
+                    .order_by('updated_at')
+                )
+
+                now = time.monotonic()
+                tracked = set()
+                due = []
+                for anchor in queryset.iterator(chunk_size=1000):
+                    tracked.add(anchor.pk)
+                    if next_due.get(anchor.pk, 0) <= now:
+                        due.append(anchor)
+
+                # Forget anchors that went deep or disappeared
+                for pk in list(next_due):
+                    if pk not in tracked:
+                        del next_due[pk]
+
+                moved = 0
+                for start in range(0, len(due), self.batch_size):
+                    for row in self.process_batch(due[start:start + self.batch_size]):
+                        anchor = row['anchor']
+                        if row['old_status'] != row['new_status']:
+                            moved += 1
+                        next_due[anchor.pk] = time.monotonic() + self.poll_interval(anchor, row['on_chain'], fast, slow)
+
+                if due:
+                    self.stdout.write(
+                        f"[{timezone.now():%H:%M:%S}] checked={len(due)} tracked={len(tracked)} transitions={moved}"
+                    )
+
+                wake = min(next_due.values(), default=time.monotonic() + fast)
+                time.sleep(min(slow, max(1.0, wake - time.monotonic())))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopped following anchors.'))
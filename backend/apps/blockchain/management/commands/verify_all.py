@@ -0,0 +1,61 @@
+"""Management command to verify the integrity of every anchored report.
+
+Usage:
+    python manage.py verify_all [--workers <W>] [--chunk-size <C>] [--show-tampered <N>]
+    python manage.py verify_all --run <id>
+
+Logic:
+ - Create a VerificationRun (visible on the integrity verification dashboard),
+   or execute run <id> created by the staff API (which starts this command
+   in its own process)
+ - Stream anchored reports in chunks of --chunk-size (only evidence fields)
+ - Join each chunk against its anchors with one query
+ - Recompute evidence hashes on a pool of --workers processes (1 = inline)
+ - Bulk insert per-report results and update run progress and heartbeat
+   after each chunk
+"""
+from django.core.management.base import BaseCommand, CommandError
+from apps.blockchain.models import VerificationResult, VerificationRun
+from apps.blockchain.verification import BulkVerifier, default_workers
+
+
+class Command(BaseCommand):
+    help = "Verify evidence hashes of all anchored reports against their anchors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=default_workers(), help='Hashing processes (1 = no pool)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Reports per chunk')
+        parser.add_argument('--show-tampered', type=int, default=20, help='Tampered reports to list at the end')
+        parser.add_argument('--run', type=int, help='Execute this pending run instead of creating one')
+
+    def handle(self, *args, **options):
+        if options['run'] is not None:
+            run = VerificationRun.objects.filter(
+                pk=options['run'], status=VerificationRun.Status.RUNNING, processed=0, finished_at__isnull=True
+            ).first()
+            if run is None:
+                raise CommandError(f"Run {options['run']} is not waiting to be executed")
+            run.workers = max(1, options['workers'])
+        else:
+            run = VerificationRun.objects.create(workers=max(1, options['workers']))
+        self.stdout.write(self.style.SUCCESS(f"Verification run {run.pk} started (workers={run.workers})"))
+
+        def progress(run):
+            self.stdout.write(f"  {run.processed}/{run.total} ({run.progress}%) tampered={run.tampered}")
+
+        run = BulkVerifier(run, chunk_size=options['chunk_size']).execute(progress=progress)
+
+        if run.status == VerificationRun.Status.FAILED:
+            self.stdout.write(self.style.ERROR(f"Run {run.pk} failed: {run.error}"))
+            return
+
+        elapsed = (run.finished_at - run.started_at).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"Run {run.pk}: {run.processed} reports in {elapsed:.1f}s - verified={run.verified} tampered={run.tampered}"
+        ))
+        tampered = run.results.filter(outcome=VerificationResult.Outcome.TAMPERED)[:options['show_tampered']]
+        for result in tampered:
+            self.stdout.write(self.style.WARNING(
+                f"  TAMPERED {result.report_id}: current={result.current_hash[:16]}... anchored={result.anchored_hash[:16]}..."
+                + (f" fields={','.join(result.diverged_fields)}" if result.diverged_fields else "")
+            ))
@@ -0,0 +1,82 @@
+"""
+Per-field Merkle commitments over evidence payloads
+Each evidence field is hashed into a leaf; the Merkle root over the leaves (in
+sorted field order) is what gets anchored. Leaf hashes are stored off-chain on
+BlockchainAnchor.field_hashes, so a mismatch can be localised to the exact
+fields that changed by comparing leaves, without the original JSON.
+
+Leaves and nodes are domain-separated (0x00 / 0x01 prefixes) so a leaf can
+never be confused with an inner node. An odd node at the end of a level is
+promoted unchanged.
+
+Kept free of Django imports: used from pool workers.
+"""
+
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def leaf_hash(encoded_key: str, encoded_value: str) -> bytes:
+    """Leaf for one field: H(0x00 || "key":value) using the canonical JSON encodings."""
+    return hashlib.sha256(LEAF_PREFIX + (encoded_key + ':' + encoded_value).encode('utf-8')).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """Root over leaves in order; the empty tree hashes to H(0x01)."""
+    if not leaves:
+        return hashlib.sha256(NODE_PREFIX).digest()
+    level = list(leaves)
+    while len(level) > 1:
+        nxt = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0]
+
+
+def merkle_proof(leaves: Sequence[bytes], index: int) -> List[Tuple[str, str]]:
+    """
+    Audit path for leaves[index]: list of (side, sibling hex) from the bottom up,
+    side being 'L' or 'R' for where the sibling sits.
+    """
+    proof = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(('L' if sibling < index else 'R', level[sibling].hex()))
+        nxt = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: Sequence[Tuple[str, str]], root: bytes) -> bool:
+    node = leaf
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _node(sibling, node) if side == 'L' else _node(node, sibling)
+    return node == root
+
+
+def root_of(field_hashes: Dict[str, str]) -> Optional[str]:
+    """Root hex recomputed from stored {field: leaf hex} (sorted field order), None if malformed."""
+    try:
+        return merkle_root([bytes.fromhex(field_hashes[key]) for key in sorted(field_hashes)]).hex()
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def diverged_fields(stored: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """Fields whose current leaf differs from the stored (anchored) leaf."""
+    keys = sorted(set(stored) | set(current))
+    return [key for key in keys if stored.get(key) != current.get(key)]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChainMetadataRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tx_hash', models.CharField(max_length=64, unique=True)),
+                ('block_height', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('slot', models.BigIntegerField(blank=True, null=True)),
+                ('block_time', models.DateTimeField(blank=True, null=True)),
+                ('report_id', models.CharField(blank=True, db_index=True, default='', max_length=50)),
+                ('evidence_hash', models.CharField(blank=True, db_index=True, default='', max_length=64)),
+                ('label', models.CharField(default='674', max_length=10)),
+                ('network', models.CharField(default='preview', max_length=20)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('indexed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-block_height'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IndexerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('block_height', models.IntegerField(default=0)),
+                ('tip_height', models.IntegerField(blank=True, null=True)),
+                ('tip_slot', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0002_chain_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnchorOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_id', models.CharField(max_length=20, unique=True)),
+                ('evidence_hash', models.CharField(max_length=64)),
+                ('category', models.CharField(blank=True, default='', max_length=20)),
+                ('is_anonymous', models.BooleanField(default=False)),
+                ('ipfs_cid', models.CharField(blank=True, max_length=100, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('submitted', 'Submitted'), ('done', 'Done'), ('dead', 'Dead')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('transaction_hash', models.CharField(blank=True, max_length=64, null=True)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('submitted_slot', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='blockchain__status_863981_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blockchain', '0003_anchor_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VerificationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='running', max_length=20)),
+                ('workers', models.IntegerField(default=1)),
+                ('total', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('verified', models.IntegerField(default=0)),
+                ('tampered', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('started_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VerificationResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_id', models.CharField(max_length=20)),
+                ('outcome', models.CharField(choices=[('verified', 'Verified'), ('tampered', 'Tampered')], max_length=20)),
+                ('current_hash', models.CharField(max_length=64)),
+                ('anchored_hash', models.CharField(max_length=64)),
+                ('layout', models.CharField(blank=True, default='', max_length=20)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='blockchain.verificationrun')),
+            ],
+            options={
+                'ordering': ['report_id'],
+                'indexes': [models.Index(fields=['run', 'outcome'], name='blockchain__run_id_526974_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:15
+
+import hashlib
+import json
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# Evidence layouts as of this migration, frozen here so later changes to
+# apps.blockchain.evidence can't alter what this backfill computes
+EVIDENCE_FIELDS = (
+    'id', 'reference_code', 'category', 'description', 'latitude', 'longitude',
+    'location_description', 'created_at', 'is_anonymous', 'ipfs_cid',
+)
+
+
+def _layouts(report):
+    """(version, payload, ensure_ascii) of every layout, the default first."""
+    latitude = str(report.latitude) if report.latitude else None
+    longitude = str(report.longitude) if report.longitude else None
+    v1 = {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "latitude": latitude,
+        "longitude": longitude,
+        "location_description": report.location_description,
+        "ipfs_cid": None,
+        "timestamp": report.created_at.isoformat(),
+        "is_anonymous": report.is_anonymous,
+    }
+    summary = {
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description[:500] if report.description else "",
+        "is_anonymous": report.is_anonymous,
+        "created_at": report.created_at.isoformat() if report.created_at else "",
+    }
+    nested = {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "location": {"latitude": latitude, "longitude": longitude, "description": report.location_description},
+        "timestamp": report.created_at.isoformat(),
+        "media_cid": None,
+        "anonymity_flag": report.is_anonymous,
+        "version": "1.0",
+    }
+    return (
+        ('v1', v1, True),
+        ('v1-media', dict(v1, ipfs_cid=report.ipfs_cid), True),
+        ('v1-summary', summary, True),
+        ('v1-nested', nested, False),
+    )
+
+
+def match_layout(report, anchored_hash):
+    """(current hash, matching version or None), as evidence.match_layout did for legacy anchors."""
+    current = None
+    for version, payload, ensure_ascii in _layouts(report):
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=ensure_ascii)
+        candidate = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        if current is None:
+            current = candidate
+        if candidate == anchored_hash:
+            return candidate, version
+    return current, None
+
+
+def detect_evidence_versions(apps, schema_editor):
+    """Record which evidence codec produced each existing anchor (blank if none matches)."""
+    BlockchainAnchor = apps.get_model('blockchain', 'BlockchainAnchor')
+    Report = apps.get_model('reports', 'Report')
+    anchored = dict(BlockchainAnchor.objects.values_list('report_id', 'evidence_hash'))
+
+    detected = defaultdict(list)
+    for report in Report.objects.filter(reference_code__in=list(anchored)).only(*EVIDENCE_FIELDS).iterator(chunk_size=1000):
+        current_hash, version = match_layout(report, anchored[report.reference_code])
+        if version:
+            detected[version].append(report.reference_code)
+
+    for version, report_ids in detected.items():
+        BlockchainAnchor.objects.filter(report_id__in=report_ids).update(evidence_version=version)
+        Report.objects.filter(reference_code__in=report_ids).update(
+            tampered=False,
+            current_evidence_hash=Subquery(
+                BlockchainAnchor.objects.filter(report_id=OuterRef('reference_code')).values('evidence_hash')[:1]
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0004_verification_runs'),
+        ('reports', '0006_report_integrity_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchainanchor',
+            name='evidence_version',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.RunPython(detect_evidence_versions, migrations.RunPython.noop),
+    ]
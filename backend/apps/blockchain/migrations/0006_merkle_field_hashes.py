@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0005_anchor_evidence_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchainanchor',
+            name='field_hashes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='verificationresult',
+            name='diverged_fields',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0006_merkle_field_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchainanchor',
+            name='status_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0007_anchor_status_checked_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockchainanchor',
+            index=models.Index(fields=['updated_at'], name='blockchain__updated_1ca630_idx'),
+        ),
+    ]
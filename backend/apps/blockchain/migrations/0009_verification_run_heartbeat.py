@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0008_anchor_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0009_verification_run_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tx_hash', models.CharField(max_length=64, unique=True)),
+                ('network', models.CharField(default='preview', max_length=20)),
+                ('block_height', models.IntegerField(blank=True, null=True)),
+                ('slot', models.BigIntegerField(blank=True, null=True)),
+                ('block_time', models.DateTimeField(blank=True, null=True)),
+                ('report_id', models.CharField(blank=True, default='', max_length=50)),
+                ('evidence_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('fetched_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -18,6 +18,10 @@ class BlockchainAnchor(models.Model):
     report_id = models.CharField(max_length=20, unique=True, db_index=True)
     
     evidence_hash = models.CharField(max_length=64, db_index=True)
+    # Evidence codec used to compute evidence_hash (apps.blockchain.evidence); blank for legacy anchors
+    evidence_version = models.CharField(max_length=20, blank=True, default="")
+    # Per-field Merkle leaf hashes {field: leaf hex} for Merkle codecs; the root is evidence_hash
+    field_hashes = models.JSONField(default=dict, blank=True)
     ipfs_cid = models.CharField(max_length=100, blank=True, null=True)
     
     transaction_hash = models.CharField(max_length=64, blank=True, null=True, db_index=True)
@@ -36,6 +40,8 @@ class BlockchainAnchor(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     confirmed_at = models.DateTimeField(blank=True, null=True)
+    # Last time the transaction status was checked against the chain
+    status_checked_at = models.DateTimeField(blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -45,6 +51,8 @@ class BlockchainAnchor(models.Model):
             models.Index(fields=['evidence_hash']),
             models.Index(fields=['status']),
             models.Index(fields=['transaction_hash']),
+            # Change feed cursor (see apps/reports/changes.py)
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
@@ -59,3 +67,181 @@ class BlockchainAnchor(models.Model):
         self.confirmed_at = timezone.now()
         self.save()
 
+
+
+class OnChainHashMixin:
+    """
+    evidence_hash as written on chain: some submitters only anchored its first
+    32 hex chars, so a full evidence hash matches by prefix.
+    """
+
+    def matches(self, evidence_hash: str) -> bool:
+        """True if the on-chain (possibly truncated) hash matches a full evidence hash"""
+        return bool(self.evidence_hash) and bool(evidence_hash) and evidence_hash.startswith(self.evidence_hash)
+
+
+class ChainMetadataRecord(OnChainHashMixin, models.Model):
+    """
+    Local index of RRS anchoring metadata (label 674) seen on chain
+    """
+    tx_hash = models.CharField(max_length=64, unique=True)
+    block_height = models.IntegerField(blank=True, null=True, db_index=True)
+    slot = models.BigIntegerField(blank=True, null=True)
+    block_time = models.DateTimeField(blank=True, null=True)
+
+    report_id = models.CharField(max_length=50, blank=True, default="", db_index=True)
+    evidence_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+
+    label = models.CharField(max_length=10, default='674')
+    network = models.CharField(max_length=20, default='preview')
+    metadata = models.JSONField(default=dict, blank=True)
+
+    indexed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-block_height']
+
+    def __str__(self):
+        return f"{self.report_id or '?'} @ {self.block_height} ({self.tx_hash[:12]}...)"
+
+
+class TransactionMetadata(OnChainHashMixin, models.Model):
+    """
+    Metadata of single anchoring transactions fetched for evidence verification,
+    kept apart from the ChainMetadataRecord index that confirmations are read from.
+    Only transactions already in a block are stored (their metadata is immutable);
+    transactions without RRS metadata keep a blank report_id/evidence_hash.
+    """
+    tx_hash = models.CharField(max_length=64, unique=True)
+    network = models.CharField(max_length=20, default='preview')
+    block_height = models.IntegerField(blank=True, null=True)
+    slot = models.BigIntegerField(blank=True, null=True)
+    block_time = models.DateTimeField(blank=True, null=True)
+
+    report_id = models.CharField(max_length=50, blank=True, default="")
+    evidence_hash = models.CharField(max_length=64, blank=True, default="")
+    metadata = models.JSONField(default=dict, blank=True)
+
+    fetched_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.report_id or '?'} @ {self.block_height} ({self.tx_hash[:12]}...)"
+
+
+class IndexerCheckpoint(models.Model):
+    """
+    Progress marker for the chain indexer, plus the last seen chain tip
+    """
+    name = models.CharField(max_length=100, unique=True)
+    block_height = models.IntegerField(default=0)
+    tip_height = models.IntegerField(blank=True, null=True)
+    tip_slot = models.BigIntegerField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.block_height}"
+
+
+class AnchorOutbox(models.Model):
+    """
+    Pending anchor intents that still need a real on-chain transaction.
+    Drained by the drain_anchor_outbox command with retries and backoff.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        SUBMITTED = 'submitted', 'Submitted'
+        DONE = 'done', 'Done'
+        DEAD = 'dead', 'Dead'
+
+    report_id = models.CharField(max_length=20, unique=True)
+    evidence_hash = models.CharField(max_length=64)
+    category = models.CharField(max_length=20, blank=True, default="")
+    is_anonymous = models.BooleanField(default=False)
+    ipfs_cid = models.CharField(max_length=100, blank=True, null=True)
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+
+    transaction_hash = models.CharField(max_length=64, blank=True, null=True)
+    submitted_at = models.DateTimeField(blank=True, null=True)
+    submitted_slot = models.BigIntegerField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_id} - {self.status} (attempt {self.attempts})"
+
+
+class VerificationRun(models.Model):
+    """
+    One bulk integrity audit of all anchored reports (verify_all / staff API)
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING, db_index=True)
+    started_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True)
+    workers = models.IntegerField(default=1)
+
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    verified = models.IntegerField(default=0)
+    tampered = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # Touched by the executing process after every chunk; a running run whose
+    # heartbeat stops is failed as stale (see verification.fail_stale_runs)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Run {self.pk} - {self.status} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self) -> float:
+        return round(100.0 * self.processed / self.total, 1) if self.total else 100.0
+
+
+class VerificationResult(models.Model):
+    """
+    Per-report outcome of a VerificationRun
+    """
+
+    class Outcome(models.TextChoices):
+        VERIFIED = 'verified', 'Verified'
+        TAMPERED = 'tampered', 'Tampered'
+
+    run = models.ForeignKey(VerificationRun, on_delete=models.CASCADE, related_name='results')
+    report_id = models.CharField(max_length=20)
+    outcome = models.CharField(max_length=20, choices=Outcome.choices)
+    current_hash = models.CharField(max_length=64)
+    anchored_hash = models.CharField(max_length=64)
+    layout = models.CharField(max_length=20, blank=True, default="")
+    # Evidence fields that changed since anchoring, when the mismatch could be localised
+    diverged_fields = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ['report_id']
+        indexes = [
+            models.Index(fields=['run', 'outcome']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_id} - {self.outcome}"
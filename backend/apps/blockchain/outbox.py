@@ -0,0 +1,193 @@
+"""
+Persistent anchoring outbox
+Failed or simulated anchors are queued here and re-submitted by a worker
+(drain_anchor_outbox) until they converge to a real on-chain transaction.
+"""
+
+import logging
+import random
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.utils import timezone
+
+from .cardano_utils import CardanoEvidenceAnchoring
+from .models import AnchorOutbox, BlockchainAnchor
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_anchor(
+    report_id: str,
+    evidence_hash: str,
+    category: str = "",
+    is_anonymous: bool = False,
+    ipfs_cid: Optional[str] = None,
+    error: str = "",
+) -> AnchorOutbox:
+    """Queue (or re-queue) a report for real anchoring."""
+    entry, _ = AnchorOutbox.objects.update_or_create(
+        report_id=report_id,
+        defaults={
+            "evidence_hash": evidence_hash,
+            "category": category or "",
+            "is_anonymous": is_anonymous,
+            "ipfs_cid": ipfs_cid,
+            "status": AnchorOutbox.Status.PENDING,
+            "next_attempt_at": timezone.now(),
+            "last_error": error or "",
+        },
+    )
+    logger.info(f"Queued {report_id} for anchoring" + (f" after: {error}" if error else ""))
+    return entry
+
+
+def enqueue_unanchored(limit: int = None) -> int:
+    """Queue every pending (simulated or failed) anchor that has no outbox entry yet."""
+    queued = set(AnchorOutbox.objects.values_list('report_id', flat=True))
+    anchors = (
+        BlockchainAnchor.objects
+        .filter(status__in=[BlockchainAnchor.Status.PENDING, BlockchainAnchor.Status.FAILED])
+        .exclude(report_id__in=queued)
+        .order_by('created_at')
+    )
+    if limit is not None:
+        anchors = anchors[:limit]
+
+    count = 0
+    for anchor in anchors:
+        anchor_data = (anchor.metadata or {}).get("anchor_data") or anchor.metadata or {}
+        enqueue_anchor(
+            anchor.report_id,
+            anchor.evidence_hash,
+            category=anchor_data.get("category", ""),
+            is_anonymous=bool(anchor_data.get("is_anonymous", False)),
+            ipfs_cid=anchor.ipfs_cid,
+        )
+        count += 1
+    return count
+
+
+class AnchorOutboxWorker:
+    """
+    Drains the outbox: submits due entries, retries failures with exponential
+    backoff and rebuilds submissions that never showed up on chain.
+    """
+
+    def __init__(
+        self,
+        cardano: CardanoEvidenceAnchoring = None,
+        max_attempts: int = 8,
+        base_delay: float = 30,
+        max_delay: float = 3600,
+        stuck_slots: int = 1200,
+    ):
+        self.cardano = cardano or CardanoEvidenceAnchoring()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stuck_slots = stuck_slots
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Exponential backoff with +/-20% jitter so retries don't synchronise."""
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    def run_once(self, limit: int = 50) -> Dict:
+        summary = {"submitted": 0, "retrying": 0, "dead": 0, "done": 0, "rebuilt": 0}
+        tip = self.cardano.get_latest_block() or {}
+
+        self._check_submitted(tip, limit, summary)
+
+        due = (
+            AnchorOutbox.objects
+            .filter(status=AnchorOutbox.Status.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:limit]
+        )
+        for entry in due:
+            self._submit(entry, tip, summary)
+        return summary
+
+    def _submit(self, entry: AnchorOutbox, tip: Dict, summary: Dict):
+        anchor_data = self.cardano.build_anchor_data(
+            entry.report_id, entry.evidence_hash, entry.category, entry.is_anonymous,
+            ipfs_cid=entry.ipfs_cid,
+        )
+        entry.attempts += 1
+        try:
+            tx_hash = self.cardano.submit_anchor_data(anchor_data)
+        except Exception as e:
+            entry.last_error = str(e)[:2000]
+            if entry.attempts >= self.max_attempts:
+                entry.status = AnchorOutbox.Status.DEAD
+                BlockchainAnchor.objects.filter(report_id=entry.report_id).update(
+                    status=BlockchainAnchor.Status.FAILED, updated_at=timezone.now()
+                )
+                summary["dead"] += 1
+                logger.error(f"Anchoring {entry.report_id} gave up after {entry.attempts} attempts: {e}")
+            else:
+                entry.next_attempt_at = timezone.now() + self.backoff(entry.attempts)
+                summary["retrying"] += 1
+                logger.warning(f"Anchoring {entry.report_id} failed (attempt {entry.attempts}), retry at {entry.next_attempt_at}: {e}")
+            entry.save()
+            return
+
+        now = timezone.now()
+        entry.status = AnchorOutbox.Status.SUBMITTED
+        entry.transaction_hash = tx_hash
+        entry.submitted_at = now
+        entry.submitted_slot = tip.get("slot")
+        entry.last_error = ""
+        entry.save()
+
+        BlockchainAnchor.objects.update_or_create(
+            report_id=entry.report_id,
+            defaults={
+                "evidence_hash": entry.evidence_hash,
+                "transaction_hash": tx_hash,
+                "status": BlockchainAnchor.Status.SUBMITTED,
+                "network": self.cardano.network,
+                "metadata": {
+                    "anchor_data": anchor_data,
+                    "submission_time": anchor_data["timestamp"],
+                    "outbox_attempts": entry.attempts,
+                },
+            },
+        )
+
+        from apps.reports.models import Report
+        Report.objects.filter(reference_code=entry.report_id).update(
+            transaction_hash=tx_hash, is_hash_anchored=True, updated_at=now
+        )
+        summary["submitted"] += 1
+        logger.info(f"Anchoring {entry.report_id} submitted: {tx_hash}")
+
+    def _check_submitted(self, tip: Dict, limit: int, summary: Dict):
+        """
+        Close entries seen on chain; re-queue ones stuck past stuck_slots (measured
+        from submitted_slot, or from submitted_at when no slot was recorded).
+        """
+        tip_height, tip_slot = tip.get("height"), tip.get("slot")
+        submitted = AnchorOutbox.objects.filter(status=AnchorOutbox.Status.SUBMITTED).order_by('submitted_at')[:limit]
+        for entry in submitted:
+            status = self.cardano.get_transaction_status(entry.transaction_hash, latest_height=tip_height)
+            if status.get("found"):
+                entry.status = AnchorOutbox.Status.DONE
+                entry.save(update_fields=["status", "updated_at"])
+                summary["done"] += 1
+                continue
+
+            if tip_slot is not None and entry.submitted_slot is not None:
+                waited = tip_slot - entry.submitted_slot
+            elif entry.submitted_at is not None:
+                # No slot recorded (tip lookup failed at submit time): one slot per second
+                waited = int((timezone.now() - entry.submitted_at).total_seconds())
+            else:
+                continue
+            if waited > self.stuck_slots:
+                # Dropped from the mempool (or TTL expired): rebuild with fresh UTXOs
+                entry.status = AnchorOutbox.Status.PENDING
+                entry.next_attempt_at = timezone.now()
+                entry.last_error = f"Not on chain after {waited} slots; rebuilding"
+                entry.save(update_fields=["status", "next_attempt_at", "last_error", "updated_at"])
+                summary["rebuilt"] += 1
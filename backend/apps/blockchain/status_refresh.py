@@ -0,0 +1,192 @@
+"""
+Anchor status refresh
+Batch confirmation refresh shared by update_confirmations and the background
+refresher used by public pages. Changed anchors get their certificates
+re-rendered in one batch and a live event pushed to open dashboards (cached
+verification responses are versioned by anchor state and need no purge).
+
+Pages render from the stored anchor state and call request_refresh(), which
+enqueues the anchor when its status is older than ANCHOR_STATUS_STALE_AFTER.
+Each anchor is debounced with a cache.add key, so popular pages trigger at
+most one Blockfrost lookup per anchor per debounce window. A single daemon
+thread drains the queue in batches.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.dashboard import live
+from apps.reports import certificates
+
+from .cardano_utils import CardanoEvidenceAnchoring
+from .indexer import local_confirmations
+from .models import BlockchainAnchor
+
+logger = logging.getLogger(__name__)
+
+UPDATE_FIELDS = ['confirmations', 'block_number', 'status', 'confirmed_at', 'updated_at', 'status_checked_at']
+
+BATCH_SIZE = 50
+
+
+def _stale_after() -> int:
+    return int(getattr(settings, 'ANCHOR_STATUS_STALE_AFTER', 120))
+
+
+def _debounce_key(anchor_pk) -> str:
+    return f"anchor:refresh:{anchor_pk}"
+
+
+def refresh_statuses(anchors, cardano=None, session=None, min_conf: int = 1, workers: int = 8) -> List[Dict]:
+    """
+    Fetch statuses for a batch of anchors and persist them with one bulk_update.
+
+    Transactions in the local chain index are resolved without the network; the
+    rest share one chain-tip lookup and are queried concurrently. Returns one
+    row per anchor (report_id, tx_hash, old/new status, confirmations, on_chain).
+    """
+    if not anchors:
+        return []
+    cardano = cardano or CardanoEvidenceAnchoring()
+
+    indexed = local_confirmations([a.transaction_hash for a in anchors], cardano.network)
+    remote = [a for a in anchors if a.transaction_hash not in indexed]
+
+    remote_statuses = {}
+    if remote:
+        tip = cardano.get_latest_block(session=session) or {}
+        latest_height = tip.get('height')
+
+        def fetch(anchor):
+            return cardano.get_transaction_status(
+                anchor.transaction_hash, latest_height=latest_height, session=session
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(remote)))) as pool:
+            for anchor, status in zip(remote, pool.map(fetch, remote)):
+                remote_statuses[anchor.transaction_hash] = status
+
+    statuses = [indexed.get(a.transaction_hash) or remote_statuses[a.transaction_hash] for a in anchors]
+
+    now = timezone.now()
+    changed = []
+    processed = []
+    for anchor, status in zip(anchors, statuses):
+        on_chain = bool(status.get('found'))
+        old_status = anchor.status
+        old_values = (anchor.status, anchor.confirmations, anchor.block_number)
+
+        if on_chain:
+            confirmations = status.get('confirmations')
+            if confirmations is None:
+                # Tip unknown: keep the last count rather than resetting it
+                confirmations = anchor.confirmations
+            block_height = status.get('block_height')
+
+            # Status transitions
+            if anchor.status == BlockchainAnchor.Status.PENDING:
+                anchor.status = BlockchainAnchor.Status.SUBMITTED
+            if confirmations >= min_conf:
+                anchor.status = BlockchainAnchor.Status.CONFIRMED
+                if not anchor.confirmed_at:
+                    anchor.confirmed_at = now
+
+            anchor.confirmations = confirmations
+            if block_height is not None:
+                anchor.block_number = block_height
+
+        if (anchor.status, anchor.confirmations, anchor.block_number) != old_values:
+            anchor.updated_at = now
+            changed.append(anchor)
+        anchor.status_checked_at = now
+
+        processed.append({
+            'report_id': anchor.report_id,
+            'tx_hash': anchor.transaction_hash[:12] + '...',
+            'old_status': old_status,
+            'new_status': anchor.status,
+            'confirmations': anchor.confirmations,
+            'on_chain': on_chain,
+            'anchor': anchor,
+        })
+
+    # Every checked anchor records the check time; only changed ones get a new updated_at
+    BlockchainAnchor.objects.bulk_update(anchors, UPDATE_FIELDS)
+    if changed:
+        # bulk_update sends no save signals
+        certificates.render_batch(a.report_id for a in changed)
+        for anchor in changed:
+            live.publish('anchor', 'updated', live.anchor_event(anchor))
+    return processed
+
+
+def is_stale(anchor) -> bool:
+    if not anchor.transaction_hash:
+        return False
+    if anchor.status_checked_at is None:
+        return True
+    return timezone.now() - anchor.status_checked_at > timedelta(seconds=_stale_after())
+
+
+# ------------------------------------------------------------
+# Background refresher
+# ------------------------------------------------------------
+
+_queue: "queue.Queue" = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def request_refresh(anchor) -> bool:
+    """
+    Enqueue a background status refresh if the anchor is stale and not already
+    queued within the debounce window. Never blocks on the network.
+    """
+    if anchor is None or not is_stale(anchor):
+        return False
+    if not cache.add(_debounce_key(anchor.pk), 1, timeout=_stale_after()):
+        return False
+    _queue.put(anchor.pk)
+    _ensure_worker()
+    return True
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain, name="anchor-status-refresh", daemon=True)
+            _worker.start()
+
+
+def _drain():
+    cardano = None
+    while True:
+        pks = [_queue.get()]
+        while len(pks) < BATCH_SIZE:
+            try:
+                pks.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            cardano = cardano or CardanoEvidenceAnchoring()
+            anchors = list(
+                BlockchainAnchor.objects
+                .filter(pk__in=pks)
+                .exclude(transaction_hash__isnull=True)
+                .exclude(transaction_hash='')
+            )
+            refresh_statuses(anchors, cardano=cardano)
+        except Exception as e:
+            logger.warning(f"Background status refresh of {len(pks)} anchors failed: {e}")
+        finally:
+            close_old_connections()
@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from . import hash_search, indexer
+from .cardano_cli_submitter import BatchSubmissionError, CardanoCliSubmitter
+from .models import BlockchainAnchor, ChainMetadataRecord, TransactionMetadata, VerificationRun
+
+STUB_CLI = Path(__file__).resolve().parent / 'testdata' / 'cardano-cli'
+ADDRESS = 'addr_test1vza7nn8c7p7rgcqsdjxvmwyqdztq9tgp8q89p2xugxc8djqmphalu'
+
+
+def _response(status_code, payload):
+    response = mock.Mock(status_code=status_code, text=json.dumps(payload))
+    response.json.return_value = payload
+    return response
+
+
+class CardanoCliBatchSubmissionTests(SimpleTestCase):
+    """submit_evidence_transactions against the stub cardano-cli and a mocked Blockfrost."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.key_path = os.path.join(self.workdir.name, 'payment.skey')
+        Path(self.key_path).write_text('{}')
+        self.log_path = os.path.join(self.workdir.name, 'cli.log')
+        patcher = mock.patch.dict(os.environ, {'CARDANO_CLI_STUB_LOG': self.log_path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.submitter = CardanoCliSubmitter(network='preview', mode='native', cli_path=str(STUB_CLI))
+        self.utxos = _response(200, [
+            {'tx_hash': 'a' * 64, 'tx_index': 1, 'amount': [{'unit': 'lovelace', 'quantity': '50000000'}]},
+        ])
+
+    def anchors(self, count):
+        return [
+            {'report_id': f'RRS-2026-{i:05d}', 'evidence_hash': f'{i:064x}', 'category': 'bribery', 'timestamp': i}
+            for i in range(count)
+        ]
+
+    def submit(self, count, submit_responses):
+        with mock.patch('requests.get', return_value=self.utxos), \
+                mock.patch('requests.post', side_effect=submit_responses) as self.post:
+            return self.submitter.submit_evidence_transactions(
+                self.anchors(count), self.key_path, ADDRESS, 'preview-key'
+            )
+
+    def test_batch_is_chained_and_submitted_in_order(self):
+        tx_hashes = self.submit(3, lambda *args, **kwargs: _response(200, {}))
+
+        self.assertEqual(len(tx_hashes), 3)
+        self.assertEqual(self.post.call_count, 3)
+        build_calls = [line for line in Path(self.log_path).read_text().splitlines() if 'build-raw' in line]
+        # The first transaction spends the wallet UTXO, each later one the previous change output
+        self.assertIn(f"--tx-in {'a' * 64}#1", build_calls[0])
+        self.assertIn(f"--tx-in {tx_hashes[0]}#0", build_calls[1])
+        self.assertIn(f"--tx-in {tx_hashes[1]}#0", build_calls[2])
+
+    def test_failure_keeps_hashes_of_submitted_transactions(self):
+        responses = [_response(200, 'f' * 64), _response(200, {}), _response(400, {'error': 'BadInputs'})]
+
+        with self.assertRaises(BatchSubmissionError) as raised:
+            self.submit(4, responses)
+
+        error = raised.exception
+        self.assertEqual(error.failed_index, 2)
+        self.assertEqual(len(error.tx_hashes), 2)
+        # Blockfrost's returned hash is preferred over the locally computed one
+        self.assertEqual(error.tx_hashes[0], 'f' * 64)
+        self.assertIn('Transaction 3/4 submission failed: 400', str(error))
+        self.assertEqual(self.post.call_count, 3)
+
+    def test_cli_failure_submits_nothing(self):
+        os.remove(self.key_path)
+
+        with self.assertRaisesMessage(Exception, 'missing signing key'):
+            self.submit(2, [])
+        self.assertEqual(self.post.call_count, 0)
+
+
+class HashSearchTests(TestCase):
+    def setUp(self):
+        self.anchor = BlockchainAnchor.objects.create(
+            report_id='RRS-HS-1', evidence_hash='ab' * 32, transaction_hash='FAILED_ANCHOR_RRS-HS-1',
+        )
+        BlockchainAnchor.objects.create(
+            report_id='RRS-HS-2', evidence_hash='cd' * 32, transaction_hash='FAILED_ANCHOR_RRS-HS-12',
+        )
+
+    def test_prefix_and_truncated(self):
+        prefix, truncated = hash_search.search(['ABABABAB', 'abababababababab...abababab'])
+        self.assertEqual(prefix.matches, [self.anchor])
+        self.assertEqual(truncated.matches, [self.anchor])
+
+    def test_non_hex_value_matches_exactly(self):
+        term, = hash_search.search(['FAILED_ANCHOR_RRS-HS-1'])
+        self.assertIsNone(term.error)
+        self.assertEqual(term.matches, [self.anchor])
+        self.assertEqual(hash_search.search(['FAILED_ANCHOR_RRS'])[0].matches, [])
+
+    def test_invalid_truncated_hash(self):
+        self.assertEqual(hash_search.search(['abcdefgh...1234'])[0].error, "Not a hexadecimal hash")
+
+
+class TransactionMetadataFetchTests(TestCase):
+    TX = 'e' * 64
+
+    def session(self):
+        session = mock.Mock()
+        session.get.side_effect = lambda url, **kwargs: _response(200, (
+            [{'label': '674', 'json_metadata': {'rrs': 'RRS', 'report': 'RRS-TX-1', 'hash': 'ab' * 16}}]
+            if url.endswith('/metadata') else {'block_height': 100, 'slot': 5000, 'block_time': 1700000000}
+        ))
+        return session
+
+    def test_fetch_is_cached_apart_from_the_index(self):
+        session = self.session()
+        record = indexer.cached_transaction_record(self.TX, 'preview', 'key', session=session, fetch=True)
+        self.assertTrue(record.matches('ab' * 32))
+        self.assertEqual(session.get.call_count, 2)
+        self.assertTrue(TransactionMetadata.objects.filter(tx_hash=self.TX, report_id='RRS-TX-1').exists())
+        self.assertFalse(ChainMetadataRecord.objects.exists())
+
+        again = indexer.cached_transaction_record(self.TX, 'preview', 'key', session=session)
+        self.assertEqual(again.tx_hash, self.TX)
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_miss_is_fetched_in_the_background(self):
+        with mock.patch.object(indexer, 'request_transaction_fetch') as request_fetch, \
+                mock.patch.object(indexer, '_fetch_transaction') as fetch:
+            self.assertIsNone(indexer.cached_transaction_record(self.TX, 'preview', 'key'))
+        request_fetch.assert_called_once_with(self.TX, 'preview', 'key')
+        fetch.assert_not_called()
+
+
+class VerificationRunViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        patcher = mock.patch('apps.blockchain.views.start_verification_run',
+                             side_effect=lambda user, workers: VerificationRun.objects.create(workers=workers or 1))
+        self.start = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, workers):
+        return self.client.post(reverse('verification_runs'), {'workers': workers}, content_type='application/json')
+
+    def test_workers_are_clamped(self):
+        with self.settings(VERIFY_MAX_WORKERS=4), mock.patch('os.cpu_count', return_value=16):
+            self.assertEqual(self.post(1000).status_code, 202)
+        self.assertEqual(self.start.call_args.kwargs['workers'], 4)
+
+    def test_invalid_workers_are_rejected(self):
+        for workers in (0, -3, 'many'):
+            self.assertEqual(self.post(workers).status_code, 400)
+        self.start.assert_not_called()
@@ -16,4 +16,6 @@ urlpatterns = [
     # Hash search endpoint MUST come before parameterized route to match first
     path('integrity/verify/', views.HashSearchView.as_view(), name='hash_search'),
     path('integrity/verify/<str:report_id>/', views.IntegrityVerificationView.as_view(), name='integrity_verify'),
+    path('integrity/runs/', views.VerificationRunView.as_view(), name='verification_runs'),
+    path('integrity/runs/<int:run_id>/', views.VerificationRunView.as_view(), name='verification_run_detail'),
 ]
\ No newline at end of file
@@ -1,25 +1,16 @@
 import json
 import hashlib
 import requests
-import time
 from datetime import datetime
 from django.conf import settings
 from pathlib import Path
 
+from .evidence import VERSION_NESTED, get_codec
+
 # PyCardano imports
 try:
     from pycardano import (
-        BlockFrostChainContext,
-        TransactionBuilder as PyCardanoTransactionBuilder,
-        TransactionOutput,
-        Value,
-        Metadata,
-        AlonzoMetadata,
-        AuxiliaryData,
         TransactionBody,
-        TransactionWitnessSet,
-        VerificationKeyWitness,
-        Transaction,
         PaymentExtendedSigningKey,
         PaymentSigningKey,
         Address,
@@ -144,77 +135,13 @@ class BlockchainUtils:
             print(f"❌ Error loading wallet: {e}")
             return None, None
 
-    def anchor_evidence_hash(self, report_id, evidence_hash, category, is_anonymous):
-        """
-        Anchors the evidence hash to the Cardano blockchain.
-        Returns the transaction hash.
-        """
-        if not self.should_broadcast or not PYCARDANO_AVAILABLE:
-            print("⚠️ Broadcasting disabled or PyCardano missing. Simulating.")
-            return hashlib.sha256(f"{report_id}{evidence_hash}{time.time()}".encode()).hexdigest()
-
-        try:
-            print(f"🔗 Anchoring Report {report_id} to Cardano ({self.network})...")
-            
-            # 1. Setup Context
-            context = BlockFrostChainContext(
-                project_id=self.blockfrost_key,
-                base_url="https://cardano-preview.blockfrost.io/api"
-            )
-            
-            # 2. Get Wallet
-            payment_address, signing_key = self._get_wallet_info()
-            if not payment_address:
-                raise Exception("Could not load wallet for signing.")
-                
-            # 3. Build Metadata
-            meta_dict = {
-                674: {
-                    "msg": [f"RRS Report: {report_id}", f"Cat: {category}"],
-                    "hash": evidence_hash,
-                    "anon": "Yes" if is_anonymous else "No",
-                    "ts": int(time.time())
-                }
-            }
-            
-            metadata_obj = Metadata(meta_dict)
-            alonzo_metadata = AlonzoMetadata(metadata=metadata_obj)
-            auxiliary_data = AuxiliaryData(data=alonzo_metadata)
-            
-            # 4. Build Transaction
-            builder = PyCardanoTransactionBuilder(context)
-            builder.add_input_address(payment_address)
-            builder.add_output(TransactionOutput(payment_address, Value(1500000))) # Min ADA
-            builder.auxiliary_data = auxiliary_data
-            
-            tx_body = builder.build(change_address=payment_address)
-            
-            # 5. Sign
-            signature = signing_key.sign(tx_body.hash())
-            vk = signing_key.to_verification_key()
-            vk_witness = VerificationKeyWitness(vk, signature)
-            witness_set = TransactionWitnessSet(vkey_witnesses=[vk_witness])
-            
-            tx = Transaction(tx_body, witness_set, auxiliary_data=auxiliary_data)
-            
-            # 6. Submit
-            print("🚀 Submitting transaction to Blockfrost...")
-            context.submit_tx(tx)
-            
-            tx_id = str(tx.id)
-            print(f"✅ Transaction submitted: {tx_id}")
-            return tx_id
-
-        except Exception as e:
-            print(f"❌ Blockchain anchoring failed: {e}")
-            import traceback
-            traceback.print_exc()
-            # Fallback to simulation so the report is still saved
-            return f"FAILED_ANCHOR_{int(time.time())}"
-
-    def verify_evidence_hash(self, report_id, evidence_hash):
-        """Simulated verification"""
-        return True
+    def verify_evidence_hash(self, report_id, evidence_hash, tx_hash=None):
+        """True if the anchoring transaction's on-chain metadata carries this evidence hash"""
+        from .cardano_utils import CardanoEvidenceAnchoring
+        result = CardanoEvidenceAnchoring(network=self.network, blockfrost_key=self.blockfrost_key).verify_evidence_on_chain(
+            report_id, evidence_hash, tx_hash=tx_hash, fetch=True
+        )
+        return result["verified"]
 
 
 # ============================================================
@@ -276,10 +203,7 @@ class EvidenceManager:
 
     @staticmethod
     def calculate_evidence_hash(evidence_data):
-        canonical_json = json.dumps(
-            evidence_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False
-        )
-        return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+        return get_codec(VERSION_NESTED).hash_payload(evidence_data)
 
     @staticmethod
     def verify(original_hash, current_data):
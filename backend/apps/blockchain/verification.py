@@ -0,0 +1,199 @@
+"""
+Bulk integrity verification
+Streams anchored reports in chunks, recomputes their evidence hashes across a
+process pool and joins them against anchors in bulk. Progress and per-report
+outcomes are written to VerificationRun / VerificationResult.
+
+Runs started from the staff API execute in a detached `manage.py verify_all
+--run <id>` process, never inside a web worker, so recycling or restarting
+web workers doesn't interrupt them. The executing process records a
+heartbeat after every chunk; a running run without one for
+VERIFICATION_STALE_AFTER seconds (its process died) is marked failed, so a
+new run can be started.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .evidence import EVIDENCE_FIELDS, PAYLOAD_FIELD_SOURCES, hash_rows
+from .models import BlockchainAnchor, VerificationResult, VerificationRun
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    return max(1, min(settings.VERIFY_MAX_WORKERS, (os.cpu_count() or 1)))
+
+
+def clamp_workers(requested: int) -> int:
+    """Worker processes for a requested count, capped at VERIFY_MAX_WORKERS and the CPU count."""
+    return max(1, min(requested, settings.VERIFY_MAX_WORKERS, (os.cpu_count() or 1)))
+
+
+class BulkVerifier:
+    """
+    Verifies every anchored report for one VerificationRun
+    """
+
+    def __init__(self, run: VerificationRun, chunk_size: int = 2000, workers: int = None):
+        self.run = run
+        self.chunk_size = max(1, chunk_size)
+        self.workers = max(1, workers or run.workers or 1)
+
+    def anchored_reports(self):
+        from apps.reports.models import Report
+        return (
+            Report.objects
+            .filter(reference_code__in=BlockchainAnchor.objects.values('report_id'))
+            .order_by('created_at')
+        )
+
+    def execute(self, progress=None) -> VerificationRun:
+        run = self.run
+        reports = self.anchored_reports()
+        run.total = reports.count()
+        run.workers = self.workers
+        run.heartbeat_at = timezone.now()
+        run.save(update_fields=['total', 'workers', 'heartbeat_at'])
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            chunk = []
+            for values in reports.values(*EVIDENCE_FIELDS).iterator(chunk_size=self.chunk_size):
+                chunk.append(values)
+                if len(chunk) >= self.chunk_size:
+                    self._verify_chunk(chunk, pool)
+                    chunk = []
+                    if progress:
+                        progress(run)
+            if chunk:
+                self._verify_chunk(chunk, pool)
+                if progress:
+                    progress(run)
+        except Exception as e:
+            logger.exception(f"Verification run {run.pk} failed")
+            run.status = VerificationRun.Status.FAILED
+            run.error = str(e)[:2000]
+        else:
+            run.status = VerificationRun.Status.COMPLETED
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'error', 'finished_at'])
+        return run
+
+    def _verify_chunk(self, chunk, pool):
+        codes = [values['reference_code'] for values in chunk]
+        anchored = {
+            report_id: (evidence_hash, version, field_hashes)
+            for report_id, evidence_hash, version, field_hashes in (
+                BlockchainAnchor.objects
+                .filter(report_id__in=codes)
+                .values_list('report_id', 'evidence_hash', 'evidence_version', 'field_hashes')
+            )
+        }
+        pairs = [(values, *anchored.get(values['reference_code'], (None, None, None))) for values in chunk]
+
+        if pool is None:
+            outcomes = hash_rows(pairs)
+        else:
+            step = -(-len(pairs) // self.workers)
+            slices = [pairs[i:i + step] for i in range(0, len(pairs), step)]
+            outcomes = [row for part in pool.map(hash_rows, slices) for row in part]
+
+        results = []
+        verified = 0
+        detected = defaultdict(list)
+        for reference_code, current_hash, version, diverged in outcomes:
+            anchored_hash, recorded_version, _ = anchored.get(reference_code, (None, None, None))
+            if version:
+                verified += 1
+                if not recorded_version:
+                    detected[version].append(reference_code)
+            results.append(VerificationResult(
+                run=self.run,
+                report_id=reference_code,
+                outcome=VerificationResult.Outcome.VERIFIED if version else VerificationResult.Outcome.TAMPERED,
+                current_hash=current_hash,
+                anchored_hash=anchored_hash or "",
+                layout=version or "",
+                diverged_fields=[PAYLOAD_FIELD_SOURCES.get(key, key) for key in diverged or []],
+            ))
+        VerificationResult.objects.bulk_create(results, batch_size=500)
+
+        # Record the codec version detected for legacy anchors (one UPDATE per version)
+        for version, report_ids in detected.items():
+            BlockchainAnchor.objects.filter(report_id__in=report_ids, evidence_version="").update(evidence_version=version)
+
+        VerificationRun.objects.filter(pk=self.run.pk).update(
+            processed=F('processed') + len(outcomes),
+            verified=F('verified') + verified,
+            tampered=F('tampered') + (len(outcomes) - verified),
+            heartbeat_at=timezone.now(),
+        )
+        self.run.refresh_from_db(fields=['processed', 'verified', 'tampered'])
+
+
+def _stale_after() -> int:
+    return int(getattr(settings, 'VERIFICATION_STALE_AFTER', 300))
+
+
+def fail_stale_runs() -> int:
+    """Mark running runs without a recent heartbeat as failed; returns how many."""
+    now = timezone.now()
+    return (
+        VerificationRun.objects
+        .filter(status=VerificationRun.Status.RUNNING)
+        .annotate(last_seen=Coalesce('heartbeat_at', 'started_at'))
+        .filter(last_seen__lt=now - timedelta(seconds=_stale_after()))
+        .update(
+            status=VerificationRun.Status.FAILED,
+            error="Verification process stopped responding",
+            finished_at=now,
+        )
+    )
+
+
+def start_verification_run(user=None, workers: int = None, chunk_size: int = 2000) -> VerificationRun:
+    """
+    Create a run and execute it in a detached verify_all process; returns
+    immediately. The run is failed if the process can't be started.
+    """
+    run = VerificationRun.objects.create(
+        started_by=user, workers=workers or default_workers(), heartbeat_at=timezone.now()
+    )
+    command = [
+        sys.executable, str(settings.BASE_DIR / 'manage.py'), 'verify_all',
+        '--run', str(run.pk), '--workers', str(run.workers), '--chunk-size', str(chunk_size),
+    ]
+    try:
+        # Own session: the run outlives the web worker that started it
+        subprocess.Popen(
+            command, cwd=settings.BASE_DIR, start_new_session=True,
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.error(f"Could not start verification run {run.pk}: {e}")
+        run.status = VerificationRun.Status.FAILED
+        run.error = f"Could not start the verification process: {e}"
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'error', 'finished_at'])
+    return run
+
+
+def latest_run() -> Optional[VerificationRun]:
+    fail_stale_runs()
+    return VerificationRun.objects.first()
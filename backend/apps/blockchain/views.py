@@ -9,8 +9,12 @@ from rest_framework.response import Response
 from rest_framework import status as http_status
 from rest_framework.permissions import IsAuthenticated
 from apps.reports.models import Report
-from .models import BlockchainAnchor
+from .models import BlockchainAnchor, VerificationResult, VerificationRun
 from .cardano_utils import CardanoEvidenceAnchoring, BlockchainStatusTracker
+from . import hash_search
+from .evidence import get_codec
+from .outbox import enqueue_anchor
+from .verification import clamp_workers, fail_stale_runs, start_verification_run
 import json
 
 
@@ -78,20 +82,11 @@ class BlockchainAnchorStatusView(APIView):
                 pass
             
             # Create new anchor
-            from django.utils import timezone
-            
-            # Prepare evidence data
-            evidence_data = {
-                "reference_code": report.reference_code,
-                "category": report.category,
-                "description": report.description[:500] if report.description else "",
-                "is_anonymous": report.is_anonymous,
-                "created_at": report.created_at.isoformat() if report.created_at else timezone.now().isoformat(),
-            }
-            
-            # Generate evidence hash
+            # Generate evidence hash with the current evidence codec
             cardano = CardanoEvidenceAnchoring()
-            evidence_hash = cardano.generate_evidence_hash(evidence_data)
+            codec = get_codec()
+            evidence_payload = codec.payload(report)
+            evidence_hash = codec.hash_payload(evidence_payload)
             
             # Create anchor transaction
             tx_result = cardano.create_anchor_transaction(
@@ -108,11 +103,23 @@ class BlockchainAnchorStatusView(APIView):
             
             tx_hash = tx_result.get("tx_hash")
             simulated = tx_result.get("simulated", False)
+            broadcast_failed = tx_result.get("broadcast_failed", False)
+            
+            # Failed broadcasts go to the outbox instead of keeping a fake hash
+            if broadcast_failed:
+                tx_hash = None
+                enqueue_anchor(
+                    report.reference_code, evidence_hash,
+                    category=report.category, is_anonymous=report.is_anonymous,
+                    error=tx_result.get("error", ""),
+                )
             
             # Persist the anchor
             anchor = BlockchainAnchor.objects.create(
                 report_id=report.reference_code,
                 evidence_hash=evidence_hash,
+                evidence_version=codec.version,
+                field_hashes=codec.field_hashes(evidence_payload),
                 transaction_hash=tx_hash,
                 status=BlockchainAnchor.Status.SUBMITTED if not simulated else BlockchainAnchor.Status.PENDING,
                 network=cardano.network,
@@ -122,7 +129,7 @@ class BlockchainAnchorStatusView(APIView):
             # Update report
             report.evidence_hash = evidence_hash
             report.transaction_hash = tx_hash
-            report.is_hash_anchored = True
+            report.is_hash_anchored = not broadcast_failed
             report.save(update_fields=["evidence_hash", "transaction_hash", "is_hash_anchored", "updated_at"])
             
             return Response({
@@ -133,6 +140,7 @@ class BlockchainAnchorStatusView(APIView):
                 "status": anchor.status,
                 "network": cardano.network,
                 "simulated": simulated,
+                "queued_for_retry": broadcast_failed,
                 "note": tx_result.get("note"),
             }, status=http_status.HTTP_201_CREATED)
         
@@ -157,6 +165,11 @@ class VerifyEvidenceView(APIView):
             
             # Verify the evidence hash matches
             evidence_match = anchor.evidence_hash == report.evidence_hash
+            # ...and that the chain carries it (uncached metadata is fetched in the
+            # background; on_chain.pending until then)
+            on_chain = CardanoEvidenceAnchoring(network=anchor.network).verify_evidence_on_chain(
+                report_id, anchor.evidence_hash, tx_hash=anchor.transaction_hash
+            ) if anchor.transaction_hash else {"verified": False, "reason": "Anchor has no transaction"}
             
             return Response({
                 "success": True,
@@ -166,6 +179,8 @@ class VerifyEvidenceView(APIView):
                 "blockchain_hash": anchor.evidence_hash,
                 "blockchain_status": anchor.status,
                 "confirmations": anchor.confirmations,
+                "on_chain_verified": on_chain["verified"],
+                "on_chain": on_chain,
                 "verification_timestamp": json.dumps({
                     "verified_at": str(anchor.confirmed_at or anchor.created_at),
                     "network": anchor.network,
@@ -332,22 +347,12 @@ class IntegrityVerificationView(APIView):
                     "message": "No blockchain anchor found. Please anchor this report first."
                 }, status=http_status.HTTP_200_OK)
             
-            # Generate current evidence hash from report data
-            cardano = CardanoEvidenceAnchoring()
-            current_evidence_data = {
-                "reference_code": report.reference_code,
-                "category": report.category,
-                "description": report.description[:500] if report.description else "",
-                "is_anonymous": report.is_anonymous,
-                "created_at": report.created_at.isoformat() if report.created_at else "",
-            }
-            current_evidence_hash = cardano.generate_evidence_hash(current_evidence_data)
-            
             # Get blockchain hash
             blockchain_hash = anchor.evidence_hash
             
-            # Compare hashes - determine if report has been modified
-            hashes_match = current_evidence_hash == blockchain_hash
+            # Current evidence hash and tamper flag are maintained at write time
+            cardano = CardanoEvidenceAnchoring()
+            current_evidence_hash, hashes_match = report.integrity_status(anchor)
             
             # Build integrity verification intelligence
             verification_data = {
@@ -362,6 +367,7 @@ class IntegrityVerificationView(APIView):
                     "current_hash": current_evidence_hash,
                     "blockchain_hash": blockchain_hash,
                     "hash_match_percentage": 100 if hashes_match else 0,
+                    "diverged_fields": None if hashes_match else report.diverged_evidence_fields(anchor),
                 },
                 
                 # Report metadata
@@ -437,14 +443,48 @@ class IntegrityVerificationView(APIView):
             }, status=http_status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _serialize_search_match(report, anchor):
+    return {
+        "report": {
+            "id": str(report.id),
+            "reference_code": report.reference_code,
+            "category": report.get_category_display(),
+            "status": report.get_status_display(),
+            "description": report.description,
+            "location_description": report.location_description,
+            "latitude": float(report.latitude) if report.latitude else None,
+            "longitude": float(report.longitude) if report.longitude else None,
+            "is_anonymous": report.is_anonymous,
+            "created_at": report.created_at.isoformat(),
+            "updated_at": report.updated_at.isoformat(),
+        },
+        "anchor": {
+            "report_id": anchor.report_id,
+            "evidence_hash": anchor.evidence_hash,
+            "transaction_hash": anchor.transaction_hash,
+            "status": anchor.get_status_display(),
+            "confirmations": anchor.confirmations,
+            "network": anchor.network,
+            "created_at": anchor.created_at.isoformat(),
+            "confirmed_at": anchor.confirmed_at.isoformat() if anchor.confirmed_at else None,
+            "block_number": anchor.block_number,
+        }
+    }
+
+
 class HashSearchView(APIView):
-    """Search for and decrypt blockchain hashes"""
+    """Search for and decrypt blockchain hashes (full, prefix or truncated; single or batch)"""
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
         """
-        Search for a hash in the blockchain
-        Decrypt and display information if found
+        Search for hashes among blockchain anchors (evidence or transaction hash).
+        
+        search_hash: one full hash, a prefix of at least 8 characters, the
+            admin's truncated "<head>...<tail>" form, or a non-hexadecimal
+            value (e.g. a simulated transaction hash) matched exactly
+        hashes: batch mode, a list (or whitespace/comma separated string) of
+            up to 500 such hashes, resolved with a fixed number of queries
         """
         try:
             # Admin only
@@ -454,6 +494,9 @@ class HashSearchView(APIView):
                     "error": "Admin authentication required"
                 }, status=http_status.HTTP_403_FORBIDDEN)
             
+            if 'hashes' in request.data:
+                return self.batch(hash_search.split_terms(request.data.get('hashes')))
+            
             search_hash = request.data.get('search_hash', '').strip()
             
             if not search_hash:
@@ -462,57 +505,33 @@ class HashSearchView(APIView):
                     "error": "Please provide a hash to search"
                 }, status=http_status.HTTP_400_BAD_REQUEST)
             
-            # Search for the hash in blockchain anchors (evidence_hash or transaction_hash)
-            try:
-                anchor = BlockchainAnchor.objects.get(evidence_hash=search_hash)
-            except BlockchainAnchor.DoesNotExist:
-                try:
-                    anchor = BlockchainAnchor.objects.get(transaction_hash=search_hash)
-                except BlockchainAnchor.DoesNotExist:
-                    return Response({
-                        "success": True,
-                        "found": False,
-                        "message": "Hash not found in blockchain database"
-                    }, status=http_status.HTTP_200_OK)
+            term = hash_search.search([search_hash])[0]
+            if term.error:
+                return Response({
+                    "success": False,
+                    "error": term.error
+                }, status=http_status.HTTP_400_BAD_REQUEST)
             
-            # Hash found - get the report data
-            try:
-                report = Report.objects.get(reference_code=anchor.report_id)
-            except Report.DoesNotExist:
+            reports = hash_search.reports_for([term])
+            matches = [
+                _serialize_search_match(reports[anchor.report_id], anchor)
+                for anchor in term.matches if anchor.report_id in reports
+            ]
+            if not matches:
                 return Response({
                     "success": True,
                     "found": False,
-                    "message": "Associated report not found"
+                    "message": "Hash not found in blockchain database" if not term.matches else "Associated report not found"
                 }, status=http_status.HTTP_200_OK)
             
-            # Return decrypted information
+            # Return decrypted information (first match; all matches for ambiguous prefixes)
             return Response({
                 "success": True,
                 "found": True,
-                "report": {
-                    "id": str(report.id),
-                    "reference_code": report.reference_code,
-                    "category": report.get_category_display(),
-                    "status": report.get_status_display(),
-                    "description": report.description,
-                    "location_description": report.location_description,
-                    "latitude": float(report.latitude) if report.latitude else None,
-                    "longitude": float(report.longitude) if report.longitude else None,
-                    "is_anonymous": report.is_anonymous,
-                    "created_at": report.created_at.isoformat(),
-                    "updated_at": report.updated_at.isoformat(),
-                },
-                "anchor": {
-                    "report_id": anchor.report_id,
-                    "evidence_hash": anchor.evidence_hash,
-                    "transaction_hash": anchor.transaction_hash,
-                    "status": anchor.get_status_display(),
-                    "confirmations": anchor.confirmations,
-                    "network": anchor.network,
-                    "created_at": anchor.created_at.isoformat(),
-                    "confirmed_at": anchor.confirmed_at.isoformat() if anchor.confirmed_at else None,
-                    "block_number": anchor.block_number,
-                }
+                **matches[0],
+                "match_count": len(matches),
+                "matches": matches,
+                "truncated": term.truncated,
             }, status=http_status.HTTP_200_OK)
         
         except Exception as e:
@@ -522,4 +541,124 @@ class HashSearchView(APIView):
             return Response({
                 "success": False,
                 "error": f"Search error: {str(e)}"
-            }, status=http_status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=http_status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def batch(self, queries):
+        if not queries:
+            return Response({
+                "success": False,
+                "error": "Please provide hashes to search"
+            }, status=http_status.HTTP_400_BAD_REQUEST)
+        if len(queries) > hash_search.MAX_BATCH_SIZE:
+            return Response({
+                "success": False,
+                "error": f"At most {hash_search.MAX_BATCH_SIZE} hashes per request"
+            }, status=http_status.HTTP_400_BAD_REQUEST)
+        
+        terms = hash_search.search(queries)
+        reports = hash_search.reports_for(terms)
+        results = []
+        for term in terms:
+            matches = [
+                _serialize_search_match(reports[anchor.report_id], anchor)
+                for anchor in term.matches if anchor.report_id in reports
+            ]
+            results.append({
+                "query": term.query,
+                "found": bool(matches),
+                "error": term.error,
+                "matches": matches,
+                "truncated": term.truncated,
+            })
+        
+        return Response({
+            "success": True,
+            "searched": len(terms),
+            "found": sum(1 for result in results if result["found"]),
+            "results": results,
+        }, status=http_status.HTTP_200_OK)
+
+
+def _serialize_run(run, tampered_limit=50):
+    return {
+        "id": run.pk,
+        "status": run.status,
+        "workers": run.workers,
+        "total": run.total,
+        "processed": run.processed,
+        "verified": run.verified,
+        "tampered": run.tampered,
+        "progress": run.progress,
+        "error": run.error,
+        "started_at": run.started_at.isoformat(),
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "tampered_reports": [
+            {
+                "report_id": result.report_id,
+                "current_hash": result.current_hash,
+                "anchored_hash": result.anchored_hash,
+                "diverged_fields": result.diverged_fields,
+            }
+            for result in run.results.filter(outcome=VerificationResult.Outcome.TAMPERED)[:tampered_limit]
+        ],
+    }
+
+
+class VerificationRunView(APIView):
+    """Start a bulk integrity verification run (POST) or read runs and progress (GET)"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, run_id=None):
+        if not getattr(request.user, 'is_staff', False):
+            return Response({
+                "success": False,
+                "error": "Admin authentication required"
+            }, status=http_status.HTTP_403_FORBIDDEN)
+
+        if run_id is not None:
+            run = get_object_or_404(VerificationRun, pk=run_id)
+            return Response({"success": True, "run": _serialize_run(run)}, status=http_status.HTTP_200_OK)
+
+        fail_stale_runs()
+        runs = VerificationRun.objects.all()[:10]
+        return Response({
+            "success": True,
+            "runs": [_serialize_run(run, tampered_limit=0) for run in runs],
+        }, status=http_status.HTTP_200_OK)
+
+    def post(self, request, run_id=None):
+        if not getattr(request.user, 'is_staff', False):
+            return Response({
+                "success": False,
+                "error": "Admin authentication required"
+            }, status=http_status.HTTP_403_FORBIDDEN)
+
+        fail_stale_runs()
+        running = VerificationRun.objects.filter(status=VerificationRun.Status.RUNNING).first()
+        if running is not None and not request.data.get('force'):
+            return Response({
+                "success": False,
+                "error": "A verification run is already in progress",
+                "run": _serialize_run(running, tampered_limit=0),
+            }, status=http_status.HTTP_409_CONFLICT)
+
+        workers = request.data.get('workers')
+        if workers not in (None, ''):
+            try:
+                workers = int(workers)
+            except (TypeError, ValueError):
+                workers = 0
+            if workers < 1:
+                return Response({
+                    "success": False,
+                    "error": "workers must be a positive integer"
+                }, status=http_status.HTTP_400_BAD_REQUEST)
+            workers = clamp_workers(workers)
+        else:
+            workers = None
+
+        run = start_verification_run(user=request.user, workers=workers)
+        return Response({
+            "success": True,
+            "run": _serialize_run(run, tampered_limit=0),
+        }, status=http_status.HTTP_202_ACCEPTED)
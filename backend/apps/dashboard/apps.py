@@ -4,3 +4,7 @@ class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dashboard'
     verbose_name = "Dashboard Overview"
+
+    def ready(self):
+        """Import signals when Django starts"""
+        import apps.dashboard.signals  # noqa
@@ -0,0 +1,220 @@
+"""
+Live dashboard events (Server-Sent Events over ASGI)
+New reports, status changes and anchor confirmations are pushed to open
+dashboard and map tabs as they are committed, instead of each tab polling.
+
+One Broadcaster per process fans events out to the connected streams, each
+an asyncio queue awaited by its response generator, so an idle tab costs a
+parked coroutine and a keepalive comment every LIVE_EVENTS_KEEPALIVE
+seconds. Model signals (and status_refresh, whose bulk_update sends none)
+publish through a backend:
+
+    memory  events reach the streams of the publishing process only
+            (single-worker deployments, development)
+    redis   events go through a Redis pub/sub channel and every web process
+            relays them to its own streams (multiple workers; management
+            commands publish too)
+
+LIVE_EVENTS_BACKEND selects the backend ('redis' by default when REDIS_URL
+is set) and also accepts a dotted path to a custom backend class.
+
+Events are notifications: clients apply them by pulling the change feed
+(api/reports/changes/), which stays the source of truth after reconnects.
+Streams are closed after LIVE_EVENTS_MAX_AGE seconds and EventSource
+reconnects, which bounds the life of connections whose client vanished.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = 'rrs:live-events'
+# Events buffered per stream before a slow client is told to resync
+QUEUE_SIZE = 100
+RESYNC = {'type': 'resync'}
+
+
+def _keepalive() -> int:
+    return int(getattr(settings, 'LIVE_EVENTS_KEEPALIVE', 25))
+
+
+def _max_age() -> int:
+    return int(getattr(settings, 'LIVE_EVENTS_MAX_AGE', 300))
+
+
+class Broadcaster:
+    """In-process fan-out to the open event streams (thread-safe dispatch)."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> "asyncio.Queue":
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = {entry for entry in self._subscribers if entry[1] is not queue}
+
+    def dispatch(self, event: Dict):
+        """Deliver an event to every stream; callable from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                self.unsubscribe(queue)  # event loop closed
+
+    @property
+    def connections(self) -> int:
+        return len(self._subscribers)
+
+
+def _offer(queue, event):
+    if queue.full():
+        # Slow consumer: drop its backlog, the client resyncs from the change feed
+        while not queue.empty():
+            queue.get_nowait()
+        event = RESYNC
+    queue.put_nowait(event)
+
+
+broadcaster = Broadcaster()
+
+
+class MemoryBackend:
+    """Events stay in the publishing process."""
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+
+    def publish(self, event: Dict):
+        self.broadcaster.dispatch(event)
+
+    def ensure_listening(self):
+        pass
+
+
+class RedisBackend:
+    """Events go through Redis pub/sub; each web process relays them to its streams."""
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        self.url = settings.REDIS_URL
+        self._client = None
+        self._task = None
+
+    def publish(self, event: Dict):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(REDIS_CHANNEL, json.dumps(event, cls=DjangoJSONEncoder))
+
+    def ensure_listening(self):
+        """Start this process's relay task on the running loop (once)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        import redis.asyncio
+
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message.get('type') == 'message':
+                            self.broadcaster.dispatch(json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Live events Redis relay failed, retrying: {e}")
+                self.broadcaster.dispatch(RESYNC)
+                await asyncio.sleep(2)
+
+
+BACKENDS = {'memory': MemoryBackend, 'redis': RedisBackend}
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        name = getattr(settings, 'LIVE_EVENTS_BACKEND', '') or ('redis' if settings.REDIS_URL else 'memory')
+        backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+        _backend = backend_class(broadcaster)
+    return _backend
+
+
+def publish(event_type: str, action: str, data: Dict):
+    """Publish an event once the current transaction commits (never raises)."""
+    event = {'type': event_type, 'action': action, **data}
+
+    def send():
+        try:
+            get_backend().publish(event)
+        except Exception as e:
+            logger.warning(f"Live event {event_type}.{action} not published: {e}")
+
+    transaction.on_commit(send)
+
+
+def report_event(report) -> Dict:
+    return {
+        'reference_code': report.reference_code,
+        'status': report.status,
+        'category': report.category,
+        'latitude': str(report.latitude) if report.latitude is not None else None,
+        'longitude': str(report.longitude) if report.longitude is not None else None,
+    }
+
+
+def anchor_event(anchor) -> Dict:
+    return {
+        'reference_code': anchor.report_id,
+        'status': anchor.status,
+        'confirmations': anchor.confirmations,
+        'block_number': anchor.block_number,
+    }
+
+
+def _format(event: Dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def event_stream(max_age: Optional[int] = None):
+    """SSE body: events as they arrive, keepalive comments while idle, closed after max_age."""
+    get_backend().ensure_listening()
+    queue = broadcaster.subscribe()
+    deadline = time.monotonic() + (max_age or _max_age())
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=min(_keepalive(), remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield _format(event)
+    finally:
+        broadcaster.unsubscribe(queue)
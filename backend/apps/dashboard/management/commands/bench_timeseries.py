@@ -0,0 +1,111 @@
+"""Management command to benchmark the analytics time series at scale.
+
+Usage:
+    python manage.py bench_timeseries [--reports <N>] [--days <D>] [--repeat <R>]
+
+Logic:
+ - Inside a transaction that is rolled back at the end, replace the rollup
+   tables with the rows --reports synthetic reports spread over --days days
+   would produce (every category x status combination, hourly and daily)
+ - Time compute_series (uncached, one query each) for typical requests:
+   30 days daily, 1 year weekly, 1 year daily with year-over-year comparison,
+   7 days hourly grouped by category, 60 days hourly
+ - Print rollup row counts and the best and median time per request
+"""
+import statistics
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.dashboard.models import DailyReportRollup, HourlyReportRollup
+from apps.dashboard.timeseries import compute_series
+from apps.reports.models import RESOLVED_STATUSES, ReportCategory, ReportStatus
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _synthetic_rollups(reports, days, end):
+    """(daily rows, hourly rows) for `reports` reports spread evenly over `days` days before end."""
+    combos = [(category, status) for category in ReportCategory.values for status in ReportStatus.values]
+    hours = days * 24
+    first = datetime.combine(end - timedelta(days=days - 1), dt_time.min, tzinfo=dt_timezone.utc)
+    daily = {}
+    hourly = []
+    for h in range(hours):
+        # Reports created in this hour, dealt round-robin over the combinations
+        in_hour = reports * (h + 1) // hours - reports * h // hours
+        hour = first + timedelta(hours=h)
+        for i, (category, status) in enumerate(combos[:in_hour]):
+            count = in_hour // len(combos) + (1 if i < in_hour % len(combos) else 0)
+            responded = count if status in RESOLVED_STATUSES else 0
+            seconds = responded * 3600 * (1 + (h + i) % 30)
+            hourly.append(HourlyReportRollup(
+                hour=hour, category=category, status=status,
+                count=count, responded=responded, response_seconds=seconds,
+            ))
+            entry = daily.setdefault((hour.date(), category, status), [0, 0, 0])
+            entry[0] += count
+            entry[1] += responded
+            entry[2] += seconds
+    daily_rows = [
+        DailyReportRollup(day=day, category=category, status=status,
+                          count=count, responded=responded, response_seconds=seconds)
+        for (day, category, status), (count, responded, seconds) in daily.items()
+    ]
+    return daily_rows, hourly
+
+
+class Command(BaseCommand):
+    help = "Benchmark analytics time series queries against rollups for N reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reports', type=int, default=1000000, help='Synthetic reports represented by the rollups')
+        parser.add_argument('--days', type=int, default=730, help='Days the reports are spread over')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per request')
+
+    def handle(self, *args, **options):
+        end = timezone.localdate()
+        days = max(1, options['days'])
+        repeat = max(1, options['repeat'])
+        requests = [
+            ("30 days, daily", dict(start=end - timedelta(days=29), end=end, granularity='day')),
+            ("1 year, weekly", dict(start=end - timedelta(days=364), end=end, granularity='week')),
+            ("1 year, daily, YoY", dict(start=end - timedelta(days=364), end=end, granularity='day', compare=True)),
+            ("7 days, hourly by category", dict(start=end - timedelta(days=6), end=end, granularity='hour', group_by='category')),
+            ("60 days, hourly", dict(start=end - timedelta(days=59), end=end, granularity='hour')),
+        ]
+
+        try:
+            with transaction.atomic():
+                t0 = time.perf_counter()
+                daily, hourly = _synthetic_rollups(max(0, options['reports']), days, end)
+                DailyReportRollup.objects.all().delete()
+                HourlyReportRollup.objects.all().delete()
+                DailyReportRollup.objects.bulk_create(daily, batch_size=5000)
+                HourlyReportRollup.objects.bulk_create(hourly, batch_size=5000)
+                self.stdout.write(self.style.SUCCESS(
+                    f"{options['reports']} reports over {days} days: {len(daily)} daily and "
+                    f"{len(hourly)} hourly rollup rows (loaded in {time.perf_counter() - t0:.1f}s)"
+                ))
+
+                for label, kwargs in requests:
+                    timings = []
+                    for _ in range(repeat):
+                        with CaptureQueriesContext(connection) as queries:
+                            started = time.perf_counter()
+                            result = compute_series(**kwargs)
+                            timings.append((time.perf_counter() - started) * 1000)
+                    points = len(result['buckets']) * len(result['series'])
+                    self.stdout.write(
+                        f"  {label:<28} {points:>6} points  {len(queries)} query  "
+                        f"best {min(timings):8.1f} ms  median {statistics.median(timings):8.1f} ms"
+                    )
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write("Synthetic rollups rolled back")
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:26
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+# Rollup rebuild as of this migration, inlined so later changes to
+# apps.dashboard.rollups can't alter what this backfill computes
+def backfill_rollups(apps, schema_editor):
+    Report = apps.get_model('reports', 'Report')
+    DailyReportRollup = apps.get_model('dashboard', 'DailyReportRollup')
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    rows = (
+        Report.objects
+        .annotate(day=TruncDate('created_at'))
+        .order_by()
+        .values_list('day', 'category', 'status', 'created_at', 'first_response_at')
+    )
+    for day, category, status, created_at, first_response_at in rows.iterator(chunk_size=2000):
+        entry = totals[(day, category, status)]
+        entry[0] += 1
+        if first_response_at:
+            entry[1] += 1
+            entry[2] += max(0, int((first_response_at - created_at).total_seconds()))
+
+    DailyReportRollup.objects.all().delete()
+    DailyReportRollup.objects.bulk_create([
+        DailyReportRollup(day=day, category=category, status=status,
+                          count=count, responded=responded, response_seconds=seconds)
+        for (day, category, status), (count, responded, seconds) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reports', '0007_report_first_response_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReportRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('responded', models.IntegerField(default=0)),
+                ('response_seconds', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['day', 'category', 'status'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreportrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'category', 'status'), name='unique_daily_rollup'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
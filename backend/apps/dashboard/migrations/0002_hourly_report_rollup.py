@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:30
+
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.models.functions import TruncHour
+
+
+# Rollup rebuild as of this migration, inlined so later changes to
+# apps.dashboard.rollups can't alter what this backfill computes
+def backfill_hourly_rollups(apps, schema_editor):
+    Report = apps.get_model('reports', 'Report')
+    HourlyReportRollup = apps.get_model('dashboard', 'HourlyReportRollup')
+
+    totals = defaultdict(lambda: [0, 0, 0])
+    rows = (
+        Report.objects
+        .annotate(hour=TruncHour('created_at', tzinfo=dt_timezone.utc))
+        .order_by()
+        .values_list('hour', 'category', 'status', 'created_at', 'first_response_at')
+    )
+    for hour, category, status, created_at, first_response_at in rows.iterator(chunk_size=2000):
+        entry = totals[(hour, category, status)]
+        entry[0] += 1
+        if first_response_at:
+            entry[1] += 1
+            entry[2] += max(0, int((first_response_at - created_at).total_seconds()))
+
+    HourlyReportRollup.objects.all().delete()
+    HourlyReportRollup.objects.bulk_create([
+        HourlyReportRollup(hour=hour, category=category, status=status,
+                           count=count, responded=responded, response_seconds=seconds)
+        for (hour, category, status), (count, responded, seconds) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_daily_report_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyReportRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('category', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('responded', models.IntegerField(default=0)),
+                ('response_seconds', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['hour', 'category', 'status'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hourlyreportrollup',
+            constraint=models.UniqueConstraint(fields=('hour', 'category', 'status'), name='unique_hourly_rollup'),
+        ),
+        migrations.RunPython(backfill_hourly_rollups, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,62 @@
 from django.db import models
 
-# Create your models here.
+
+class DailyReportRollup(models.Model):
+    """
+    Reports per creation day, category and current status, for the analytics page.
+    Maintained incrementally by Report signals (see rollups.py); rebuilt with
+    the rebuild_rollups command.
+    """
+    day = models.DateField()
+    category = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+
+    count = models.IntegerField(default=0)
+    # Reports in this row with a first response, and the sum of their response times
+    responded = models.IntegerField(default=0)
+    response_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'category', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category', 'status'], name='unique_daily_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category}/{self.status}: {self.count}"
+
+
+class HourlyReportRollup(models.Model):
+    """
+    Same measures as DailyReportRollup at hour grain (UTC hour of creation),
+    for hourly time series. Maintained alongside the daily rows.
+    """
+    hour = models.DateTimeField()
+    category = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+
+    count = models.IntegerField(default=0)
+    responded = models.IntegerField(default=0)
+    response_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['hour', 'category', 'status']
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'category', 'status'], name='unique_hourly_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H:00} {self.category}/{self.status}: {self.count}"
+
+
+class CacheGeneration(models.Model):
+    """
+    Database-stored generation of a family of cached values (see stats.py).
+    Cache keys include the current value, so a bump by any process retires
+    the cached values of every process, whatever the cache backend.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
@@ -0,0 +1,134 @@
+"""
+Daily and hourly report rollups
+Every report contributes to exactly one DailyReportRollup row, keyed by its
+creation day, category and current status: count 1, plus responded 1 and its
+response time once it has a first response. The same contribution goes to
+one HourlyReportRollup row (UTC creation hour). Saves move the contribution
+between rows and deletes remove it, with F() updates so concurrent writers
+don't lose increments.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+from typing import Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import DailyReportRollup, HourlyReportRollup
+
+logger = logging.getLogger(__name__)
+
+
+def response_seconds(created_at, first_response_at) -> int:
+    if not created_at or not first_response_at:
+        return 0
+    return max(0, int((first_response_at - created_at).total_seconds()))
+
+
+def utc_hour(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def contribution(state) -> Optional[Tuple[tuple, tuple]]:
+    """((day, hour, category, status), (count, responded, seconds)) for a Report.rollup_state()."""
+    if state is None or state[0] is None:
+        return None
+    created_at, category, status, first_response_at = state
+    key = (timezone.localdate(created_at), utc_hour(created_at), category, status)
+    if first_response_at:
+        return key, (1, 1, response_seconds(created_at, first_response_at))
+    return key, (1, 0, 0)
+
+
+def _apply_row(model, lookup: dict, delta):
+    count, responded, seconds = delta
+    rows = model.objects.filter(**lookup)
+    values = dict(
+        count=F('count') + count,
+        responded=F('responded') + responded,
+        response_seconds=F('response_seconds') + seconds,
+    )
+    if rows.update(**values):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, count=count, responded=responded, response_seconds=seconds)
+    except IntegrityError:
+        rows.update(**values)  # created concurrently
+
+
+def apply(key, delta, sign: int = 1):
+    """Add (or with sign=-1 remove) a contribution to the daily and hourly rows for key."""
+    day, hour, category, status = key
+    delta = tuple(sign * value for value in delta)
+    _apply_row(DailyReportRollup, dict(day=day, category=category, status=status), delta)
+    _apply_row(HourlyReportRollup, dict(hour=hour, category=category, status=status), delta)
+
+
+def report_saved(report, created: bool) -> bool:
+    """
+    Update the rollups for a saved report; True if its contribution changed.
+    Report.save keeps the stored state in _rollup_snapshot until its signals
+    have run (read from the database when rollup fields were deferred).
+    """
+    snapshot = getattr(report, '_rollup_snapshot', None)
+    new = contribution(report.rollup_state(snapshot))
+    if created:
+        old = None
+    elif hasattr(report, '_rollup_snapshot'):
+        old = contribution(snapshot)
+    else:
+        # Instance not loaded from the database: previous state unknown
+        logger.warning(f"Rollup for {report.reference_code} skipped (no snapshot); run rebuild_rollups")
+        return True
+    if old == new:
+        return False
+    if old is not None:
+        apply(*old, sign=-1)
+    if new is not None:
+        apply(*new)
+    return True
+
+
+def report_deleted(report):
+    state = getattr(report, '_rollup_snapshot', None) or report.rollup_state()
+    old = contribution(state)
+    if old is not None:
+        apply(*old, sign=-1)
+
+
+def rebuild() -> int:
+    """Recompute the daily and hourly rollup rows from the reports (streamed); returns the number of rows."""
+    from apps.reports.models import Report
+
+    daily = defaultdict(lambda: [0, 0, 0])
+    hourly = defaultdict(lambda: [0, 0, 0])
+    rows = (
+        Report.objects
+        .annotate(day=TruncDate('created_at'), hour=TruncHour('created_at', tzinfo=dt_timezone.utc))
+        .order_by()
+        .values_list('day', 'hour', 'category', 'status', 'created_at', 'first_response_at')
+    )
+    for day, hour, category, status, created_at, first_response_at in rows.iterator(chunk_size=2000):
+        seconds = response_seconds(created_at, first_response_at)
+        for entry in (daily[(day, category, status)], hourly[(hour, category, status)]):
+            entry[0] += 1
+            if first_response_at:
+                entry[1] += 1
+                entry[2] += seconds
+
+    written = 0
+    with transaction.atomic():
+        for model, field, totals in ((DailyReportRollup, 'day', daily), (HourlyReportRollup, 'hour', hourly)):
+            model.objects.all().delete()
+            model.objects.bulk_create([
+                model(**{field: bucket}, category=category, status=status,
+                      count=count, responded=responded, response_seconds=seconds)
+                for (bucket, category, status), (count, responded, seconds) in totals.items()
+            ], batch_size=1000)
+            written += len(totals)
+    return written
@@ -0,0 +1,46 @@
+"""
+Keep dashboard rollups and cached counters in step with reports,
+and push live events to open dashboards
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.blockchain.models import BlockchainAnchor
+from apps.reports.models import Report
+from . import live, rollups, stats
+
+
+@receiver(post_save, sender=Report)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    """Move the report's contribution to the row of its current day/category/status"""
+    if raw:
+        return
+    if rollups.report_saved(instance, created):
+        stats.invalidate()
+
+
+@receiver(post_delete, sender=Report)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Remove the deleted report's contribution"""
+    rollups.report_deleted(instance)
+    stats.invalidate()
+
+
+@receiver(post_save, sender=Report)
+def publish_report_saved(sender, instance, created, raw=False, **kwargs):
+    """New report or status change: notify live dashboards after commit"""
+    if raw:
+        return
+    live.publish('report', 'created' if created else 'updated', live.report_event(instance))
+
+
+@receiver(post_delete, sender=Report)
+def publish_report_deleted(sender, instance, **kwargs):
+    live.publish('report', 'deleted', {'reference_code': instance.reference_code})
+
+
+@receiver(post_save, sender=BlockchainAnchor)
+def publish_anchor_saved(sender, instance, created, raw=False, **kwargs):
+    """Anchor submitted or confirmations changed"""
+    if raw:
+        return
+    live.publish('anchor', 'created' if created else 'updated', live.anchor_event(instance))
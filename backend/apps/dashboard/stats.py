@@ -0,0 +1,145 @@
+"""
+Dashboard counters
+All dashboard counters come from one grouped aggregate over Report
+(category x status). The response-time histogram is one conditional aggregate
+in SQL over first_response_at - created_at, per date range.
+
+Both, and the time series (timeseries.py), are cached under the current
+dashboard generation, a counter stored in the database (CacheGeneration).
+Report save/delete signals bump it after commit when a report is created,
+deleted or changes category, status or first response, so a write in one
+worker retires the values cached by all of them, also with the per-process
+LocMemCache.
+
+Trade-off: each such write costs one extra UPDATE, and each process re-reads
+the generation (one single-row query) at most every DASHBOARD_GENERATION_TTL
+seconds; cache hits in between touch no database. Other workers' writes show
+up after at most that long, the writing process's own immediately.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+
+from .models import CacheGeneration
+
+GENERATION = 'dashboard'
+
+# This process's last read of the generation: (value, time.monotonic() of the read)
+_generation_read = None
+
+# (label, lower bound, upper bound) in hours; None means unbounded
+RESPONSE_BUCKETS = (
+    ('< 1h', None, 1),
+    ('1-4h', 1, 4),
+    ('4-12h', 4, 12),
+    ('12-24h', 12, 24),
+    ('> 24h', 24, None),
+)
+
+
+def _ttl() -> int:
+    # Upper bound only: signals invalidate on every relevant write
+    return int(getattr(settings, 'DASHBOARD_STATS_TTL', 600))
+
+
+def compute() -> dict:
+    from apps.reports.models import Report
+
+    by_category = {}
+    by_status = {}
+    total = 0
+    for row in Report.objects.order_by().values('category', 'status').annotate(n=Count('id')):
+        total += row['n']
+        by_category[row['category']] = by_category.get(row['category'], 0) + row['n']
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['n']
+    return {'total': total, 'by_category': by_category, 'by_status': by_status}
+
+
+def dashboard_stats() -> dict:
+    """Cached counters: {'total', 'by_category': {key: n}, 'by_status': {key: n}}."""
+    return cached_for_generation('stats', compute)
+
+
+def _bucket_condition(lower: Optional[int], upper: Optional[int]) -> Q:
+    condition = Q()
+    if lower is not None:
+        condition &= Q(first_response_at__gte=F('created_at') + timedelta(hours=lower))
+    if upper is not None:
+        condition &= Q(first_response_at__lt=F('created_at') + timedelta(hours=upper))
+    return condition
+
+
+def compute_response_histogram(start: Optional[date] = None, end: Optional[date] = None) -> dict:
+    """Reports per response-time bucket (first response), for reports created in [start, end]."""
+    from apps.reports.models import Report
+
+    reports = Report.objects.filter(first_response_at__isnull=False)
+    if start:
+        reports = reports.filter(created_at__date__gte=start)
+    if end:
+        reports = reports.filter(created_at__date__lte=end)
+    counts = reports.aggregate(**{
+        f'bucket_{i}': Count('id', filter=_bucket_condition(lower, upper))
+        for i, (_, lower, upper) in enumerate(RESPONSE_BUCKETS)
+    })
+    return {label: counts[f'bucket_{i}'] for i, (label, _, _) in enumerate(RESPONSE_BUCKETS)}
+
+
+def _generation_ttl() -> float:
+    return float(getattr(settings, 'DASHBOARD_GENERATION_TTL', 2))
+
+
+def generation() -> int:
+    """Current dashboard generation (one query, at most every DASHBOARD_GENERATION_TTL seconds)."""
+    global _generation_read
+    now = time.monotonic()
+    if _generation_read is None or now - _generation_read[1] >= _generation_ttl():
+        value = CacheGeneration.objects.filter(name=GENERATION).values_list('value', flat=True).first() or 0
+        _generation_read = (value, now)
+    return _generation_read[0]
+
+
+def forget_generation():
+    """Make the next generation() read the database."""
+    global _generation_read
+    _generation_read = None
+
+
+def cached_for_generation(name: str, compute: Callable, *parts):
+    """compute() cached under name and parts until the next invalidate()."""
+    key = ':'.join(
+        [f"dashboard:{name}", str(generation())] + ['' if part is None else str(part) for part in parts]
+    )
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=_ttl())
+    return value
+
+
+def response_histogram(start: Optional[date] = None, end: Optional[date] = None) -> dict:
+    """Cached compute_response_histogram for one date range."""
+    return cached_for_generation('response-histogram', lambda: compute_response_histogram(start, end), start, end)
+
+
+def _bump():
+    forget_generation()
+    rows = CacheGeneration.objects.filter(name=GENERATION)
+    if rows.update(value=F('value') + 1):
+        return
+    try:
+        with transaction.atomic():
+            CacheGeneration.objects.create(name=GENERATION, value=1)
+    except IntegrityError:
+        rows.update(value=F('value') + 1)  # created concurrently
+
+
+def invalidate():
+    """Retire every cached dashboard value once the current transaction commits."""
+    transaction.on_commit(_bump)
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.reports.models import Report, ReportUpdate
+
+from . import stats
+from .models import DailyReportRollup
+
+
+class ReportDetailQueryTests(TestCase):
+    """report_detail renders the report and its status history in a fixed number of queries."""
+
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', is_staff=True)
+        self.client.force_login(self.staff)
+        self.report = Report.objects.create(category='bribery', description='Test report')
+
+    def add_updates(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(f'officer{ReportUpdate.objects.count()}')
+            ReportUpdate.objects.create(report=self.report, user=user, old_status='new', new_status='in_review')
+
+    def get_detail(self):
+        return self.client.get(reverse('report_detail', args=[self.report.id]))
+
+    def test_query_count_independent_of_updates(self):
+        # session + user (authentication), report, updates + users (joined)
+        self.add_updates(1)
+        with self.assertNumQueries(4):
+            self.get_detail()
+        self.add_updates(5)
+        with self.assertNumQueries(4):
+            response = self.get_detail()
+        self.assertContains(response, 'officer5')
+
+
+class RollupSignalTests(TestCase):
+    """Saves move a report's rollup contribution exactly once, however the instance was loaded."""
+
+    def setUp(self):
+        self.report = Report.objects.create(category='theft', description='Test report')
+
+    def counts(self):
+        return dict(DailyReportRollup.objects.filter(count__gt=0).values_list('status', 'count'))
+
+    def test_deferred_fields(self):
+        report = Report.objects.only('id', 'status').get(pk=self.report.pk)
+        report.status = 'in_review'
+        report.save()
+        self.assertEqual(self.counts(), {'in_review': 1})
+
+        report = Report.objects.only('id', 'status').get(pk=self.report.pk)
+        report.created_at  # loads a deferred rollup field
+        report.status = 'closed'
+        report.save()
+        self.assertEqual(self.counts(), {'closed': 1})
+
+    def test_refresh_from_db(self):
+        report = Report.objects.get(pk=self.report.pk)
+        other = Report.objects.get(pk=self.report.pk)
+        other.status = 'in_review'
+        other.save()
+        report.refresh_from_db()
+        report.status = 'forwarded'
+        report.save()
+        self.assertEqual(self.counts(), {'forwarded': 1})
+
+
+class DashboardStatsCacheTests(TestCase):
+    """Cached counters follow the database-stored generation, not the local cache."""
+
+    def setUp(self):
+        cache.clear()
+        stats.forget_generation()
+
+    def test_write_retires_cached_counters(self):
+        self.assertEqual(stats.dashboard_stats()['total'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Report.objects.create(category='theft', description='Test report')
+        with self.assertNumQueries(2):  # generation, then the aggregate
+            self.assertEqual(stats.dashboard_stats()['total'], 1)
+        with self.assertNumQueries(0):  # generation read within DASHBOARD_GENERATION_TTL
+            stats.dashboard_stats()
+
+    def test_generation_is_reread_after_ttl(self):
+        stats.dashboard_stats()
+        with self.settings(DASHBOARD_GENERATION_TTL=0):
+            with self.assertNumQueries(1):  # the generation only
+                stats.dashboard_stats()
+            stats.CacheGeneration.objects.create(name=stats.GENERATION, value=5)  # another process's write
+            Report.objects.create(category='theft', description='Test report')
+            self.assertEqual(stats.dashboard_stats()['total'], 1)
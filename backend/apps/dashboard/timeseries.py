@@ -0,0 +1,182 @@
+"""
+Report time series
+Dense series of report counts (and average first-response time) for any date
+range at hour, day or week granularity, read from the rollup tables with one
+grouped query: hours from HourlyReportRollup, days from DailyReportRollup,
+weeks from the daily rows truncated to Monday in SQL.
+
+Year-over-year comparison shifts the range back 52 weeks (364 days), so each
+bucket is compared with the same weekday a year earlier and both series have
+the same length. Both ranges are fetched by the same query.
+
+Buckets with no reports are filled with zeros. Results are cached until the
+next dashboard invalidation (see stats.py).
+"""
+
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncWeek
+
+from .models import DailyReportRollup, HourlyReportRollup
+from .stats import cached_for_generation
+
+GRANULARITIES = ('hour', 'day', 'week')
+GROUP_BY = ('category', 'status')
+YEAR_OFFSET = timedelta(days=364)
+
+
+def _max_points() -> int:
+    return int(getattr(settings, 'TIMESERIES_MAX_POINTS', 2000))
+
+
+def _buckets(start: date, end: date, granularity: str) -> List:
+    """Bucket keys covering [start, end]: UTC hours, days, or Mondays."""
+    if granularity == 'hour':
+        first = datetime.combine(start, time.min, tzinfo=dt_timezone.utc)
+        return [first + timedelta(hours=i) for i in range(((end - start).days + 1) * 24)]
+    if granularity == 'week':
+        start -= timedelta(days=start.weekday())
+        return [start + timedelta(weeks=i) for i in range((end - start).days // 7 + 1)]
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _range_condition(buckets: List, granularity: str) -> Q:
+    if granularity == 'hour':
+        return Q(hour__gte=buckets[0], hour__lt=buckets[-1] + timedelta(hours=1))
+    last_day = buckets[-1] + timedelta(days=6) if granularity == 'week' else buckets[-1]
+    return Q(day__gte=buckets[0], day__lte=last_day)
+
+
+def _label(bucket) -> str:
+    return bucket.isoformat()
+
+
+def _empty_series(size: int) -> Dict:
+    return {'count': [0] * size, 'responded': [0] * size, 'seconds': [0] * size}
+
+
+def _finish(series: Dict) -> Dict:
+    """Per-group count list, average response hours per bucket and total."""
+    result = {}
+    for key in sorted(series):
+        values = series[key]
+        result[key] = {
+            'count': values['count'],
+            'avg_response_hours': [
+                round(seconds / responded / 3600, 2) if responded else None
+                for seconds, responded in zip(values['seconds'], values['responded'])
+            ],
+            'total': sum(values['count']),
+        }
+    return result
+
+
+def compute_series(start: date, end: date, granularity: str = 'day',
+                   categories: Iterable[str] = (), statuses: Iterable[str] = (),
+                   group_by: Optional[str] = None, compare: bool = False) -> Dict:
+    """Dense time series for reports created in [start, end] (one query)."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if group_by and group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+    if end < start:
+        raise ValueError("end is before start")
+
+    buckets = _buckets(start, end, granularity)
+    if len(buckets) > _max_points():
+        raise ValueError(f"{len(buckets)} {granularity} buckets requested; at most {_max_points()} allowed")
+    position = {bucket: i for i, bucket in enumerate(buckets)}
+
+    previous_buckets = [bucket - YEAR_OFFSET for bucket in buckets] if compare else []
+    previous_position = {bucket: i for i, bucket in enumerate(previous_buckets)}
+
+    if granularity == 'hour':
+        rows = HourlyReportRollup.objects.annotate(bucket=F('hour'))
+    elif granularity == 'week':
+        rows = DailyReportRollup.objects.annotate(bucket=TruncWeek('day'))
+    else:
+        rows = DailyReportRollup.objects.annotate(bucket=F('day'))
+
+    condition = _range_condition(buckets, granularity)
+    if compare:
+        condition |= _range_condition(previous_buckets, granularity)
+    rows = rows.order_by().filter(condition)
+    if categories:
+        rows = rows.filter(category__in=list(categories))
+    if statuses:
+        rows = rows.filter(status__in=list(statuses))
+
+    fields = ['bucket', group_by] if group_by else ['bucket']
+    rows = rows.values(*fields).annotate(
+        total=Sum('count'), responded=Sum('responded'), seconds=Sum('response_seconds'),
+    )
+
+    current: Dict = {}
+    previous: Dict = {}
+    size = len(buckets)
+    for row in rows:
+        bucket = row['bucket']
+        if isinstance(bucket, datetime) and granularity != 'hour':
+            bucket = bucket.date()
+        key = row[group_by] if group_by else 'all'
+        if bucket in position:
+            target, index = current, position[bucket]
+        elif bucket in previous_position:
+            target, index = previous, previous_position[bucket]
+        else:
+            continue
+        values = target.setdefault(key, _empty_series(size))
+        values['count'][index] += row['total']
+        values['responded'][index] += row['responded']
+        values['seconds'][index] += row['seconds']
+
+    # Every group present in either period gets a (zero-filled) series in both
+    for key in set(current) | set(previous):
+        current.setdefault(key, _empty_series(size))
+        if compare:
+            previous.setdefault(key, _empty_series(size))
+    if not group_by:
+        current.setdefault('all', _empty_series(size))
+        if compare:
+            previous.setdefault('all', _empty_series(size))
+
+    result = {
+        'granularity': granularity,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'group_by': group_by,
+        'buckets': [_label(bucket) for bucket in buckets],
+        'series': _finish(current),
+    }
+    if compare:
+        previous_series = _finish(previous)
+        result['previous'] = {
+            'start': (start - YEAR_OFFSET).isoformat(),
+            'end': (end - YEAR_OFFSET).isoformat(),
+            'buckets': [_label(bucket) for bucket in previous_buckets],
+            'series': previous_series,
+        }
+        result['change'] = {
+            key: (
+                round((values['total'] - previous_series[key]['total']) / previous_series[key]['total'] * 100, 1)
+                if previous_series[key]['total'] else None
+            )
+            for key, values in result['series'].items()
+        }
+    return result
+
+
+def report_series(start: date, end: date, granularity: str = 'day',
+                  categories: Iterable[str] = (), statuses: Iterable[str] = (),
+                  group_by: Optional[str] = None, compare: bool = False) -> Dict:
+    """Cached compute_series (until reports change)."""
+    categories = sorted(set(categories))
+    statuses = sorted(set(statuses))
+    return cached_for_generation(
+        'timeseries',
+        lambda: compute_series(start, end, granularity, categories, statuses, group_by, compare),
+        start, end, granularity, ','.join(categories), ','.join(statuses), group_by, int(compare),
+    )
@@ -9,6 +9,8 @@ urlpatterns = [
     path('reports/<uuid:report_id>/update-status/', views.update_report_status, name='update_report_status'),
     path('reports/api/all/', views.reports_api_all, name='reports_api_all'),
     path('analytics/', views.analytics, name='analytics'),
+    path('analytics/timeseries/', views.analytics_timeseries, name='analytics_timeseries'),
     path('verify-integrity/', views.integrity_verification_dashboard, name='verify_integrity'),
     path('map/', views.map_view, name='map_view'),
+    path('events/', views.live_events, name='live_events'),
 ]
\ No newline at end of file
@@ -3,11 +3,23 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.utils import timezone
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from apps.reports.models import Report, ReportUpdate
-from apps.blockchain.models import BlockchainAnchor
-from apps.blockchain.cardano_utils import CardanoEvidenceAnchoring
+from apps.reports import keyset, search
+from apps.reports.models import RESOLVED_STATUSES, Report, ReportUpdate
+from apps.blockchain.models import BlockchainAnchor, VerificationResult
+from apps.blockchain.verification import latest_run as latest_verification_run
+from .models import DailyReportRollup
+from . import live
+from .stats import dashboard_stats, response_histogram
+from .timeseries import report_series
 import json
 
+# Columns rendered by reports_list (descriptions and JSON metadata stay unloaded)
+REPORT_LIST_FIELDS = (
+    'id', 'reference_code', 'category', 'status', 'is_anonymous', 'latitude', 'longitude',
+    'created_at', 'is_hash_anchored', 'transaction_hash',
+)
+REPORT_LIST_PAGE_SIZE = 50
+
 def is_admin(user):
     return user.is_authenticated and user.is_staff
 
@@ -28,30 +40,9 @@ def verify_integrity(request, report_id):
             "message": "No blockchain anchor found for this report."
         })
 
-    # 1. Re-construct the evidence JSON from current DB data
-    # IMPORTANT: Use ipfs_cid=None (as it was when originally anchored)
-    # This ensures the hash matches the original anchored hash
-    evidence_json = {
-        "report_id": str(report.id),
-        "reference_code": report.reference_code,
-        "category": report.category,
-        "description": report.description,
-        "latitude": str(report.latitude) if report.latitude else None,
-        "longitude": str(report.longitude) if report.longitude else None,
-        "location_description": report.location_description,
-        "ipfs_cid": None,
-        "timestamp": report.created_at.isoformat(),
-        "is_anonymous": report.is_anonymous
-    }
-
-    # 2. Calculate the hash of the CURRENT data
-    cardano = CardanoEvidenceAnchoring()
-    current_hash = cardano.generate_evidence_hash(evidence_json)
-    
-    # 3. Compare with the ANCHORED hash
+    # Integrity status is maintained at write time (Report.save / anchor signals)
     original_hash = anchor.evidence_hash
-    
-    match = (current_hash == original_hash)
+    current_hash, match = report.integrity_status(anchor)
     
     response_data = {
         "status": "success",
@@ -88,6 +79,15 @@ def verify_integrity(request, report_id):
             ("ipfs_cid", "Media IPFS CID", report.ipfs_cid),
         ]
         
+        # Merkle-anchored reports: keep only the fields whose leaves diverged
+        changed = report.diverged_evidence_fields(anchor)
+        if changed is not None:
+            fields_to_check += [
+                ("reference_code", "Reference Code", report.reference_code),
+                ("created_at", "Submission Time", report.created_at.isoformat()),
+            ]
+            fields_to_check = [field for field in fields_to_check if field[0] in changed]
+        
         for field_key, field_label, field_value in fields_to_check:
             tampered_fields.append({
                 "field": field_label,
@@ -97,6 +97,7 @@ def verify_integrity(request, report_id):
         
         response_data["tampering_detected"] = True
         response_data["tampered_fields"] = tampered_fields
+        response_data["tampering_localized"] = changed is not None
         response_data["last_modified"] = report.updated_at.isoformat()
         response_data["submission_date"] = report.created_at.isoformat()
         response_data["alert"] = "POLICE INVESTIGATION: This report data has been modified after blockchain anchoring. This is evidence of tampering and should be reported to authorities."
@@ -118,15 +119,16 @@ def verify_integrity(request, report_id):
 @login_required
 @user_passes_test(is_admin)
 def dashboard(request):
-    total_reports = Report.objects.count()
-    new_reports = Report.objects.filter(status='new').count()
-    actioned_reports = Report.objects.filter(status='actioned').count()
+    # Counters come from one cached grouped query (see stats.py)
+    stats = dashboard_stats()
+    total_reports = stats['total']
+    new_reports = stats['by_status'].get('new', 0)
+    actioned_reports = stats['by_status'].get('actioned', 0)
     
     # Category statistics
     categories = {}
     for category in Report._meta.get_field('category').choices:
-        count = Report.objects.filter(category=category[0]).count()
-        categories[category[1]] = count
+        categories[category[1]] = stats['by_category'].get(category[0], 0)
     
     # Get recent reports
     recent_reports = Report.objects.all().order_by('-created_at')[:5]
@@ -143,20 +145,97 @@ def dashboard(request):
 @login_required
 @user_passes_test(is_admin)
 def reports_list(request):
-    reports = Report.objects.all().order_by('-created_at')
-    status_choices = Report._meta.get_field('status').choices
-    category_choices = Report._meta.get_field('category').choices
+    """
+    Report list, filtered in the database and keyset-paginated on (created_at, id)
+    so each page costs the same however many reports exist. Only the listed
+    columns are loaded (a description preview instead of the full text).
+    With ?q= the list is the best full-text matches instead (see search.py),
+    on one page.
+    """
+    from datetime import date, datetime, time, timedelta
+    from urllib.parse import urlencode
+    from django.db.models.functions import Substr
+    
+    reports = Report.objects.only(*REPORT_LIST_FIELDS).annotate(description_preview=Substr('description', 1, 120))
+    filters = {}
+    
+    status_filter = request.GET.get('status')
+    if status_filter:
+        reports = reports.filter(status=status_filter)
+        filters['status'] = status_filter
+    category_filter = request.GET.get('category')
+    if category_filter:
+        reports = reports.filter(category=category_filter)
+        filters['category'] = category_filter
+    
+    # Date bounds as created_at ranges (index-friendly, unlike created_at__date)
+    try:
+        if request.GET.get('date_from'):
+            date_from = date.fromisoformat(request.GET['date_from'])
+            reports = reports.filter(created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+            filters['date_from'] = request.GET['date_from']
+        if request.GET.get('date_to'):
+            date_to = date.fromisoformat(request.GET['date_to'])
+            reports = reports.filter(created_at__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min)))
+            filters['date_to'] = request.GET['date_to']
+    except ValueError:
+        pass  # malformed date from a hand-edited URL: leave that bound off
+    
+    try:
+        per_page = int(request.GET.get('per_page', REPORT_LIST_PAGE_SIZE))
+    except ValueError:
+        per_page = REPORT_LIST_PAGE_SIZE
+    query = request.GET.get('q', '').strip()
+    if query:
+        filters['q'] = query
+        # Date bounds are applied to the ranked matches, so fetch more of them
+        limit = search.MAX_RESULTS if 'date_from' in filters or 'date_to' in filters else per_page
+        matches = search.search(
+            query, limit,
+            categories=[category_filter] if category_filter else (),
+            statuses=[status_filter] if status_filter else (),
+            queryset=reports,
+        )
+        page = keyset.Page(matches[:max(1, min(per_page, keyset.MAX_PAGE_SIZE))], None, None)
+    else:
+        try:
+            page = keyset.paginate(reports, per_page, after=request.GET.get('after'), before=request.GET.get('before'))
+        except ValueError:
+            page = keyset.paginate(reports, per_page)
+    
+    # Anchor confirmations for the page only (one query)
+    codes = [report.reference_code for report in page if report.transaction_hash]
+    confirmations = dict(
+        BlockchainAnchor.objects.filter(report_id__in=codes).values_list('report_id', 'confirmations')
+    ) if codes else {}
+    for report in page:
+        report.anchor_confirmations = confirmations.get(report.reference_code, 0)
+    
+    if per_page != REPORT_LIST_PAGE_SIZE:
+        filters['per_page'] = per_page
     return render(request, 'dashboard/reports_list.html', {
-        'reports': reports,
-        'status_choices': status_choices,
-        'category_choices': category_choices
+        'reports': page,
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+        'filter_query': urlencode(filters),
+        'total_reports': None if filters else dashboard_stats()['total'],
+        'status_choices': Report._meta.get_field('status').choices,
+        'category_choices': Report._meta.get_field('category').choices,
     })
 
 @login_required
 @user_passes_test(is_admin)
 def report_detail(request, report_id):
-    report = get_object_or_404(Report, id=report_id)
-    updates = report.updates.all().order_by('-created_at')
+    """Report with its status history; two queries (report, then updates with their users)."""
+    from django.db.models import Prefetch
+    
+    report = get_object_or_404(
+        Report.objects.prefetch_related(
+            Prefetch('updates', queryset=ReportUpdate.objects.select_related('user').order_by('-created_at'))
+        ),
+        id=report_id,
+    )
+    updates = report.updates.all()
     status_choices = Report._meta.get_field('status').choices
     return render(request, 'dashboard/report_detail.html', {
         'report': report,
@@ -167,104 +246,72 @@ def report_detail(request, report_id):
 @login_required
 @user_passes_test(is_admin)
 def analytics(request):
+    """Analytics page, served from the daily rollups (see rollups.py) with a few small queries."""
     from datetime import timedelta
-    from django.db.models import Count, Q, Case, When, Avg, F, ExpressionWrapper, DurationField
-    from django.db.models.functions import TruncDate
-    
-    # Total reports
-    total_reports = Report.objects.count()
-    
-    # Reports today
-    today = timezone.now().date()
-    reports_today = Report.objects.filter(created_at__date=today).count()
-    
-    # Calculate resolution rate (actioned + closed)
-    total_resolved = Report.objects.filter(status__in=['actioned', 'closed']).count()
-    resolution_rate = round((total_resolved / total_reports * 100) if total_reports > 0 else 0, 1)
-    
-    # Calculate average response time (using updated_at - created_at)
-    actioned_reports = Report.objects.filter(status__in=['actioned', 'closed']).exclude(updated_at__isnull=True)
-    if actioned_reports.exists():
-        avg_time = actioned_reports.aggregate(
-            avg_diff=Avg(ExpressionWrapper(
-                F('updated_at') - F('created_at'),
-                output_field=DurationField()
-            ))
-        )['avg_diff']
-        avg_response_time = round(avg_time.total_seconds() / 3600) if avg_time else 0
-    else:
-        avg_response_time = 0
+    from django.db.models import Sum
+    
+    today = timezone.localdate()
+    rollups = DailyReportRollup.objects.order_by()
+    
+    # Totals per category and status (one grouped query)
+    per_category = {}
+    status_counts = {}
+    for row in rollups.values('category', 'status').annotate(
+        total=Sum('count'), responded=Sum('responded'), seconds=Sum('response_seconds')
+    ):
+        stats = per_category.setdefault(row['category'], {'total': 0, 'resolved': 0, 'responded': 0, 'seconds': 0})
+        stats['total'] += row['total']
+        stats['responded'] += row['responded']
+        stats['seconds'] += row['seconds']
+        if row['status'] in RESOLVED_STATUSES:
+            stats['resolved'] += row['total']
+        status_counts[row['status']] = status_counts.get(row['status'], 0) + row['total']
+    
+    def avg_hours(stats):
+        return round(stats['seconds'] / stats['responded'] / 3600) if stats['responded'] else 0
+    
+    overall = {key: sum(stats[key] for stats in per_category.values()) for key in ('total', 'resolved', 'responded', 'seconds')}
+    total_reports = overall['total']
+    reports_today = rollups.filter(day=today).aggregate(total=Sum('count'))['total'] or 0
+    
+    # Resolution rate (actioned + closed) and average response time (first response)
+    resolution_rate = round((overall['resolved'] / total_reports * 100) if total_reports > 0 else 0, 1)
+    avg_response_time = avg_hours(overall)
     
     # Category statistics
     category_stats = []
     for category_key, category_name in Report._meta.get_field('category').choices:
-        reports_in_category = Report.objects.filter(category=category_key)
-        count = reports_in_category.count()
-        
-        # Calculate resolution rate per category
-        resolved_in_category = reports_in_category.filter(status__in=['actioned', 'closed']).count()
-        cat_resolution_rate = round((resolved_in_category / count * 100) if count > 0 else 0, 1)
-        
-        # Calculate avg response time per category
-        actioned_in_category = reports_in_category.filter(status__in=['actioned', 'closed']).exclude(updated_at__isnull=True)
-        if actioned_in_category.exists():
-            cat_avg_time = actioned_in_category.aggregate(
-                avg_diff=Avg(ExpressionWrapper(
-                    F('updated_at') - F('created_at'),
-                    output_field=DurationField()
-                ))
-            )['avg_diff']
-            cat_avg_response = round(cat_avg_time.total_seconds() / 3600) if cat_avg_time else 0
-        else:
-            cat_avg_response = 0
-        
+        stats = per_category.get(category_key, {'total': 0, 'resolved': 0, 'responded': 0, 'seconds': 0})
         category_stats.append({
             'name': category_name,
-            'total': count,
-            'avg_response': cat_avg_response,
-            'resolution_rate': cat_resolution_rate,
+            'total': stats['total'],
+            'avg_response': avg_hours(stats),
+            'resolution_rate': round((stats['resolved'] / stats['total'] * 100) if stats['total'] > 0 else 0, 1),
             'priority': 'High' if category_key in ['kidnapping', 'house_fire'] else 'Medium'
         })
     
     # Status distribution
-    status_distribution = {}
-    for status_key, status_name in Report._meta.get_field('status').choices:
-        count = Report.objects.filter(status=status_key).count()
-        status_distribution[status_name] = count
+    status_distribution = {
+        status_name: status_counts.get(status_key, 0)
+        for status_key, status_name in Report._meta.get_field('status').choices
+    }
     
     # Category data for charts
     category_data = {cat['name']: cat['total'] for cat in category_stats}
     
-    # Timeline data (last 30 days)
+    # Timeline data (last 30 days, one grouped query)
     thirty_days_ago = today - timedelta(days=30)
+    per_day = dict(
+        rollups.filter(day__gte=thirty_days_ago, day__lt=thirty_days_ago + timedelta(days=30))
+        .values('day').annotate(total=Sum('count')).values_list('day', 'total')
+    )
     timeline_data = {}
     for i in range(30):
         date = thirty_days_ago + timedelta(days=i)
-        count = Report.objects.filter(created_at__date=date).count()
-        timeline_data[date.strftime('%b %d')] = count
-    
-    # Response time distribution
-    response_distribution = {
-        '< 1h': 0,
-        '1-4h': 0,
-        '4-12h': 0,
-        '12-24h': 0,
-        '> 24h': 0
-    }
+        timeline_data[date.strftime('%b %d')] = per_day.get(date, 0)
     
-    # More accurate response time distribution
-    for report in actioned_reports:
-        diff_hours = (report.updated_at - report.created_at).total_seconds() / 3600
-        if diff_hours < 1:
-            response_distribution['< 1h'] += 1
-        elif diff_hours < 4:
-            response_distribution['1-4h'] += 1
-        elif diff_hours < 12:
-            response_distribution['4-12h'] += 1
-        elif diff_hours < 24:
-            response_distribution['12-24h'] += 1
-        else:
-            response_distribution['> 24h'] += 1
+    # Response time distribution (first response; one cached SQL aggregate)
+    response_distribution = response_histogram()
     
     context = {
         'total_reports': total_reports,
@@ -279,6 +326,65 @@ def analytics(request):
     }
     return render(request, 'dashboard/analytics.html', context)
 
+@login_required
+@user_passes_test(is_admin)
+@require_http_methods(["GET"])
+def analytics_timeseries(request):
+    """
+    Report counts over any date range as dense series (see timeseries.py).
+
+    Query parameters:
+        start, end      ISO dates, inclusive (default: the last 30 days)
+        granularity     hour | day | week (default: day)
+        category        comma-separated categories to include
+        status          comma-separated statuses to include
+        group_by        category | status (one series per value)
+        compare         yoy - add the same range 52 weeks earlier
+    """
+    from datetime import date, timedelta
+
+    def csv_param(name):
+        return [value for value in request.GET.get(name, '').split(',') if value]
+
+    try:
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else timezone.localdate()
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else end - timedelta(days=29)
+        series = report_series(
+            start, end,
+            granularity=request.GET.get('granularity', 'day'),
+            categories=csv_param('category'),
+            statuses=csv_param('status'),
+            group_by=request.GET.get('group_by') or None,
+            compare=request.GET.get('compare') == 'yoy',
+        )
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+    return JsonResponse({'status': 'success', **series})
+
+async def live_events(request):
+    """
+    Server-Sent Events stream of report and anchor changes (see live.py).
+    Needs the ASGI server; under WSGI it answers 503 and clients keep polling
+    the change feed.
+    """
+    from asgiref.sync import sync_to_async
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import HttpResponseForbidden, StreamingHttpResponse
+    
+    if not await sync_to_async(is_admin)(request.user):
+        return HttpResponseForbidden()
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Live events need the ASGI server; poll /api/reports/changes/ instead'
+        }, status=503)
+    
+    response = StreamingHttpResponse(live.event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @login_required
 @user_passes_test(is_admin)
 def map_view(request):
@@ -415,8 +521,19 @@ def integrity_verification_dashboard(request):
     if request.GET.get('date_to'):
         anchored_reports = anchored_reports.filter(created_at__date__lte=request.GET.get('date_to'))
     
+    if request.GET.get('tampered'):
+        anchored_reports = anchored_reports.filter(tampered=True)
+    
+    # Latest bulk audit (verify_all / staff API)
+    latest_run = latest_verification_run()
+    tampered_results = []
+    if latest_run:
+        tampered_results = latest_run.results.filter(outcome=VerificationResult.Outcome.TAMPERED)[:50]
+    
     return render(request, 'dashboard/integrity_verification.html', {
         'reports': anchored_reports,
         'status_choices': status_choices,
         'category_choices': category_choices,
+        'latest_run': latest_run,
+        'tampered_results': tampered_results,
     })
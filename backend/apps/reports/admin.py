@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.contrib import messages
 from .models import Report, ReportUpdate, AuditLog
+from . import search
 
 # -------------------------------
 # REPORT ADMIN
@@ -13,11 +14,14 @@ class ReportAdmin(admin.ModelAdmin):
         'reporter_display', 'reporter_phone',
         'created_at', 'updated_at_short'
     )
-    list_filter = ('category', 'status', 'priority', 'is_anonymous', 'created_at')
+    list_filter = ('category', 'status', 'priority', 'is_anonymous', 'tampered', 'created_at')
     search_fields = ('reference_code', 'description', 'reporter_name', 'reporter_email')
+    # With a full-text index, free text goes through it (get_search_results) and only these stay as lookups
+    indexed_search_fields = ('=reference_code', '=reporter_email')
     readonly_fields = (
         'reference_code', 'ipfs_cid', 'evidence_json_cid', 'ipfs_report_cid', 'evidence_hash',
         'transaction_hash', 'is_hash_anchored', 'verified_on_chain',
+        'current_evidence_hash', 'tampered',
         'media_file_preview', 'evidence_json_preview', 'ipfs_report_preview',
         'created_at', 'updated_at'
     )
@@ -34,7 +38,8 @@ class ReportAdmin(admin.ModelAdmin):
             'fields': ('media_file', 'media_file_preview', 'ipfs_cid', 
                        'evidence_json_preview', 'evidence_json_cid',
                        'ipfs_report_preview', 'ipfs_report_cid',
-                       'evidence_hash', 'transaction_hash', 'is_hash_anchored', 'verified_on_chain')
+                       'evidence_hash', 'transaction_hash', 'is_hash_anchored', 'verified_on_chain',
+                       'current_evidence_hash', 'tampered')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
@@ -93,6 +98,21 @@ class ReportAdmin(admin.ModelAdmin):
             'all': ('admin/css/report_admin.css',)
         }
 
+    # ========== SEARCH ==========
+    def get_search_fields(self, request):
+        return self.indexed_search_fields if search.backend_supported() else self.search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Full-text index for the free-text fields (see search.py), plus exact
+        reference code / email matches; the plain search_fields on other backends.
+        """
+        if not search_term or not search.backend_supported():
+            return super().get_search_results(request, queryset, search_term)
+        ids = [pk for pk, _ in search.search_ids(search_term, limit=search.MAX_RESULTS)]
+        exact, use_distinct = super().get_search_results(request, queryset, search_term.strip())
+        return queryset.filter(pk__in=ids) | exact, use_distinct
+
     # ========== DELETION PROTECTION ==========
     def has_delete_permission(self, request, obj=None):
         """
@@ -0,0 +1,200 @@
+"""
+Pre-rendered verification certificates
+A certificate is rendered once per state (the report and anchor values it
+shows) and stored as static HTML, with an embedded QR code linking to the
+public verification endpoint. How long ago the anchor status was checked
+changes on its own, so the stored HTML keeps a slot for it that is filled in
+when the certificate is served; the strong ETag covers the state and that text.
+
+Files live in default storage:
+    certificates/<reference_code>/<state>.html
+    certificates/<reference_code>/qr.png
+
+Certificates are re-rendered in batches when anchor confirmations change
+(status_refresh) and lazily on first view otherwise.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from django.utils.timesince import timesince
+
+try:
+    import qrcode
+    QRCODE_AVAILABLE = True
+except ImportError:
+    QRCODE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE = 'reports/verification_certificate.html'
+# Bump when the certificate template changes so every certificate is re-rendered
+TEMPLATE_REVISION = '2'
+# Placeholder in stored certificates for the served-time status check line
+STATUS_CHECKED_SLOT = '[[status-checked]]'
+
+
+def _directory(reference_code: str) -> str:
+    return f"certificates/{reference_code}"
+
+
+def html_path(reference_code: str, state: str) -> str:
+    return f"{_directory(reference_code)}/{state}.html"
+
+
+def qr_path(reference_code: str) -> str:
+    return f"{_directory(reference_code)}/qr.png"
+
+
+def verify_url(reference_code: str) -> str:
+    site = getattr(settings, 'SITE_URL', '').rstrip('/')
+    return site + reverse('verify_report_integrity', args=[reference_code])
+
+
+def state_for(report, anchor) -> str:
+    """Digest of everything the stored certificate shows (the status check line is filled in when served)."""
+    parts = (
+        TEMPLATE_REVISION,
+        report.reference_code,
+        report.category,
+        report.created_at.isoformat() if report.created_at else "",
+        report.location_description or "",
+        report.evidence_hash or "",
+        report.transaction_hash or "",
+        str(anchor.block_number) if anchor else "",
+        str(anchor.confirmations) if anchor else "",
+    )
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()
+
+
+def qr_png(reference_code: str) -> Optional[bytes]:
+    """PNG QR code for the report's verification URL (generated once), None without qrcode."""
+    path = qr_path(reference_code)
+    if default_storage.exists(path):
+        with default_storage.open(path, 'rb') as f:
+            return f.read()
+    if not QRCODE_AVAILABLE:
+        return None
+
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=8, border=4)
+    qr.add_data(verify_url(reference_code))
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+    png = buffer.getvalue()
+    default_storage.save(path, ContentFile(png))
+    return png
+
+
+def status_checked(anchor, refreshing: bool = False, now=None) -> str:
+    """Served-time text of the certificate's status check line."""
+    if anchor is None:
+        return ""
+    if anchor.status_checked_at:
+        text = format_html("{} ago", timesince(anchor.status_checked_at, now or timezone.now()))
+    else:
+        text = "Not yet checked"
+    if refreshing:
+        text = format_html('{} <span class="no-print" style="color: #666;">(refreshing)</span>', text)
+    return text
+
+
+def etag(state: str, checked: str) -> str:
+    """Strong ETag of a served certificate: its state plus the status check text."""
+    return '"' + hashlib.sha1(f"{state}|{checked}".encode('utf-8')).hexdigest() + '"'
+
+
+def _render_html(report, anchor) -> str:
+    png = qr_png(report.reference_code)
+    return render_to_string(TEMPLATE, {
+        'report': report,
+        'anchor': anchor,
+        'qr_data_uri': f"data:image/png;base64,{base64.b64encode(png).decode('ascii')}" if png else None,
+        'verify_url': verify_url(report.reference_code),
+        'status_checked': STATUS_CHECKED_SLOT,
+        'now': timezone.now(),
+    })
+
+
+def render(report, anchor) -> Tuple[str, str]:
+    """Render and store the certificate for the current state; returns (state, path)."""
+    state = state_for(report, anchor)
+    html = _render_html(report, anchor)
+
+    path = html_path(report.reference_code, state)
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(html.encode('utf-8')))
+    _prune(report.reference_code, keep=f"{state}.html")
+    return state, path
+
+
+def get_or_render(report, anchor) -> Tuple[str, str]:
+    """(state, path) of the stored certificate, rendering it if this state is new."""
+    state = state_for(report, anchor)
+    path = html_path(report.reference_code, state)
+    if default_storage.exists(path):
+        return state, path
+    return render(report, anchor)
+
+
+def load(report, anchor) -> Tuple[str, str]:
+    """
+    (state, stored HTML) of the current certificate. A concurrent render of a
+    newer state may prune the file between lookup and read; the certificate is
+    then rendered again for this request.
+    """
+    state, path = get_or_render(report, anchor)
+    try:
+        with default_storage.open(path, 'rb') as f:
+            return state, f.read().decode('utf-8')
+    except FileNotFoundError:
+        return state, _render_html(report, anchor)
+
+
+def fill(html: str, checked: str) -> str:
+    """Served certificate: stored HTML with the status check text in its slot."""
+    return html.replace(STATUS_CHECKED_SLOT, checked)
+
+
+def render_batch(reference_codes: Iterable[str]) -> int:
+    """Re-render certificates whose state changed (two queries per batch); returns how many."""
+    from apps.blockchain.models import BlockchainAnchor
+    from .models import Report
+
+    codes = [code for code in set(reference_codes) if code]
+    if not codes:
+        return 0
+    anchors = {anchor.report_id: anchor for anchor in BlockchainAnchor.objects.filter(report_id__in=codes)}
+
+    rendered = 0
+    for report in Report.objects.filter(reference_code__in=codes):
+        anchor = anchors.get(report.reference_code)
+        if default_storage.exists(html_path(report.reference_code, state_for(report, anchor))):
+            continue
+        try:
+            render(report, anchor)
+            rendered += 1
+        except Exception as e:
+            logger.warning(f"Certificate render for {report.reference_code} failed: {e}")
+    return rendered
+
+
+def _prune(reference_code: str, keep: str):
+    """Remove certificates of previous states."""
+    try:
+        _, files = default_storage.listdir(_directory(reference_code))
+    except FileNotFoundError:
+        return
+    for name in files:
+        if name.endswith('.html') and name != keep:
+            default_storage.delete(f"{_directory(reference_code)}/{name}")
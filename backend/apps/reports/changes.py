@@ -0,0 +1,119 @@
+"""
+Change feed for dashboard and map auto-refresh
+Clients load the full state once, then poll with the cursor from the previous
+response and patch their state with what changed since: reports and anchors
+created or updated (indexed updated_at) and deleted (DeletedRecord
+tombstones). Payloads are O(changes) instead of O(all reports).
+
+Cursors are ISO timestamps. updated_at is set when a row is saved, before
+its transaction commits, so the next cursor lags the query time by
+CHANGE_FEED_OVERLAP seconds: a slow transaction can't be skipped, at the
+cost of occasionally resending a row. Clients apply deletions first, then
+upsert changed rows by reference code.
+
+Writes that bypass save() (queryset.update) only show up here if they set
+updated_at themselves, as status_refresh does.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.blockchain.models import BlockchainAnchor
+
+from .models import DeletedRecord, Report
+
+# Report columns sent to clients (same as the map's ReportListAPI, plus updated_at)
+REPORT_FIELDS = (
+    'id', 'reference_code', 'category', 'description', 'location_description',
+    'latitude', 'longitude', 'status', 'is_anonymous', 'created_at', 'updated_at',
+)
+ANCHOR_FIELDS = (
+    'report_id', 'status', 'confirmations', 'block_number', 'transaction_hash', 'updated_at',
+)
+
+
+def _limit() -> int:
+    return int(getattr(settings, 'CHANGE_FEED_LIMIT', 500))
+
+
+def _overlap() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, 'CHANGE_FEED_OVERLAP', 2)))
+
+
+def _retention() -> timedelta:
+    return timedelta(days=int(getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30)))
+
+
+def parse_cursor(cursor: str) -> datetime:
+    """Cursor timestamp; ValueError if malformed."""
+    value = datetime.fromisoformat(cursor)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def record_deletion(kind: str, key: Optional[str]):
+    """Tombstone for a deleted report or anchor (called from post_delete signals)."""
+    if key:
+        DeletedRecord.objects.create(kind=kind, key=key)
+        # Expired tombstones are dropped at most once a day per process
+        if cache.add('changes:prune', 1, timeout=86400):
+            prune()
+
+
+def prune(now: Optional[datetime] = None) -> int:
+    """Drop tombstones older than the retention window; returns how many."""
+    cutoff = (now or timezone.now()) - _retention()
+    deleted, _ = DeletedRecord.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+def changes_since(since: Optional[datetime]) -> Dict:
+    """
+    Rows changed at or after `since` (three indexed range queries).
+
+    Without a cursor, or with one older than the tombstone retention, the
+    response is {'reset': True, 'cursor': ...}: the client reloads in full and
+    polls from that cursor.
+    """
+    now = timezone.now()
+    next_cursor = now - _overlap()
+    if since is None or since < now - _retention():
+        return {'reset': True, 'cursor': next_cursor.isoformat(), 'has_more': False}
+
+    limit = _limit()
+    reports = list(
+        Report.objects.filter(updated_at__gte=since).order_by('updated_at').values(*REPORT_FIELDS)[:limit + 1]
+    )
+    anchors = list(
+        BlockchainAnchor.objects.filter(updated_at__gte=since).order_by('updated_at').values(*ANCHOR_FIELDS)[:limit + 1]
+    )
+    deleted = list(
+        DeletedRecord.objects.filter(deleted_at__gte=since).order_by('deleted_at').values('kind', 'key', 'deleted_at')[:limit + 1]
+    )
+
+    # A truncated kind resumes from its last timestamp (rows sharing it are resent)
+    has_more = False
+    for rows, field in ((reports, 'updated_at'), (anchors, 'updated_at'), (deleted, 'deleted_at')):
+        if len(rows) > limit:
+            del rows[limit:]
+            has_more = True
+            next_cursor = min(next_cursor, rows[-1][field])
+
+    for anchor in anchors:
+        anchor['reference_code'] = anchor.pop('report_id')
+    return {
+        'reset': False,
+        'cursor': next_cursor.isoformat(),
+        'has_more': has_more,
+        'reports': reports,
+        'anchors': anchors,
+        'deleted': {
+            'reports': [row['key'] for row in deleted if row['kind'] == DeletedRecord.Kind.REPORT],
+            'anchors': [row['key'] for row in deleted if row['kind'] == DeletedRecord.Kind.ANCHOR],
+        },
+    }
@@ -0,0 +1,257 @@
+"""
+Streaming exports
+Reports, status updates and blockchain anchors as CSV, NDJSON or (with
+pyarrow installed) zstd-compressed Parquet, for ministry reporting and
+analysts. Used by the staff export API and the export_reports command.
+
+Rows are read with values_list().iterator(chunk_size=...) - a server-side
+cursor on PostgreSQL - and encoded one chunk at a time (one Parquet row
+group per chunk), so memory stays constant however long the range is.
+
+Reporter contact details are never exported.
+"""
+
+import csv
+import json
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+FORMATS = ('csv', 'ndjson', 'parquet')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# (column, lookup, kind) per dataset; kind selects the Parquet type
+DATASETS = {
+    'reports': (
+        ('id', 'id', 'string'),
+        ('reference_code', 'reference_code', 'string'),
+        ('category', 'category', 'string'),
+        ('status', 'status', 'string'),
+        ('priority', 'priority', 'int'),
+        ('description', 'description', 'string'),
+        ('location_description', 'location_description', 'string'),
+        ('latitude', 'latitude', 'float'),
+        ('longitude', 'longitude', 'float'),
+        ('is_anonymous', 'is_anonymous', 'bool'),
+        ('evidence_hash', 'evidence_hash', 'string'),
+        ('current_evidence_hash', 'current_evidence_hash', 'string'),
+        ('transaction_hash', 'transaction_hash', 'string'),
+        ('is_hash_anchored', 'is_hash_anchored', 'bool'),
+        ('tampered', 'tampered', 'bool'),
+        ('ipfs_cid', 'ipfs_cid', 'string'),
+        ('created_at', 'created_at', 'timestamp'),
+        ('first_response_at', 'first_response_at', 'timestamp'),
+        ('updated_at', 'updated_at', 'timestamp'),
+    ),
+    'updates': (
+        ('id', 'id', 'int'),
+        ('reference_code', 'report__reference_code', 'string'),
+        ('old_status', 'old_status', 'string'),
+        ('new_status', 'new_status', 'string'),
+        ('notes', 'notes', 'string'),
+        ('user', 'user__username', 'string'),
+        ('created_at', 'created_at', 'timestamp'),
+    ),
+    'anchors': (
+        ('reference_code', 'report_id', 'string'),
+        ('evidence_hash', 'evidence_hash', 'string'),
+        ('evidence_version', 'evidence_version', 'string'),
+        ('transaction_hash', 'transaction_hash', 'string'),
+        ('block_number', 'block_number', 'int'),
+        ('confirmations', 'confirmations', 'int'),
+        ('status', 'status', 'string'),
+        ('network', 'network', 'string'),
+        ('ipfs_cid', 'ipfs_cid', 'string'),
+        ('created_at', 'created_at', 'timestamp'),
+        ('confirmed_at', 'confirmed_at', 'timestamp'),
+        ('status_checked_at', 'status_checked_at', 'timestamp'),
+    ),
+}
+
+
+def _chunk_size() -> int:
+    return int(getattr(settings, 'EXPORT_CHUNK_SIZE', 2000))
+
+
+def queryset(dataset: str, start: Optional[date] = None, end: Optional[date] = None,
+             categories: Iterable[str] = (), statuses: Iterable[str] = ()):
+    """
+    Rows of one dataset, oldest first. start/end bound the row's own creation
+    date (inclusive); categories and statuses filter on the report.
+    """
+    from apps.blockchain.models import BlockchainAnchor
+    from .models import Report, ReportUpdate
+
+    if dataset not in DATASETS:
+        raise ValueError(f"dataset must be one of: {', '.join(DATASETS)}")
+    categories, statuses = list(categories), list(statuses)
+
+    if dataset == 'reports':
+        rows = Report.objects.all()
+        if categories:
+            rows = rows.filter(category__in=categories)
+        if statuses:
+            rows = rows.filter(status__in=statuses)
+    elif dataset == 'updates':
+        rows = ReportUpdate.objects.all()
+        if categories:
+            rows = rows.filter(report__category__in=categories)
+        if statuses:
+            rows = rows.filter(report__status__in=statuses)
+    else:
+        rows = BlockchainAnchor.objects.all()
+        if categories or statuses:
+            reports = Report.objects.all()
+            if categories:
+                reports = reports.filter(category__in=categories)
+            if statuses:
+                reports = reports.filter(status__in=statuses)
+            rows = rows.filter(report_id__in=reports.values('reference_code'))
+
+    if start:
+        rows = rows.filter(created_at__date__gte=start)
+    if end:
+        rows = rows.filter(created_at__date__lte=end)
+    return rows.order_by('created_at', 'pk')
+
+
+def _chunks(rows, lookups) -> Iterator[list]:
+    """Lists of value tuples, read through a server-side cursor."""
+    size = _chunk_size()
+    values = rows.values_list(*lookups).iterator(chunk_size=size)
+    while True:
+        chunk = list(islice(values, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _stream_csv(rows, columns) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _, _ in columns])
+    for chunk in _chunks(rows, [lookup for _, lookup, _ in columns]):
+        yield ''.join(writer.writerow([_csv_cell(value) for value in row]) for row in chunk)
+
+
+def _stream_ndjson(rows, columns) -> Iterator[str]:
+    names = [column for column, _, _ in columns]
+    for chunk in _chunks(rows, [lookup for _, lookup, _ in columns]):
+        yield ''.join(json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n' for row in chunk)
+
+
+class _ParquetSink:
+    """Write-only file that hands back what Parquet wrote since the last drain()."""
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_type(kind):
+    return {
+        'string': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }[kind]
+
+
+def _arrow_value(value, kind):
+    if value is None:
+        return None
+    if kind == 'string':
+        return str(value)
+    if kind == 'float':
+        return float(value)
+    return value
+
+
+def _stream_parquet(rows, columns) -> Iterator[bytes]:
+    schema = pa.schema([(column, _arrow_type(kind)) for column, _, kind in columns])
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for chunk in _chunks(rows, [lookup for _, lookup, _ in columns]):
+            arrays = [
+                pa.array([_arrow_value(row[i], kind) for row in chunk], type=_arrow_type(kind))
+                for i, (_, _, kind) in enumerate(columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def check_format(fmt: str):
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    if fmt == 'parquet' and not PYARROW_AVAILABLE:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+
+
+def stream(dataset: str, fmt: str = 'csv', **filters) -> Iterator:
+    """Encoded export chunks (str for CSV/NDJSON, bytes for Parquet); see queryset() for filters."""
+    check_format(fmt)
+    rows = queryset(dataset, **filters)
+    columns = DATASETS[dataset]
+    if fmt == 'csv':
+        return _stream_csv(rows, columns)
+    if fmt == 'ndjson':
+        return _stream_ndjson(rows, columns)
+    return _stream_parquet(rows, columns)
+
+
+def filename(dataset: str, fmt: str, start: Optional[date] = None, end: Optional[date] = None) -> str:
+    span = f"_{start or 'start'}_{end or 'now'}" if start or end else ''
+    return f"{dataset}{span}.{fmt}"
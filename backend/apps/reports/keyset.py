@@ -0,0 +1,84 @@
+"""
+Keyset pagination over (created_at, id), newest first
+A page is located by the sort key of its boundary row instead of an OFFSET,
+so every page costs the same however deep it is or however large the table
+grows. Cursors are opaque URL-safe tokens encoding "<created_at>|<id>".
+
+The created_at__lte/__gte bound in front of the tie-break lets the database
+use the created_at index as a range scan.
+"""
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at, pk) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """(created_at, pk) of a cursor; ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, pk = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), pk
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid page cursor") from e
+
+
+class Page:
+    """One page of rows plus cursors for the neighbouring pages (None at either end)."""
+
+    def __init__(self, rows: List, next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def paginate(queryset, size: int, after: Optional[str] = None, before: Optional[str] = None) -> Page:
+    """
+    Rows of queryset newest first: the page after cursor `after`, the page
+    before cursor `before`, or the first page. One query (size + 1 rows).
+    """
+    size = max(1, min(size, MAX_PAGE_SIZE))
+    queryset = queryset.order_by()
+
+    if before:
+        created_at, pk = decode_cursor(before)
+        rows = list(
+            queryset.filter(Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(pk__gt=pk)))
+            .order_by('created_at', 'pk')[:size + 1]
+        )
+        has_more = len(rows) > size
+        rows = rows[:size][::-1]
+        has_next = True
+        has_previous = has_more
+    else:
+        if after:
+            created_at, pk = decode_cursor(after)
+            queryset = queryset.filter(Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(pk__lt=pk)))
+        rows = list(queryset.order_by('-created_at', '-pk')[:size + 1])
+        has_next = len(rows) > size
+        rows = rows[:size]
+        has_previous = bool(after)
+
+    if not rows:
+        return Page(rows, None, None)
+    first, last = rows[0], rows[-1]
+    return Page(
+        rows,
+        encode_cursor(last.created_at, last.pk) if has_next else None,
+        encode_cursor(first.created_at, first.pk) if has_previous else None,
+    )
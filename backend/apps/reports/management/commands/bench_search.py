@@ -0,0 +1,116 @@
+"""Management command to benchmark report search at scale.
+
+Usage:
+    python manage.py bench_search [--reports <N>] [--repeat <R>]
+
+Logic:
+ - Inside a transaction that is rolled back at the end, add --reports
+   synthetic reports (bulk_create, then rebuild_search_index's rebuild on
+   SQLite) whose descriptions draw words from a Zipf-distributed vocabulary
+ - For a few typical queries (a rare word, a common word, two words, a
+   prefix, a category filter, a reference code) time the indexed ranked
+   search against the icontains filters it replaces, counted and sliced as
+   the admin changelist does
+ - Print match counts and the best and median time of each
+"""
+import itertools
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.db import connection, transaction
+
+from apps.reports import search
+from apps.reports.models import Report, ReportCategory
+
+WORDS = (
+    'road', 'bridge', 'school', 'clinic', 'market', 'water', 'permit', 'tender', 'contract',
+    'officer', 'police', 'payment', 'bribe', 'fee', 'license', 'inspection', 'teacher', 'nurse',
+    'district', 'sector', 'cell', 'village', 'office', 'land', 'title', 'fuel', 'border',
+    'amafaranga', 'ruswa', 'umuyobozi', 'ivuriro', 'ishuri', 'pot-de-vin', 'fonctionnaire',
+)
+VOCABULARY_SIZE = 20000
+PLACES = ('Kigali', 'Huye', 'Musanze', 'Rubavu', 'Nyagatare', 'Rusizi', 'Muhanga', 'Karongi')
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark indexed report search against icontains for N synthetic reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reports', type=int, default=100000, help='Synthetic reports to add')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query')
+
+    def _time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return result, min(timings), statistics.median(timings)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        repeat = max(1, options['repeat'])
+        now = timezone.now()
+        vocabulary = list(WORDS) + [
+            ''.join(rng.choices('bcdfghjklmnprstvwyz', k=3)) + ''.join(rng.choices('aeiou', k=2)) + str(n)
+            for n in range(VOCABULARY_SIZE - len(WORDS))
+        ]
+        weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+        try:
+            with transaction.atomic():
+                t0 = time.perf_counter()
+                reports = []
+                for i in range(max(0, options['reports'])):
+                    # Rare words appear in about 1 report in 5000
+                    words = rng.choices(vocabulary, cum_weights=weights, k=30) + (['embezzlement'] if i % 5000 == 0 else [])
+                    reports.append(Report(
+                        id=uuid.UUID(int=rng.getrandbits(128)),
+                        reference_code=f"BENCH-{i:08d}",
+                        category=rng.choice(ReportCategory.values),
+                        description=' '.join(words),
+                        location_description=f"{rng.choice(PLACES)} {rng.choice(WORDS)}",
+                        reporter_name=rng.choice(('', 'Jean', 'Aline', 'Eric', 'Claudine')),
+                    ))
+                Report.objects.bulk_create(reports, batch_size=5000)
+                Report.objects.filter(reference_code__startswith='BENCH-').update(created_at=now - timedelta(days=1))
+                indexed = search.rebuild()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Added {len(reports)} reports, {indexed} indexed (in {time.perf_counter() - t0:.1f}s)"
+                ))
+
+                category = ReportCategory.values[0]
+                queries = [
+                    ("rare word", 'embezzlement', {}),
+                    ("common word", 'bribe', {}),
+                    ("two words", 'police payment', {}),
+                    ("prefix", 'insp', {}),
+                    ("word + category", 'tender', {'categories': [category]}),
+                    ("reference code", 'BENCH-00004242', {}),
+                ]
+                self.stdout.write(f"Top 50 results per query ({connection.vendor})")
+                for label, query, kwargs in queries:
+                    ranked, best, median = self._time(
+                        repeat, lambda: search.search(query, limit=50, **kwargs)
+                    )
+                    words = search.terms(query)
+                    fallback = search.fallback_queryset(words, kwargs.get('categories', []), [])
+                    (total, _), scan_best, scan_median = self._time(
+                        repeat, lambda: (fallback.count(), list(fallback.values_list('pk', flat=True)[:50]))
+                    )
+                    self.stdout.write(
+                        f"  {label:<16} {query!r:<18} indexed {len(ranked):>3} hits "
+                        f"best {best:7.1f} ms  median {median:7.1f} ms | "
+                        f"icontains {total:>6} matches best {scan_best:8.1f} ms  median {scan_median:8.1f} ms"
+                    )
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write("Synthetic reports rolled back")
@@ -0,0 +1,46 @@
+"""Management command to pre-render verification certificates in batches.
+
+Usage:
+    python manage.py render_certificates [--batch-size <B>] [--anchored-only]
+
+Logic:
+ - Walk reports (optionally only anchored ones) in batches of --batch-size
+ - For each batch, load the anchors with one query and render the certificates
+   whose state (shown report/anchor values) has no stored HTML yet
+ - Previous states of a re-rendered certificate are removed
+ - Prints how many certificates were rendered
+"""
+from django.core.management.base import BaseCommand
+from apps.blockchain.models import BlockchainAnchor
+from apps.reports import certificates
+from apps.reports.models import Report
+
+
+class Command(BaseCommand):
+    help = "Pre-render verification certificates (HTML + QR code)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Reports per batch')
+        parser.add_argument('--anchored-only', action='store_true', help='Only reports with a blockchain anchor')
+
+    def handle(self, *args, **options):
+        if not certificates.QRCODE_AVAILABLE:
+            self.stdout.write(self.style.WARNING("qrcode is not installed: certificates are rendered without QR codes"))
+
+        codes = Report.objects.order_by('created_at').values_list('reference_code', flat=True)
+        if options['anchored_only']:
+            codes = codes.filter(reference_code__in=BlockchainAnchor.objects.values('report_id'))
+
+        batch_size = max(1, options['batch_size'])
+        batch, seen, rendered = [], 0, 0
+        for code in codes.iterator(chunk_size=batch_size):
+            batch.append(code)
+            if len(batch) >= batch_size:
+                rendered += certificates.render_batch(batch)
+                seen += len(batch)
+                batch = []
+        if batch:
+            rendered += certificates.render_batch(batch)
+            seen += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} certificates ({seen} reports checked)"))
@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:12
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+# Evidence layouts as of this migration, frozen here so later changes to
+# apps.blockchain.evidence can't alter what this backfill computes
+EVIDENCE_FIELDS = (
+    'id', 'reference_code', 'category', 'description', 'latitude', 'longitude',
+    'location_description', 'created_at', 'is_anonymous', 'ipfs_cid',
+)
+
+
+def _layouts(report):
+    """(version, payload, ensure_ascii) of every layout, the default first."""
+    latitude = str(report.latitude) if report.latitude else None
+    longitude = str(report.longitude) if report.longitude else None
+    v1 = {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "latitude": latitude,
+        "longitude": longitude,
+        "location_description": report.location_description,
+        "ipfs_cid": None,
+        "timestamp": report.created_at.isoformat(),
+        "is_anonymous": report.is_anonymous,
+    }
+    summary = {
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description[:500] if report.description else "",
+        "is_anonymous": report.is_anonymous,
+        "created_at": report.created_at.isoformat() if report.created_at else "",
+    }
+    nested = {
+        "report_id": str(report.id),
+        "reference_code": report.reference_code,
+        "category": report.category,
+        "description": report.description,
+        "location": {"latitude": latitude, "longitude": longitude, "description": report.location_description},
+        "timestamp": report.created_at.isoformat(),
+        "media_cid": None,
+        "anonymity_flag": report.is_anonymous,
+        "version": "1.0",
+    }
+    return (
+        ('v1', v1, True),
+        ('v1-media', dict(v1, ipfs_cid=report.ipfs_cid), True),
+        ('v1-summary', summary, True),
+        ('v1-nested', nested, False),
+    )
+
+
+def match_layout(report, anchored_hash):
+    """(current hash, matching version or None), as evidence.match_layout did for legacy anchors."""
+    current = None
+    for version, payload, ensure_ascii in _layouts(report):
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=ensure_ascii)
+        candidate = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        if current is None:
+            current = candidate
+        if candidate == anchored_hash:
+            return candidate, version
+    return current, None
+
+
+def backfill_integrity_status(apps, schema_editor):
+    Report = apps.get_model('reports', 'Report')
+    BlockchainAnchor = apps.get_model('blockchain', 'BlockchainAnchor')
+    anchored = dict(BlockchainAnchor.objects.values_list('report_id', 'evidence_hash'))
+
+    batch = []
+    for report in Report.objects.only(*EVIDENCE_FIELDS).iterator(chunk_size=1000):
+        anchored_hash = anchored.get(report.reference_code)
+        current_hash, layout = match_layout(report, anchored_hash)
+        report.current_evidence_hash = current_hash
+        report.tampered = bool(anchored_hash) and layout is None
+        batch.append(report)
+        if len(batch) >= 1000:
+            Report.objects.bulk_update(batch, ['current_evidence_hash', 'tampered'])
+            batch = []
+    if batch:
+        Report.objects.bulk_update(batch, ['current_evidence_hash', 'tampered'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_report_ipfs_report_cid'),
+        ('blockchain', '0004_verification_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='current_evidence_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='tampered',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(backfill_integrity_status, migrations.RunPython.noop),
+    ]
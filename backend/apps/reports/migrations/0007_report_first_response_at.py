@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:26
+
+from django.db import migrations, models
+from django.db.models import Exists, F, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+RESOLVED_STATUSES = ('actioned', 'closed')
+
+
+def backfill_first_response(apps, schema_editor):
+    """
+    First transition to actioned/closed from the status history (also for
+    reports reopened since); updated_at for resolved reports without history.
+    """
+    Report = apps.get_model('reports', 'Report')
+    ReportUpdate = apps.get_model('reports', 'ReportUpdate')
+    first_update = (
+        ReportUpdate.objects
+        .filter(report=OuterRef('pk'), new_status__in=RESOLVED_STATUSES)
+        .order_by()
+        .values('report')
+        .annotate(first=Min('created_at'))
+        .values('first')
+    )
+    Report.objects.filter(
+        Q(status__in=RESOLVED_STATUSES) | Exists(first_update), first_response_at__isnull=True
+    ).update(
+        first_response_at=Coalesce(Subquery(first_update), F('updated_at'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_report_integrity_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='first_response_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_first_response, migrations.RunPython.noop),
+    ]
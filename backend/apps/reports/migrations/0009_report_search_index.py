@@ -0,0 +1,77 @@
+"""
+Full-text search index for reports (see apps/reports/search.py).
+
+PostgreSQL gets a generated, weighted tsvector column with a GIN index;
+SQLite gets an FTS5 table, backfilled here and then kept in sync by the
+Report signals. Other backends get nothing (search falls back to icontains).
+"""
+
+from django.db import migrations
+
+FTS_COLUMNS = ('reference_code', 'location_description', 'description', 'reporter_name', 'category', 'status')
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE reports_report ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(reference_code, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location_description, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(reporter_name, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX reports_report_search_idx ON reports_report USING GIN (search_vector)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS reports_report_search_idx",
+    "ALTER TABLE reports_report DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE reports_report_fts USING fts5("
+    "report_id UNINDEXED, reference_code, location_description, description, reporter_name, category, status, "
+    "tokenize='unicode61 remove_diacritics 2')",
+]
+SQLITE_REVERSE = ["DROP TABLE IF EXISTS reports_report_fts"]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD:
+            schema_editor.execute(sql)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FORWARD:
+            schema_editor.execute(sql)
+        Report = apps.get_model('reports', 'Report')
+        rows = [
+            # rowid: first 60 bits of the report UUID, as search._fts_rowid
+            (int(report_id.hex[:15], 16), report_id.hex, *[value or '' for value in values])
+            for report_id, *values in Report.objects.order_by().values_list('id', *FTS_COLUMNS).iterator()
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO reports_report_fts (rowid, report_id, reference_code, location_description, "
+                "description, reporter_name, category, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in POSTGRES_REVERSE:
+            schema_editor.execute(sql)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_REVERSE:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_change_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
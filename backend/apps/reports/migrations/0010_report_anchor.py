@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blockchain', '0008_anchor_updated_at_index'),
+        ('reports', '0009_report_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='anchor',
+            field=models.ForeignObject(from_fields=('reference_code',), null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='blockchain.blockchainanchor', to_fields=('report_id',)),
+        ),
+    ]
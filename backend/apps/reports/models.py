@@ -3,6 +3,8 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 import uuid
 
+from apps.blockchain.evidence import EVIDENCE_FIELDS, PAYLOAD_FIELD_SOURCES, localize_tampering, match_layout
+
 # ---------------------------------------------------------
 # CHOICE ENUMS
 # ---------------------------------------------------------
@@ -21,6 +23,13 @@ class ReportStatus(models.TextChoices):
     ACTIONED = 'actioned', 'Actioned'
     CLOSED = 'closed', 'Closed'
 
+
+# Statuses that count as a police response (resolution rate, response time)
+RESOLVED_STATUSES = (ReportStatus.ACTIONED, ReportStatus.CLOSED)
+
+# Fields a report's analytics rollup contribution depends on (see apps.dashboard.rollups)
+ROLLUP_FIELDS = ('created_at', 'category', 'status', 'first_response_at')
+
 # ---------------------------------------------------------
 # MAIN REPORT MODEL
 # ---------------------------------------------------------
@@ -51,12 +60,25 @@ class Report(models.Model):
     evidence_hash = models.CharField(max_length=64, blank=True, null=True)
     transaction_hash = models.CharField(max_length=64, blank=True, null=True)
     is_hash_anchored = models.BooleanField(default=False)
+
+    # Integrity status maintained at write time (see refresh_integrity)
+    current_evidence_hash = models.CharField(max_length=64, blank=True, null=True)
+    tampered = models.BooleanField(default=False, db_index=True)
     verified_on_chain = models.BooleanField(default=False)
 
     blockchain_metadata = models.JSONField(default=dict, blank=True)
+    # The report's anchor (BlockchainAnchor.report_id holds the reference code);
+    # no column of its own, it lets select_related('anchor') join it
+    anchor = models.ForeignObject(
+        'blockchain.BlockchainAnchor', on_delete=models.DO_NOTHING,
+        from_fields=('reference_code',), to_fields=('report_id',),
+        null=True, related_name='+',
+    )
 
     status = models.CharField(max_length=20, choices=ReportStatus.choices, default=ReportStatus.NEW)
     priority = models.IntegerField(default=1)
+    # First transition to actioned/closed (response time); unaffected by later edits
+    first_response_at = models.DateTimeField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -68,12 +90,61 @@ class Report(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            # Change feed cursor (see changes.py)
+            models.Index(fields=['updated_at']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._evidence_snapshot = instance._evidence_state()
+        instance._rollup_snapshot = instance.rollup_state()
+        return instance
+
+    def _evidence_state(self):
+        """Current values of the fields that make up the evidence hash (None if deferred)."""
+        deferred = self.get_deferred_fields()
+        if deferred & set(EVIDENCE_FIELDS):
+            return None
+        return tuple(getattr(self, field) for field in EVIDENCE_FIELDS)
+
+    def rollup_state(self, stored=None):
+        """
+        (created_at, category, status, first_response_at) as counted by the analytics
+        rollup. Deferred fields are taken from a stored state, or make it None.
+        """
+        deferred = self.get_deferred_fields() & set(ROLLUP_FIELDS)
+        if deferred and stored is None:
+            return None
+        return tuple(
+            stored[position] if field in deferred else getattr(self, field)
+            for position, field in enumerate(ROLLUP_FIELDS)
+        )
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Reload from the database, keeping the evidence and rollup snapshots in step."""
+        snapshots = {
+            '_evidence_snapshot': (EVIDENCE_FIELDS, getattr(self, '_evidence_snapshot', None)),
+            '_rollup_snapshot': (ROLLUP_FIELDS, getattr(self, '_rollup_snapshot', None)),
+        }
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self._evidence_snapshot = self._evidence_state()
+            self._rollup_snapshot = self.rollup_state()
+            return
+        for attr, (names, snapshot) in snapshots.items():
+            if snapshot is not None:
+                setattr(self, attr, tuple(
+                    getattr(self, name) if name in fields else snapshot[position]
+                    for position, name in enumerate(names)
+                ))
+
     def save(self, *args, **kwargs):
         """
         Generate reference code automatically.
         Clear reporter information if anonymous.
+        Recompute the evidence hash and tamper flag when an evidence field changed.
+        Record the first response when the status first becomes actioned/closed.
         """
         if not self.reference_code:
             self.reference_code = self.generate_reference_code()
@@ -86,7 +157,86 @@ class Report(models.Model):
             self.reporter_email = ""
             self.user = None
         
+        # INTEGRITY STATUS
+        # created_at is only set by the first save, so new reports are hashed right after it
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        snapshot = getattr(self, '_evidence_snapshot', None)
+        evidence_changed = (
+            not adding
+            and (snapshot is None or snapshot != self._evidence_state())
+            and (update_fields is None or set(update_fields) & set(EVIDENCE_FIELDS))
+        )
+        if evidence_changed and self._evidence_state() is not None:
+            self.refresh_integrity()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'current_evidence_hash', 'tampered'}
+        
+        # ANALYTICS ROLLUP
+        # With rollup fields deferred the loaded snapshot is incomplete; read the stored row
+        # so the rollup moves this report's contribution instead of counting it twice
+        if not adding and getattr(self, '_rollup_snapshot', None) is None:
+            self._rollup_snapshot = (
+                type(self)._base_manager.filter(pk=self.pk).values_list(*ROLLUP_FIELDS).first()
+            )
+        stored_rollup = None if adding else self._rollup_snapshot
+        
+        # RESPONSE TIME
+        if self.status in RESOLVED_STATUSES and self.first_response_at is None:
+            self.first_response_at = timezone.now()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'first_response_at'}
+        
         super().save(*args, **kwargs)
+        
+        if adding:
+            self.refresh_integrity(commit=True)
+        self._evidence_snapshot = self._evidence_state()
+        self._rollup_snapshot = self.rollup_state(stored_rollup)
+
+    def refresh_integrity(self, anchored_hash=None, anchor_version=None, lookup_anchor=True, commit=False):
+        """
+        Recompute current_evidence_hash and tampered against the blockchain anchor,
+        using the evidence codec version recorded on the anchor.
+        With commit=True the two columns are written directly (no save signals, no updated_at bump).
+        """
+        if lookup_anchor:
+            from apps.blockchain.models import BlockchainAnchor
+            anchored_hash, anchor_version = (
+                BlockchainAnchor.objects
+                .filter(report_id=self.reference_code)
+                .values_list('evidence_hash', 'evidence_version')
+                .first()
+            ) or (None, None)
+        current_hash, layout = match_layout(self, anchored_hash, anchor_version or None)
+        self.current_evidence_hash = current_hash
+        self.tampered = bool(anchored_hash) and layout is None
+        if commit:
+            Report.objects.filter(pk=self.pk).update(
+                current_evidence_hash=self.current_evidence_hash, tampered=self.tampered
+            )
+
+    def integrity_status(self, anchor):
+        """
+        (current_hash, match) from the stored columns; fills them on first use
+        for reports written before the columns existed.
+        """
+        if not self.current_evidence_hash:
+            self.refresh_integrity(
+                anchored_hash=anchor.evidence_hash, anchor_version=anchor.evidence_version,
+                lookup_anchor=False, commit=True,
+            )
+        return self.current_evidence_hash, not self.tampered
+
+    def diverged_evidence_fields(self, anchor):
+        """
+        Report fields changed since anchoring, from the anchor's per-field Merkle
+        leaves; None when the anchor can't localise the change (non-Merkle codec).
+        """
+        diverged = localize_tampering(self, anchor.evidence_hash, anchor.evidence_version, anchor.field_hashes)
+        if diverged is None:
+            return None
+        return [PAYLOAD_FIELD_SOURCES.get(key, key) for key in diverged]
 
     def generate_reference_code(self):
         """Generate unique sequential code: RRS-2025-00001"""
@@ -146,3 +296,27 @@ class AuditLog(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+
+
+# ---------------------------------------------------------
+# CHANGE FEED TOMBSTONES
+# ---------------------------------------------------------
+class DeletedRecord(models.Model):
+    """
+    Deleted report or anchor, so change feed clients can drop it (see changes.py).
+    Kept for CHANGE_FEED_RETENTION_DAYS; older cursors must reload in full.
+    """
+    class Kind(models.TextChoices):
+        REPORT = 'report', 'Report'
+        ANCHOR = 'anchor', 'Blockchain anchor'
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    # Report reference code (anchors are keyed by their report's code too)
+    key = models.CharField(max_length=20)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"{self.kind} {self.key} deleted {self.deleted_at}"
@@ -0,0 +1,204 @@
+"""
+Full-text search over reports
+Ranked search on reference code, location, description and reporter name,
+used by the admin, the dashboard report list and the staff search API.
+
+    PostgreSQL  generated tsvector column reports_report.search_vector
+                (weights A-D in that field order) with a GIN index;
+                maintained by the database on every write, ranked with
+                ts_rank_cd
+    SQLite      FTS5 table reports_report_fts, kept in sync by Report
+                save/delete signals and ranked with bm25; category and status
+                are indexed alongside so filters are index intersections too.
+                Rows written with bulk_create or queryset.update need
+                rebuild_search_index
+
+Both use the language-neutral 'simple'/unicode61 tokenisation (reports mix
+Kinyarwanda, English and French) and match every term as a prefix. Other
+backends fall back to unindexed icontains filters.
+"""
+
+import re
+import uuid
+from functools import reduce
+from operator import or_
+from typing import Iterable, List, Tuple
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'reports_report_fts'
+# Searched Report fields, most significant first
+FIELDS = ('reference_code', 'location_description', 'description', 'reporter_name')
+# FTS5 columns after report_id: the searched fields, then the filter fields
+SQLITE_COLUMNS = FIELDS + ('category', 'status')
+# bm25 weights per FTS5 column (report_id is unindexed, filters don't rank)
+SQLITE_WEIGHTS = (0.0, 10.0, 4.0, 1.0, 0.5, 0.0, 0.0)
+_SQLITE_INSERT = (
+    f"INSERT INTO {FTS_TABLE} (rowid, report_id, {', '.join(SQLITE_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * (len(SQLITE_COLUMNS) + 2))})"
+)
+# Report columns returned by the search API
+RESULT_FIELDS = (
+    'id', 'reference_code', 'category', 'status', 'location_description',
+    'is_anonymous', 'created_at',
+)
+MAX_TERMS = 8
+MAX_RESULTS = 1000
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def terms(query: str) -> List[str]:
+    """Search terms of a user query: word characters only, so safe in either query syntax."""
+    return _TERM_RE.findall((query or '').lower())[:MAX_TERMS]
+
+
+def _fts_rowid(report_id) -> int:
+    """Stable positive 60-bit FTS rowid derived from the report UUID."""
+    return int(report_id.hex[:15], 16)
+
+
+def backend_supported() -> bool:
+    """Whether the database has a full-text index (otherwise search falls back to icontains)."""
+    return connection.vendor in ('postgresql', 'sqlite')
+
+
+# ------------------------------------------------------------
+# Index maintenance (SQLite; PostgreSQL maintains its own column)
+# ------------------------------------------------------------
+
+def index_report(report):
+    if connection.vendor != 'sqlite':
+        return
+    values = [getattr(report, field) or '' for field in SQLITE_COLUMNS]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [_fts_rowid(report.id)])
+        cursor.execute(_SQLITE_INSERT, [_fts_rowid(report.id), report.id.hex, *values])
+
+
+def remove_report(report):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [_fts_rowid(report.id)])
+
+
+def rebuild(chunk_size: int = 2000) -> int:
+    """Re-index every report (SQLite); returns the number indexed."""
+    from .models import Report
+
+    if connection.vendor != 'sqlite':
+        return Report.objects.count()
+    indexed_count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        for row in Report.objects.order_by().values_list('id', *SQLITE_COLUMNS).iterator(chunk_size=chunk_size):
+            report_id, values = row[0], [value or '' for value in row[1:]]
+            batch.append([_fts_rowid(report_id), report_id.hex, *values])
+            if len(batch) >= chunk_size:
+                cursor.executemany(_SQLITE_INSERT, batch)
+                indexed_count += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(_SQLITE_INSERT, batch)
+            indexed_count += len(batch)
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return indexed_count
+
+
+# ------------------------------------------------------------
+# Search
+# ------------------------------------------------------------
+
+def _filters_sql(categories: List[str], statuses: List[str]) -> Tuple[str, list]:
+    sql, params = '', []
+    if categories:
+        sql += f" AND r.category IN ({', '.join(['%s'] * len(categories))})"
+        params += categories
+    if statuses:
+        sql += f" AND r.status IN ({', '.join(['%s'] * len(statuses))})"
+        params += statuses
+    return sql, params
+
+
+def _fts_match(words: List[str], categories: List[str], statuses: List[str]) -> str:
+    """FTS5 query: every term as a prefix in a searched column, filters as column phrases."""
+    def phrase(value):
+        return '"' + value.replace('"', '""') + '"'
+
+    query = f"{{{' '.join(FIELDS)}}} : ({' '.join(phrase(word) + '*' for word in words)})"
+    for column, values in (('category', categories), ('status', statuses)):
+        if values:
+            query += f" AND {column} : ({' OR '.join(phrase(value) for value in values)})"
+    return query
+
+
+def search_ids(query: str, limit: int = 50, categories: Iterable[str] = (),
+               statuses: Iterable[str] = ()) -> List[Tuple[str, float]]:
+    """
+    (report id, score) of the best matches, best first (one query); score is
+    higher for better matches. Empty for a query without terms.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+    categories, statuses = list(categories), list(statuses)
+
+    if connection.vendor == 'postgresql':
+        filters, params = _filters_sql(categories, statuses)
+        sql = (
+            "SELECT r.id, ts_rank_cd(r.search_vector, q) AS score "
+            "FROM reports_report r, to_tsquery('simple', %s) q "
+            f"WHERE r.search_vector @@ q{filters} "
+            "ORDER BY score DESC LIMIT %s"
+        )
+        params = [' & '.join(f"{word}:*" for word in words), *params, limit]
+    elif connection.vendor == 'sqlite':
+        sql = (
+            f"SELECT report_id, -bm25({FTS_TABLE}, {', '.join(str(w) for w in SQLITE_WEIGHTS)}) AS score "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            "ORDER BY score DESC LIMIT %s"
+        )
+        params = [_fts_match(words, categories, statuses), limit]
+    else:
+        return [(str(pk), 0.0) for pk in fallback_queryset(words, categories, statuses).values_list('pk', flat=True)[:limit]]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(str(report_id), float(score)) for report_id, score in cursor.fetchall()]
+
+
+def fallback_queryset(words: List[str], categories: List[str], statuses: List[str]):
+    """Unindexed equivalent for other database backends."""
+    from .models import Report
+
+    reports = Report.objects.order_by('-created_at')
+    for word in words:
+        reports = reports.filter(reduce(or_, (Q(**{f'{field}__icontains': word}) for field in FIELDS)))
+    if categories:
+        reports = reports.filter(category__in=categories)
+    if statuses:
+        reports = reports.filter(status__in=statuses)
+    return reports
+
+
+def search(query: str, limit: int = 50, categories: Iterable[str] = (), statuses: Iterable[str] = (),
+           queryset=None) -> List:
+    """Matching reports best first, each with a .search_score (two queries)."""
+    from .models import Report
+
+    ranked = search_ids(query, limit, categories, statuses)
+    if not ranked:
+        return []
+    ranked = [(uuid.UUID(pk), score) for pk, score in ranked]
+    reports = (queryset if queryset is not None else Report.objects.all()).in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, score in ranked:
+        report = reports.get(pk)
+        if report is not None:
+            report.search_score = score
+            results.append(report)
+    return results
@@ -5,7 +5,9 @@ Tracks model changes (create, update, delete) automatically
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Report, ReportUpdate, AuditLog
+from .models import Report, ReportUpdate, AuditLog, DeletedRecord
+from . import changes, search
+from apps.blockchain.models import BlockchainAnchor
 import threading
 
 
@@ -159,6 +161,59 @@ def log_report_status_change(sender, instance, created, **kwargs):
     create_audit_log(user, action, resource, details, request)
 
 
+# ========== INTEGRITY STATUS SIGNALS ==========
+@receiver(post_save, sender=BlockchainAnchor)
+def refresh_tamper_status_on_anchor(sender, instance, **kwargs):
+    """Re-evaluate the report's tamper flag when its anchored hash is written"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not {'evidence_hash', 'evidence_version'} & set(update_fields):
+        return
+    report = Report.objects.filter(reference_code=instance.report_id).first()
+    if report is None:
+        return
+    current_hash, tampered = report.current_evidence_hash, report.tampered
+    report.refresh_integrity(
+        anchored_hash=instance.evidence_hash, anchor_version=instance.evidence_version, lookup_anchor=False
+    )
+    if (report.current_evidence_hash, report.tampered) != (current_hash, tampered):
+        Report.objects.filter(pk=report.pk).update(
+            current_evidence_hash=report.current_evidence_hash, tampered=report.tampered
+        )
+
+
+@receiver(post_delete, sender=BlockchainAnchor)
+def clear_tamper_status_on_anchor_delete(sender, instance, **kwargs):
+    """A report without an anchor cannot be tampered relative to it"""
+    Report.objects.filter(reference_code=instance.report_id, tampered=True).update(tampered=False)
+
+
+# ========== CHANGE FEED SIGNALS ==========
+@receiver(post_delete, sender=Report)
+def record_report_tombstone(sender, instance, **kwargs):
+    """Let change feed clients drop the deleted report"""
+    changes.record_deletion(DeletedRecord.Kind.REPORT, instance.reference_code)
+
+
+@receiver(post_delete, sender=BlockchainAnchor)
+def record_anchor_tombstone(sender, instance, **kwargs):
+    """Let change feed clients drop the deleted anchor"""
+    changes.record_deletion(DeletedRecord.Kind.ANCHOR, instance.report_id)
+
+
+# ========== SEARCH INDEX SIGNALS ==========
+@receiver(post_save, sender=Report)
+def index_report_for_search(sender, instance, update_fields=None, **kwargs):
+    """Keep the SQLite full-text index in step (saves touching no indexed column are skipped)"""
+    if update_fields is not None and not set(update_fields) & set(search.SQLITE_COLUMNS):
+        return
+    search.index_report(instance)
+
+
+@receiver(post_delete, sender=Report)
+def remove_report_from_search(sender, instance, **kwargs):
+    search.remove_report(instance)
+
+
 # ========== USER AUTHENTICATION SIGNALS ==========
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 
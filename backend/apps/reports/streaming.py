@@ -0,0 +1,42 @@
+"""
+Streamed responses that stay streamed under ASGI
+The web process runs on ASGI (uvicorn workers). Django 4.2 serves a
+StreamingHttpResponse built on a synchronous iterator there by collecting it
+into a list first, which loses both incremental delivery and constant memory.
+streaming_response() hands ASGI an async iterator that pulls one chunk at a
+time from the synchronous one through sync_to_async (thread-sensitive, so a
+server-side cursor stays on its connection); under WSGI the synchronous
+iterator is served as is.
+"""
+
+from typing import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+async def async_chunks(chunks: Iterable) -> AsyncIterator:
+    """Async view of a synchronous iterator, one chunk per thread hop; closes it when abandoned."""
+    iterator = iter(chunks)
+    pull = sync_to_async(lambda: next(iterator, _DONE))
+    try:
+        while True:
+            chunk = await pull()
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_response(request, chunks: Iterable, **kwargs) -> StreamingHttpResponse:
+    """StreamingHttpResponse over chunks, async under ASGI (request may be a DRF Request)."""
+    django_request = getattr(request, '_request', request)
+    if isinstance(django_request, ASGIRequest):
+        chunks = async_chunks(chunks)
+    return StreamingHttpResponse(chunks, **kwargs)
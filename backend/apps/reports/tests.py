@@ -0,0 +1,150 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.throttling import ScopedRateThrottle
+
+from apps.blockchain.models import BlockchainAnchor
+
+from . import export
+from .models import Report, ReportUpdate
+
+
+class ReportStatusAPIQueryTests(TestCase):
+    """ReportStatusAPI loads report, anchor, updates and their users in a fixed number of queries."""
+
+    def setUp(self):
+        self.report = Report.objects.create(category='bribery', description='Test report')
+
+    def add_updates(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(f'officer{ReportUpdate.objects.count()}')
+            ReportUpdate.objects.create(report=self.report, user=user, old_status='new', new_status='in_review')
+
+    def get_status(self):
+        return self.client.get(reverse('api_report_status', args=[self.report.reference_code]))
+
+    def test_anchored_report(self):
+        BlockchainAnchor.objects.create(report_id=self.report.reference_code, evidence_hash='ab' * 32,
+                                        transaction_hash='cd' * 32, confirmations=3)
+        self.add_updates(3)
+        # report + anchor (joined), updates + users (joined)
+        with self.assertNumQueries(2):
+            response = self.get_status()
+        data = response.json()['data']
+        self.assertEqual(data['blockchain']['confirmations'], 3)
+        self.assertEqual(len(data['updates']), 3)
+        self.assertEqual(data['updates'][0]['user'], 'officer2')
+
+    def test_query_count_independent_of_updates(self):
+        self.add_updates(1)
+        with self.assertNumQueries(2):
+            self.get_status()
+        self.add_updates(5)
+        with self.assertNumQueries(2):
+            response = self.get_status()
+        self.assertEqual(response.json()['data']['blockchain'], {'status': 'not_anchored'})
+
+    def test_missing_report(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_report_status', args=['RRS-0000-00000']))
+        self.assertEqual(response.status_code, 404)
+
+
+class ExportStreamingTests(TestCase):
+    """Under the ASGI handler the export is sent chunk by chunk, not collected first."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.events = []
+
+    def chunks(self):
+        for i in range(3):
+            self.events.append(f'produced {i}')
+            yield f'row {i}\n'
+
+    async def get_asgi(self, path, query_string=b''):
+        async def receive():
+            if not received:
+                received.append(True)
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Event().wait()  # the client never disconnects
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                self.events.append(f"status {message['status']}")
+            elif message.get('body'):
+                self.events.append('sent')
+
+        received = []
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query_string,
+            'root_path': '', 'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+            'headers': [
+                (b'host', b'testserver'),
+                (b'cookie', f"sessionid={self.client.cookies['sessionid'].value}".encode()),
+            ],
+        }
+        # As the test client does: keep the test transaction's connection open
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            await ASGIHandler()(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+    async def test_export_is_sent_in_chunks(self):
+        with mock.patch.object(export, 'stream', return_value=self.chunks()):
+            await self.get_asgi(reverse('api_report_export', args=['reports']), b'fmt=csv')
+        self.assertEqual(self.events, [
+            'status 200', 'produced 0', 'sent', 'produced 1', 'sent', 'produced 2', 'sent',
+        ])
+
+
+class BatchVerifyAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, codes):
+        return self.client.post(reverse('api_verify_batch'), {'reference_codes': codes}, content_type='application/json')
+
+    def test_batch_size_is_capped(self):
+        with self.settings(VERIFY_BATCH_MAX=2):
+            self.assertEqual(self.post(['A', 'B', 'C']).status_code, 400)
+
+    def test_requests_are_throttled(self):
+        with mock.patch.dict(ScopedRateThrottle.THROTTLE_RATES, {'batch_verify': '2/min'}):
+            responses = [self.post(['RRS-MISSING']) for _ in range(3)]
+        self.assertEqual([r.status_code for r in responses], [200, 200, 429])
+        self.assertEqual(b''.join(responses[0].streaming_content).count(b'not_found'), 1)
+
+
+class ReportAdminSearchTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.report = Report.objects.create(category='bribery', description='Clerk asked for cash at the gate',
+                                            reporter_email='witness@example.com')
+        Report.objects.create(category='fraud', description='Unrelated')
+
+    def search(self, term):
+        response = self.client.get(reverse('admin:reports_report_changelist'), {'q': term})
+        return list(response.context['cl'].queryset)
+
+    def test_full_text_search(self):
+        self.assertEqual(self.search('gate'), [self.report])
+        self.assertEqual(self.search('witness@example.com'), [self.report])
+
+    def test_unsupported_backend_uses_original_search_fields(self):
+        with mock.patch('apps.reports.search.backend_supported', return_value=False), \
+                mock.patch('apps.reports.search.search_ids') as search_ids:
+            self.assertEqual(self.search('gate'), [self.report])
+            self.assertEqual(self.search('witness@'), [self.report])
+        search_ids.assert_not_called()
@@ -13,11 +13,16 @@ urlpatterns = [
     path('report/status/', views.report_status_lookup, name='report_status_main'),
     path('report/status/<str:reference_code>/', views.report_status, name='report_status'),
     path('report/certificate/<str:reference_code>/', views.verification_certificate, name='view_verification_certificate'),
+    path('report/certificate/<str:reference_code>/qr.png', views.verification_certificate_qr, name='verification_certificate_qr'),
     path('report/verify/<str:reference_code>/', views.verify_report_integrity, name='verify_report_integrity'),
     path('report/list/', views.report_list, name='report_list'),
     path('api/report/submit/', views.AsyncReportSubmitAPI.as_view(), name='api_submit_report'),
     path('api/report/status/<str:reference_code>/', views.ReportStatusAPI.as_view(), name='api_report_status'),
+    path('api/report/verify/', views.BatchVerifyAPI.as_view(), name='api_verify_batch'),
     path('api/reports/list/', views.ReportListAPI.as_view(), name='api_reports_list'),
+    path('api/reports/search/', views.ReportSearchAPI.as_view(), name='api_reports_search'),
+    path('api/reports/changes/', views.ReportChangesAPI.as_view(), name='api_reports_changes'),
+    path('api/report/export/<str:dataset>/', views.ReportExportAPI.as_view(), name='api_report_export'),
     path('api/ipfs/upload/', views.AsyncIPFSUploadAPI.as_view(), name='api_ipfs_upload'),
     path('legal/terms/', TermsConditionsView.as_view(), name='legal_terms'),
     path('legal/privacy/', PrivacyPolicyView.as_view(), name='legal_privacy'),
@@ -0,0 +1,85 @@
+"""
+Cache for public verification responses
+Serialized verify_report_integrity responses are stored under a key derived
+from (reference_code, report.updated_at, anchor.evidence_hash,
+anchor.confirmations, anchor.updated_at).
+
+Each request reads the current version from the database (one indexed query,
+report joined with its anchor) before looking in the cache. A write in any
+process changes the version, so the web process never serves a response built
+before it, whether or not the cache backend is shared between processes.
+Superseded entries are never read again and expire after
+VERIFICATION_CACHE_TTL.
+"""
+
+import hashlib
+import json
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+# build(reference_code) -> (version, payload); raises Http404 for unknown reports
+Builder = Callable[[str], Tuple[str, dict]]
+
+
+def _ttl() -> int:
+    return int(getattr(settings, 'VERIFICATION_CACHE_TTL', 86400))
+
+
+def _response_key(reference_code: str, version: str) -> str:
+    return f"verify:resp:{reference_code}:{version}"
+
+
+def _version(reference_code, updated_at, evidence_hash, confirmations, anchor_updated_at) -> str:
+    """Short digest of the state a response depends on (keeps keys backend-safe)."""
+    parts = (
+        reference_code,
+        updated_at.isoformat() if updated_at else "",
+        evidence_hash or "",
+        "" if confirmations is None else str(confirmations),
+        anchor_updated_at.isoformat() if anchor_updated_at else "",
+    )
+    return hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()[:20]
+
+
+def version_for(report, anchor) -> str:
+    """Version token for a loaded report/anchor pair."""
+    return _version(
+        report.reference_code,
+        report.updated_at,
+        anchor.evidence_hash if anchor else None,
+        anchor.confirmations if anchor else None,
+        anchor.updated_at if anchor else None,
+    )
+
+
+def current_version(reference_code: str) -> Optional[str]:
+    """Version token read from the database; None for an unknown report."""
+    from .models import Report
+
+    row = (
+        Report.objects
+        .filter(reference_code=reference_code)
+        .values_list('updated_at', 'anchor__evidence_hash', 'anchor__confirmations', 'anchor__updated_at')
+        .first()
+    )
+    return _version(reference_code, *row) if row else None
+
+
+def get_or_build(reference_code: str, build: Builder) -> bytes:
+    """Return the serialized response, from cache when its version is current."""
+    version = current_version(reference_code)
+    if version:
+        body = cache.get(_response_key(reference_code, version))
+        if body is not None:
+            return body
+    return _build_and_store(reference_code, build)
+
+
+def _build_and_store(reference_code: str, build: Builder) -> bytes:
+    version, payload = build(reference_code)
+    body = json.dumps(payload, cls=DjangoJSONEncoder).encode('utf-8')
+    cache.set(_response_key(reference_code, version), body, timeout=_ttl())
+    return body
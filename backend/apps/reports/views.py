@@ -3,20 +3,30 @@ import json
 import hashlib
 import asyncio
 import requests
+from datetime import date
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from rest_framework.views import APIView
 from rest_framework import permissions
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
 from django.utils import timezone
 from asgiref.sync import sync_to_async
 from django.contrib import messages
-from .models import Report
+from django.db.models import Prefetch
+from .models import Report, ReportUpdate
 from .serializers import ReportSerializer
+from . import certificates, changes, export, search, verification_cache
+from .streaming import streaming_response
 from apps.blockchain.models import BlockchainAnchor
 from apps.blockchain.cardano_utils import CardanoEvidenceAnchoring
+from apps.blockchain.evidence import get_codec, match_layout
+from apps.blockchain.status_refresh import request_refresh
+from apps.blockchain.outbox import enqueue_anchor
 
 # -------------------------------
 # FRONTEND ROUTES
@@ -297,18 +307,9 @@ class AsyncReportSubmitAPI(APIView):
             # Prepare evidence JSON early
             # NOTE: ipfs_cid is included but will be None at this point
             # This is intentional - it ensures the hash won't change when verifying
-            evidence_json = {
-                "report_id": str(report.id),
-                "reference_code": report.reference_code,
-                "category": report.category,
-                "description": report.description,
-                "latitude": str(report.latitude) if report.latitude else None,
-                "longitude": str(report.longitude) if report.longitude else None,
-                "location_description": report.location_description,
-                "ipfs_cid": report.ipfs_cid,
-                "timestamp": report.created_at.isoformat(),
-                "is_anonymous": report.is_anonymous
-            }
+            codec = get_codec()
+            evidence_json = codec.payload(report)
+            field_hashes = codec.field_hashes(evidence_json)
 
             # Upload media file and JSON to IPFS
             if report.media_file:
@@ -324,7 +325,7 @@ class AsyncReportSubmitAPI(APIView):
             print(f"[IPFS] JSON uploaded: {report.evidence_json_cid}")
 
             # Generate SHA-256 hash of evidence
-            report.evidence_hash = cardano.generate_evidence_hash(evidence_json)
+            report.evidence_hash = codec.hash_payload(evidence_json)
             print(f"[HASH] Evidence hash: {report.evidence_hash}")
 
             # Create blockchain anchor
@@ -342,15 +343,28 @@ class AsyncReportSubmitAPI(APIView):
 
             # Save blockchain anchor record
             tx_hash = anchor_result.get("tx_hash", "")
+            broadcast_failed = anchor_result.get("broadcast_failed", False)
             
             # Determine initial status
             initial_status = BlockchainAnchor.Status.PENDING
             if tx_hash and not anchor_result.get("simulated", False):
                 initial_status = BlockchainAnchor.Status.SUBMITTED
 
+            # A failed broadcast has no real transaction: don't record the
+            # simulated hash, queue the anchor for re-submission instead
+            if broadcast_failed:
+                tx_hash = None
+                enqueue_anchor(
+                    report.reference_code, report.evidence_hash,
+                    category=report.category, is_anonymous=report.is_anonymous,
+                    ipfs_cid=report.evidence_json_cid, error=anchor_result.get("error", ""),
+                )
+
             anchor = BlockchainAnchor.objects.create(
                 report_id=report.reference_code,
                 evidence_hash=report.evidence_hash,
+                evidence_version=codec.version,
+                field_hashes=field_hashes,
                 ipfs_cid=report.evidence_json_cid,
                 transaction_hash=tx_hash,
                 status=initial_status,
@@ -365,8 +379,8 @@ class AsyncReportSubmitAPI(APIView):
 
             # Update report with blockchain info
             report.transaction_hash = tx_hash
-            report.is_hash_anchored = True
-            report.verified_on_chain = True
+            report.is_hash_anchored = not broadcast_failed
+            report.verified_on_chain = not broadcast_failed
             report.status = "in_review"
 
             report.save()
@@ -388,13 +402,19 @@ class ReportStatusAPI(APIView):
     def get(self, request, reference_code):
         """Get report status and blockchain information"""
         try:
-            report = get_object_or_404(Report, reference_code=reference_code)
+            # Two queries: the report with its anchor joined, then the updates with their users
+            report = get_object_or_404(
+                Report.objects.select_related('anchor').prefetch_related(
+                    Prefetch('updates', queryset=ReportUpdate.objects.select_related('user'))
+                ),
+                reference_code=reference_code,
+            )
             serializer = ReportSerializer(report)
             
             # Get blockchain anchor info if available
             blockchain_info = {}
-            try:
-                anchor = BlockchainAnchor.objects.get(report_id=reference_code)
+            anchor = report.anchor
+            if anchor is not None:
                 # Include rich blockchain metadata so callers can inspect anchor details
                 blockchain_info = {
                     "status": anchor.status,
@@ -407,7 +427,7 @@ class ReportStatusAPI(APIView):
                     "confirmed_at": anchor.confirmed_at.isoformat() if anchor.confirmed_at else None,
                     "metadata": anchor.metadata or {},
                 }
-            except BlockchainAnchor.DoesNotExist:
+            else:
                 blockchain_info = {"status": "not_anchored"}
             
             response_data = serializer.data
@@ -465,91 +485,77 @@ class AsyncIPFSUploadAPI(APIView):
 
 
 def verification_certificate(request, reference_code):
-    """Render the verification certificate for a report."""
+    """
+    Serve the pre-rendered verification certificate for a report.
+    Certificates are stored once per state (see certificates) with the status
+    check age filled in per request, and served with a strong ETag; stale anchor
+    status is refreshed in the background (status_refresh).
+    """
     report = get_object_or_404(Report, reference_code=reference_code)
-    
-    # Get blockchain anchor info
-    anchor = None
-    try:
-        anchor = BlockchainAnchor.objects.get(report_id=reference_code)
-        
-        # If we have a transaction hash, try to update status on-the-fly
-        if anchor.transaction_hash:
-            cardano = CardanoEvidenceAnchoring()
-            status_info = cardano.get_transaction_status(anchor.transaction_hash)
-            
-            if status_info.get("found"):
-                # Update anchor with latest blockchain data
-                if status_info.get("block_height"):
-                    anchor.block_number = status_info["block_height"]
-                
-                if status_info.get("confirmations") is not None:
-                    anchor.confirmations = status_info["confirmations"]
-                    
-                if anchor.confirmations and anchor.confirmations > 0:
-                    anchor.status = BlockchainAnchor.Status.CONFIRMED
-                    if not anchor.confirmed_at:
-                        anchor.confirmed_at = timezone.now()
-                
-                anchor.save()
-                
-    except BlockchainAnchor.DoesNotExist:
-        pass
-        
-    context = {
-        'report': report,
-        'anchor': anchor,
-        'now': timezone.now(),
-    }
-    return render(request, 'reports/verification_certificate.html', context)
+    anchor = BlockchainAnchor.objects.filter(report_id=reference_code).first()
+    refreshing = request_refresh(anchor)
+
+    checked = certificates.status_checked(anchor, refreshing)
+    state, html = certificates.load(report, anchor)
+    etag = certificates.etag(state, checked)
+    cache_control = f"public, max-age={settings.CERTIFICATE_CACHE_MAX_AGE}"
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(certificates.fill(html, checked), content_type='text/html; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def verification_certificate_qr(request, reference_code):
+    """QR code of a report's verification link; the link never changes, so it is cached for a year."""
+    report = get_object_or_404(Report, reference_code=reference_code)
+    png = certificates.qr_png(report.reference_code)
+    if png is None:
+        raise Http404("QR codes are unavailable (qrcode is not installed)")
+    etag = f'"{hashlib.sha1(png).hexdigest()}"'
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(png, content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = "public, max-age=31536000, immutable"
+    return response
 
 
 def verify_report_integrity(request, reference_code):
     """
     Public Verification Tool: Verifies if the current database record matches the blockchain anchor.
     On mismatch, detects and displays what data was tampered with, when, and by whom.
+    Responses are cached per report version (see verification_cache).
     """
-    from django.http import JsonResponse
+    body = verification_cache.get_or_build(reference_code, _build_verification_response)
+    return HttpResponse(body, content_type='application/json')
+
+
+def _build_verification_response(reference_code):
+    """Build the verify_report_integrity payload; returns (cache version, payload)."""
     report = get_object_or_404(Report, reference_code=reference_code)
+    anchor = BlockchainAnchor.objects.filter(report_id=report.reference_code).first()
+    version = verification_cache.version_for(report, anchor)
     
-    try:
-        anchor = BlockchainAnchor.objects.get(report_id=report.reference_code)
-    except BlockchainAnchor.DoesNotExist:
-        return JsonResponse({
+    if anchor is None:
+        return version, {
             "status": "error",
             "message": "No blockchain anchor found for this report."
-        })
-
-    # 1. Re-construct the evidence JSON from current DB data
-    # IMPORTANT: Use ipfs_cid=None (as it was when originally anchored)
-    # This ensures the hash matches the original anchored hash
-    evidence_json = {
-        "report_id": str(report.id),
-        "reference_code": report.reference_code,
-        "category": report.category,
-        "description": report.description,
-        "latitude": str(report.latitude) if report.latitude else None,
-        "longitude": str(report.longitude) if report.longitude else None,
-        "location_description": report.location_description,
-        "ipfs_cid": None,
-        "timestamp": report.created_at.isoformat(),
-        "is_anonymous": report.is_anonymous
-    }
+        }
 
-    # 2. Calculate the hash of the CURRENT data
-    cardano = CardanoEvidenceAnchoring()
-    current_hash = cardano.generate_evidence_hash(evidence_json)
-    
-    # 3. Compare with the ANCHORED hash
+    # Integrity status is maintained at write time (Report.save / anchor signals)
     original_hash = anchor.evidence_hash
-    
-    match = (current_hash == original_hash)
+    current_hash, match = report.integrity_status(anchor)
     
     response_data = {
         "status": "success",
         "match": match,
         "current_hash": current_hash,
         "original_hash": original_hash,
+        "evidence_version": anchor.evidence_version or None,
         "message": "Integrity Verified: Data is authentic." if match else "CRITICAL ALERT: Data Tampering Detected!"
     }
     
@@ -570,8 +576,6 @@ def verify_report_integrity(request, reference_code):
         # TAMPERING DETECTED - Find which fields were modified
         tampered_fields = []
         
-        # Try to reconstruct original data from IPFS or metadata
-        # For now, we'll show which current fields don't match
         fields_to_check = [
             ("category", "Category", report.category),
             ("description", "Description", report.description),
@@ -582,6 +586,15 @@ def verify_report_integrity(request, reference_code):
             ("ipfs_cid", "Media IPFS CID", report.ipfs_cid),
         ]
         
+        # Merkle-anchored reports: keep only the fields whose leaves diverged
+        changed = report.diverged_evidence_fields(anchor)
+        if changed is not None:
+            fields_to_check += [
+                ("reference_code", "Reference Code", report.reference_code),
+                ("created_at", "Submission Time", report.created_at.isoformat()),
+            ]
+            fields_to_check = [field for field in fields_to_check if field[0] in changed]
+        
         for field_key, field_label, field_value in fields_to_check:
             tampered_fields.append({
                 "field": field_label,
@@ -591,6 +604,7 @@ def verify_report_integrity(request, reference_code):
         
         response_data["tampering_detected"] = True
         response_data["tampered_fields"] = tampered_fields
+        response_data["tampering_localized"] = changed is not None
         response_data["last_modified"] = report.updated_at.isoformat()
         response_data["submission_date"] = report.created_at.isoformat()
         response_data["alert"] = "POLICE INVESTIGATION: This report data has been modified after blockchain anchoring. This is evidence of tampering and should be reported to authorities."
@@ -607,7 +621,160 @@ def verify_report_integrity(request, reference_code):
             "media_ipfs_url": report.media_ipfs_url or "N/A",
         }
     
-    return JsonResponse(response_data)
+    return version, response_data
+
+
+class BatchVerifyAPI(APIView):
+    """
+    Verify many reports in one request (partner agencies).
+    POST {"reference_codes": [...]} (at most VERIFY_BATCH_MAX codes); reports and
+    anchors are loaded with two queries and results stream back as NDJSON, one
+    line per code in request order. Throttled per client (VERIFY_BATCH_RATE).
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'batch_verify'
+
+    def post(self, request):
+        codes = request.data.get('reference_codes')
+        if not isinstance(codes, list) or not codes:
+            return Response({"success": False, "error": "reference_codes must be a non-empty list"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        limit = settings.VERIFY_BATCH_MAX
+        if len(codes) > limit:
+            return Response({"success": False, "error": f"At most {limit} reference codes per request"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        codes = list(dict.fromkeys(str(code).strip() for code in codes))
+        reports = {report.reference_code: report for report in Report.objects.filter(reference_code__in=codes)}
+        anchors = {anchor.report_id: anchor for anchor in BlockchainAnchor.objects.filter(report_id__in=codes)}
+
+        def lines():
+            for code in codes:
+                yield json.dumps(_verify_one(code, reports.get(code), anchors.get(code)), cls=DjangoJSONEncoder) + "\n"
+
+        return streaming_response(request, lines(), content_type='application/x-ndjson')
+
+
+def _verify_one(reference_code, report, anchor):
+    """One BatchVerifyAPI result line, recomputed with the anchor's evidence codec."""
+    if report is None:
+        return {"reference_code": reference_code, "status": "not_found"}
+    if anchor is None:
+        return {"reference_code": reference_code, "status": "not_anchored"}
+
+    current_hash, matched = match_layout(report, anchor.evidence_hash, anchor.evidence_version or None)
+    result = {
+        "reference_code": reference_code,
+        "status": "verified" if matched else "tampered",
+        "match": bool(matched),
+        "current_hash": current_hash,
+        "original_hash": anchor.evidence_hash,
+        "evidence_version": matched or anchor.evidence_version or None,
+        "transaction_hash": anchor.transaction_hash,
+        "confirmations": anchor.confirmations,
+    }
+    if not matched:
+        result["diverged_fields"] = report.diverged_evidence_fields(anchor)
+    return result
+
+
+class ReportExportAPI(APIView):
+    """
+    Staff export of reports, updates or anchors, streamed with constant memory
+    (also under ASGI, see streaming.py).
+    GET api/report/export/<reports|updates|anchors>/?fmt=csv|ndjson|parquet
+        &start=YYYY-MM-DD&end=YYYY-MM-DD&category=a,b&status=a,b
+    ('fmt' rather than 'format', which DRF reserves for renderer selection)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, dataset):
+        if not getattr(request.user, 'is_staff', False):
+            return Response({"success": False, "error": "Admin authentication required"},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        def csv_param(name):
+            return [value for value in request.query_params.get(name, '').split(',') if value]
+
+        fmt = request.query_params.get('fmt', 'csv')
+        try:
+            start = request.query_params.get('start')
+            end = request.query_params.get('end')
+            filters = {
+                'start': date.fromisoformat(start) if start else None,
+                'end': date.fromisoformat(end) if end else None,
+                'categories': csv_param('category'),
+                'statuses': csv_param('status'),
+            }
+            chunks = export.stream(dataset, fmt, **filters)
+        except ValueError as e:
+            return Response({"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = streaming_response(request, chunks, content_type=export.CONTENT_TYPES[fmt])
+        name = export.filename(dataset, fmt, filters['start'], filters['end'])
+        response['Content-Disposition'] = f'attachment; filename="{name}"'
+        return response
+
+
+class ReportChangesAPI(APIView):
+    """
+    Change feed for the dashboard and map (see changes.py).
+    GET api/reports/changes/?since=<cursor> returns reports and anchors
+    created or updated since the cursor, deleted reference codes, and the
+    cursor for the next poll. Without a cursor the client loads in full.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not getattr(request.user, 'is_staff', False):
+            return Response({"success": False, "error": "Admin authentication required"},
+                            status=status.HTTP_403_FORBIDDEN)
+        since = request.query_params.get('since')
+        try:
+            since = changes.parse_cursor(since) if since else None
+        except ValueError:
+            return Response({"success": False, "error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"success": True, **changes.changes_since(since)})
+
+
+class ReportSearchAPI(APIView):
+    """
+    Ranked full-text search over reports (see search.py).
+    GET api/reports/search/?q=<terms>[&limit=][&category=...][&status=...]
+    returns the best matches first, each term matched as a word prefix.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not getattr(request.user, 'is_staff', False):
+            return Response({"success": False, "error": "Admin authentication required"},
+                            status=status.HTTP_403_FORBIDDEN)
+        query = request.query_params.get('q', '')
+        if not search.terms(query):
+            return Response({"success": False, "error": "q must contain at least one word"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response({"success": False, "error": "limit must be an integer"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        reports = search.search(
+            query, limit,
+            categories=request.query_params.getlist('category'),
+            statuses=request.query_params.getlist('status'),
+            queryset=Report.objects.only(*search.RESULT_FIELDS),
+        )
+        return Response({
+            "success": True,
+            "count": len(reports),
+            "results": [
+                {**{field: getattr(report, field) for field in search.RESULT_FIELDS},
+                 "score": round(report.search_score, 4)}
+                for report in reports
+            ],
+        })
 
 
 class ReportListAPI(APIView):
@@ -626,6 +793,7 @@ class ReportListAPI(APIView):
                 'longitude',
                 'status',
                 'created_at',
+                'updated_at',
                 'is_anonymous'
             )
             
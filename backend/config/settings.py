@@ -77,6 +77,71 @@ DATABASES = {
     }
 }
 
+# Cache
+# Redis when REDIS_URL is set (shared across workers), otherwise per-process memory
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'rrs-default',
+        }
+    }
+
+# Public verification responses: kept for TTL seconds per report version
+VERIFICATION_CACHE_TTL = int(os.environ.get('VERIFICATION_CACHE_TTL', 86400))
+
+# Anchor status older than this (seconds) is refreshed in the background when viewed
+ANCHOR_STATUS_STALE_AFTER = int(os.environ.get('ANCHOR_STATUS_STALE_AFTER', 120))
+# Chain tip recorded by index_chain is trusted for local confirmation counts for this long (seconds)
+INDEXER_TIP_MAX_AGE = int(os.environ.get('INDEXER_TIP_MAX_AGE', 60))
+
+# Public site URL encoded in certificate QR codes, and certificate HTTP cache lifetime
+# (seconds; certificates show the status check age in minutes)
+SITE_URL = os.environ.get('SITE_URL', 'https://rcrs.onrender.com')
+CERTIFICATE_CACHE_MAX_AGE = int(os.environ.get('CERTIFICATE_CACHE_MAX_AGE', 60))
+
+# A verification run whose process sent no heartbeat for this long (seconds) is marked failed
+VERIFICATION_STALE_AFTER = int(os.environ.get('VERIFICATION_STALE_AFTER', 300))
+# Upper bound on worker processes of a verification run (also capped at the CPU count)
+VERIFY_MAX_WORKERS = int(os.environ.get('VERIFY_MAX_WORKERS', 8))
+
+# Maximum reference codes per batch verification request (api/report/verify/)
+VERIFY_BATCH_MAX = int(os.environ.get('VERIFY_BATCH_MAX', 200))
+# Batch verification requests allowed per client (DRF rate, e.g. '30/min')
+VERIFY_BATCH_RATE = os.environ.get('VERIFY_BATCH_RATE', '30/min')
+
+# Upper bound (seconds) on cached dashboard counters; signals invalidate them on writes
+DASHBOARD_STATS_TTL = int(os.environ.get('DASHBOARD_STATS_TTL', 600))
+# How long (seconds) a process trusts its last read of the dashboard cache generation
+DASHBOARD_GENERATION_TTL = int(os.environ.get('DASHBOARD_GENERATION_TTL', 2))
+
+# Maximum buckets per analytics time series request (dashboard/analytics/timeseries/)
+TIMESERIES_MAX_POINTS = int(os.environ.get('TIMESERIES_MAX_POINTS', 2000))
+
+# Rows fetched per database round trip (and per Parquet row group) by streaming exports
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+# Change feed (api/reports/changes/): rows per kind per response, cursor lag
+# (seconds) covering in-flight transactions, and how long delete tombstones are kept
+CHANGE_FEED_LIMIT = int(os.environ.get('CHANGE_FEED_LIMIT', 500))
+CHANGE_FEED_OVERLAP = int(os.environ.get('CHANGE_FEED_OVERLAP', 2))
+CHANGE_FEED_RETENTION_DAYS = int(os.environ.get('CHANGE_FEED_RETENTION_DAYS', 30))
+
+# Live dashboard events (dashboard/events/, served under ASGI): 'memory' (one process),
+# 'redis' (default when REDIS_URL is set) or a dotted backend class path;
+# keepalive interval and maximum stream age in seconds
+LIVE_EVENTS_BACKEND = os.environ.get('LIVE_EVENTS_BACKEND', '')
+LIVE_EVENTS_KEEPALIVE = int(os.environ.get('LIVE_EVENTS_KEEPALIVE', 25))
+LIVE_EVENTS_MAX_AGE = int(os.environ.get('LIVE_EVENTS_MAX_AGE', 300))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -130,6 +195,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'batch_verify': VERIFY_BATCH_RATE,
+    },
 }
 
 # Email Configuration (for development)